@@ -0,0 +1,6 @@
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 8):
+    # multiprocessing.shared_memory is needed by the doctests
+    collect_ignore.append("pylas/sharedmem.py")
@@ -4,6 +4,8 @@ import nox
 @nox.session(python=["3.6", "3.7", "3.8", "3.9"])
 @nox.parametrize("laz_backend", [None, "lazrs", "laszip"])
 def tests(session, laz_backend):
+    if laz_backend == "lazrs" and session.python == "3.6":
+        session.skip("lazrs has no wheels for python 3.6")
     session.install("pytest")
     if laz_backend is None:
         session.install(".")
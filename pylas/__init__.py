@@ -17,5 +17,14 @@ from .point.format import lost_dimensions
 from .header import LasHeader
 from .lasdata import LasData
 from .vlrs import VLR
+from .zonemap import ZoneMap
+from .lax import LaxIndex
+from .lasdataset import LasDataset
+from .chunkcache import ChunkCache
+from .rangesource import RangeSource
+from .sharedmem import SharedPoints
+from .lazy import LazyLasData, lazy_open
+from . import copc, sorting, tiling
+from .sorting import sort_file
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
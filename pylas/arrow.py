@@ -0,0 +1,179 @@
+""" Conversion of point records from and to Apache Arrow record batches
+
+pyarrow is an optional dependency (pip install pylas[arrow]).
+"""
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .errors import PylasError
+from .point import dims, packing, record
+from .point.format import PointFormat
+
+try:
+    import pyarrow as pa
+except ModuleNotFoundError:
+    pass
+
+if TYPE_CHECKING:
+    from .header import LasHeader
+
+SCALED_COORDINATES = ("x", "y", "z")
+
+
+def _pyarrow():
+    try:
+        return pa
+    except NameError:
+        raise PylasError(
+            "pyarrow is needed to convert points to/from Arrow, "
+            "install it with 'pip install pylas[arrow]'"
+        ) from None
+
+
+def default_column_names(point_format: PointFormat, scaled: bool = True) -> List[str]:
+    """The names of the columns of the record batches of a point format,
+    X, Y, Z are replaced by x, y, z when `scaled` is True
+
+    >>> default_column_names(PointFormat(0))[:6]
+    ['x', 'y', 'z', 'intensity', 'return_number', 'number_of_returns']
+    """
+    names = list(point_format.dimension_names)
+    if scaled:
+        names = [n.lower() if n in ("X", "Y", "Z") else n for n in names]
+    return names
+
+
+def points_to_arrow(
+    points: record.PackedPointRecord,
+    scales: np.ndarray,
+    offsets: np.ndarray,
+    dimensions: Optional[Sequence[str]] = None,
+    scaled: bool = True,
+) -> "pa.RecordBatch":
+    """Converts the points to a record batch, with one column per dimension.
+
+    Points are stored field after field in a record, so each
+    plain field is gathered once into a contiguous array that Arrow uses
+    without copying it, the bytes holding sub-fields are gathered once
+    and each sub-field is decoded from them in one pass,
+    and scaled dimensions are computed in one pass.
+
+    Parameters
+    ----------
+    points: the points, they may only have some of the fields
+        (see the `dimensions` parameter of :meth:`.LasReader.read_points`)
+    scales: scales of X, Y, Z
+    offsets: offsets of X, Y, Z
+    dimensions: optional, the names of the dimensions to convert,
+        "x", "y", "z" being the scaled coordinates and "X", "Y", "Z" the raw ones.
+        By default all the dimensions, see :func:`.default_column_names`
+    scaled: When `dimensions` is not given, whether the scaled coordinates
+        are used instead of the raw ones. Also, whether extra bytes dimensions
+        that have scales & offsets are scaled.
+    """
+    pyarrow = _pyarrow()
+    point_format = points.point_format
+    array = points.array
+    if dimensions is None:
+        dimensions = default_column_names(point_format, scaled)
+
+    sub_fields_dict = dims.get_sub_fields_dict(point_format.id)
+    composed_fields = {}
+    columns = []
+    for name in dimensions:
+        if name in SCALED_COORDINATES:
+            i = SCALED_COORDINATES.index(name)
+            values = np.multiply(array[name.upper()], scales[i], dtype=np.float64)
+            values += offsets[i]
+            columns.append(pyarrow.array(values))
+            continue
+
+        try:
+            composed_name, sub_field = sub_fields_dict[name]
+        except KeyError:
+            pass
+        else:
+            try:
+                composed = composed_fields[composed_name]
+            except KeyError:
+                composed = np.ascontiguousarray(array[composed_name])
+                composed_fields[composed_name] = composed
+            values = np.bitwise_and(composed, sub_field.mask)
+            values >>= packing.least_significant_bit_set(sub_field.mask)
+            columns.append(pyarrow.array(values))
+            continue
+
+        dim_info = point_format.dimension_by_name(name)
+        values = array[name]
+        if scaled and dim_info.scales is not None:
+            values = values * dim_info.scales + dim_info.offsets
+        else:
+            values = np.ascontiguousarray(values)
+
+        if dim_info.num_elements > 1:
+            columns.append(
+                pyarrow.FixedSizeListArray.from_arrays(
+                    pyarrow.array(values.ravel()), dim_info.num_elements
+                )
+            )
+        else:
+            columns.append(pyarrow.array(values))
+
+    return pyarrow.RecordBatch.from_arrays(columns, names=list(dimensions))
+
+
+def points_from_arrow(
+    batch: Union["pa.RecordBatch", "pa.Table"], header: "LasHeader"
+) -> record.PackedPointRecord:
+    """Creates the point record of the header's point format
+    from a record batch (or a table).
+
+    Columns names must be dimension names, "x", "y", "z" columns
+    are converted using the header's scales & offsets, floating point
+    columns of scaled extra bytes dimensions are converted using their scales & offsets.
+    Dimensions that do not have a column are zero.
+    """
+    _pyarrow()
+    point_format = header.point_format
+    points = record.PackedPointRecord.zeros(point_format, batch.num_rows)
+
+    dimension_names = set(point_format.dimension_names)
+    for name, column in zip(batch.schema.names, batch.columns):
+        if name in SCALED_COORDINATES:
+            i = SCALED_COORDINATES.index(name)
+            points.array[name.upper()] = record.unscale_dimension(
+                _column_to_numpy(column), header.scales[i], header.offsets[i]
+            )
+        elif name in dimension_names:
+            dim_info = point_format.dimension_by_name(name)
+            values = _column_to_numpy(column, dim_info.num_elements)
+            if (
+                dim_info.scales is not None
+                and dim_info.kind != dims.DimensionKind.FloatingPoint
+                and values.dtype.kind == "f"
+            ):
+                values = record.unscale_dimension(
+                    values, dim_info.scales, dim_info.offsets
+                )
+            if dim_info.kind == dims.DimensionKind.BitField:
+                points[name] = values
+            else:
+                points.array[name] = values
+        else:
+            raise PylasError(
+                f"Column '{name}' is not a dimension of the point format {point_format}"
+            )
+    return points
+
+
+def _column_to_numpy(column, num_elements: int = 1) -> np.ndarray:
+    if isinstance(column, pa.ChunkedArray):
+        column = (
+            pa.concat_arrays(column.chunks)
+            if column.num_chunks
+            else pa.array([], column.type)
+        )
+    if num_elements > 1:
+        return column.flatten().to_numpy(zero_copy_only=False).reshape(-1, num_elements)
+    return column.to_numpy(zero_copy_only=False)
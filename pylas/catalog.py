@@ -0,0 +1,232 @@
+""" Catalog of the headers of many LAS/LAZ files.
+
+Building a catalog only reads the fixed size part of the header of each file
+(in one read, decoded in one go with a numpy record), VLRs are not read.
+Files are scanned by a pool of threads, and the results can be saved to a
+cache file, so that only new or modified files are scanned the next time.
+"""
+import concurrent.futures
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from .compression import compressed_id_to_uncompressed, is_point_format_compressed
+from .errors import PylasError
+from .header import LAS_FILE_SIGNATURE
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+#: Layout of the public header block, up to the fields added by LAS 1.4.
+#: Fields that come after the header size of the file's version are not valid.
+RAW_HEADER_DTYPE = np.dtype(
+    [
+        ("file_signature", "S4"),
+        ("file_source_id", "<u2"),
+        ("global_encoding", "<u2"),
+        ("guid", "V16"),
+        ("version_major", "u1"),
+        ("version_minor", "u1"),
+        ("system_identifier", "S32"),
+        ("generating_software", "S32"),
+        ("creation_day_of_year", "<u2"),
+        ("creation_year", "<u2"),
+        ("header_size", "<u2"),
+        ("offset_to_point_data", "<u4"),
+        ("number_of_vlrs", "<u4"),
+        ("point_format_id", "u1"),
+        ("point_size", "<u2"),
+        ("legacy_point_count", "<u4"),
+        ("legacy_number_of_points_by_return", "<u4", (5,)),
+        ("scales", "<f8", (3,)),
+        ("offsets", "<f8", (3,)),
+        # max_x, min_x, max_y, min_y, max_z, min_z
+        ("max_min", "<f8", (6,)),
+        ("start_of_waveform_data_packet_record", "<u8"),
+        ("start_of_first_evlr", "<u8"),
+        ("number_of_evlrs", "<u4"),
+        ("point_count", "<u8"),
+        ("number_of_points_by_return", "<u8", (15,)),
+    ]
+)
+#: Size of the header block of LAS 1.0 - 1.2
+MIN_HEADER_SIZE = 227
+
+
+class CatalogEntry(NamedTuple):
+    """The summary of the header of a file"""
+
+    #: absolute path of the file
+    path: str
+    #: size of the file in bytes, used to detect changes
+    size: int
+    #: modification time of the file in nanoseconds, used to detect changes
+    mtime_ns: int
+    version: str
+    point_format_id: int
+    are_points_compressed: bool
+    point_count: int
+    scales: Tuple[float, float, float]
+    offsets: Tuple[float, float, float]
+    mins: Tuple[float, float, float]
+    maxs: Tuple[float, float, float]
+    number_of_vlrs: int
+    number_of_evlrs: int
+    offset_to_point_data: int
+
+    @classmethod
+    def from_raw_header(
+        cls, path: str, size: int, mtime_ns: int, data: bytes
+    ) -> "CatalogEntry":
+        """Decodes the bytes of the header block (which may be shorter
+        than the LAS 1.4 header block)
+        """
+        if len(data) < MIN_HEADER_SIZE:
+            raise PylasError(f"{path}: file too small to be a LAS file")
+        if data[:4] != LAS_FILE_SIGNATURE:
+            raise PylasError(f'{path}: invalid file signature "{data[:4]}"')
+        data = data.ljust(RAW_HEADER_DTYPE.itemsize, b"\0")
+        raw = np.frombuffer(data, RAW_HEADER_DTYPE, count=1)[0]
+
+        minor = int(raw["version_minor"])
+        if minor >= 4:
+            point_count = int(raw["point_count"])
+            number_of_evlrs = int(raw["number_of_evlrs"])
+        else:
+            point_count = int(raw["legacy_point_count"])
+            number_of_evlrs = 0
+        point_format_id = int(raw["point_format_id"])
+        max_min = raw["max_min"]
+        return cls(
+            path=path,
+            size=size,
+            mtime_ns=mtime_ns,
+            version=f"{int(raw['version_major'])}.{minor}",
+            point_format_id=compressed_id_to_uncompressed(point_format_id),
+            are_points_compressed=is_point_format_compressed(point_format_id),
+            point_count=point_count,
+            scales=tuple(raw["scales"].tolist()),
+            offsets=tuple(raw["offsets"].tolist()),
+            mins=tuple(max_min[1::2].tolist()),
+            maxs=tuple(max_min[0::2].tolist()),
+            number_of_vlrs=int(raw["number_of_vlrs"]),
+            number_of_evlrs=number_of_evlrs,
+            offset_to_point_data=int(raw["offset_to_point_data"]),
+        )
+
+    def is_up_to_date(self, stat: os.stat_result) -> bool:
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+
+def read_entry(path: Union[str, Path]) -> CatalogEntry:
+    """Reads the header summary of a file"""
+    path = os.path.abspath(path)
+    with open(path, mode="rb") as f:
+        stat = os.fstat(f.fileno())
+        data = f.read(RAW_HEADER_DTYPE.itemsize)
+    return CatalogEntry.from_raw_header(path, stat.st_size, stat.st_mtime_ns, data)
+
+
+class Catalog:
+    """Header summaries of a collection of files, in the order the paths were given
+
+    >>> catalog = Catalog.scan(["pylastests/simple.las", "pylastests/test1_4.las"])
+    >>> [entry.point_count for entry in catalog]
+    [1065, 1000]
+    >>> catalog.entries[1].version
+    '1.4'
+    """
+
+    def __init__(self, entries: List[CatalogEntry]) -> None:
+        self.entries = entries
+
+    @classmethod
+    def scan(
+        cls,
+        paths: Iterable[Union[str, Path]],
+        max_workers: Optional[int] = None,
+        cache_path: Optional[Union[str, Path]] = None,
+    ) -> "Catalog":
+        """Reads the header summary of all the files.
+
+        Parameters
+        ----------
+        paths: paths of the files
+        max_workers: number of threads used to read the headers,
+            the default is the one of ThreadPoolExecutor
+        cache_path: optional, path of the cache file.
+            Entries of files that did not change (same size & modification time)
+            since the cache was written are taken from it, and the cache
+            is updated if anything changed.
+        """
+        paths = [os.path.abspath(p) for p in paths]
+        cached = load_cache(cache_path) if cache_path is not None else {}
+
+        entries: Dict[str, CatalogEntry] = {}
+        to_read = []
+        for path in paths:
+            entry = cached.get(path)
+            if entry is not None and entry.is_up_to_date(os.stat(path)):
+                entries[path] = entry
+            else:
+                to_read.append(path)
+
+        if to_read:
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                for entry in executor.map(read_entry, to_read):
+                    entries[entry.path] = entry
+
+        catalog = cls([entries[path] for path in paths])
+        if cache_path is not None and (to_read or len(cached) != len(entries)):
+            catalog.save_cache(cache_path)
+        return catalog
+
+    def save_cache(self, cache_path: Union[str, Path]) -> None:
+        """Writes the entries to the cache file, the file is replaced atomically"""
+        cache_path = Path(cache_path)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        content = {
+            "version": CACHE_VERSION,
+            "entries": [entry._asdict() for entry in self.entries],
+        }
+        with open(tmp_path, mode="w") as f:
+            json.dump(content, f)
+        os.replace(tmp_path, cache_path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, item) -> CatalogEntry:
+        return self.entries[item]
+
+
+def load_cache(cache_path: Union[str, Path]) -> Dict[str, CatalogEntry]:
+    """Loads the entries of a cache file, by path.
+
+    A missing or invalid cache is treated as empty.
+    """
+    try:
+        with open(cache_path) as f:
+            content = json.load(f)
+        if content.get("version") != CACHE_VERSION:
+            return {}
+        entries = {}
+        for values in content["entries"]:
+            for field in ("scales", "offsets", "mins", "maxs"):
+                values[field] = tuple(values[field])
+            entry = CatalogEntry(**values)
+            entries[entry.path] = entry
+        return entries
+    except FileNotFoundError:
+        return {}
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring invalid catalog cache {cache_path}: {e}")
+        return {}
@@ -0,0 +1,108 @@
+""" Cache of decompressed LAZ chunks
+"""
+import collections
+import threading
+from typing import Hashable, Optional
+
+import numpy as np
+
+#: Default maximum size of a ChunkCache
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+
+class ChunkCache:
+    """Least recently used cache of the decompressed points of LAZ chunks,
+    bounded by the number of bytes of the points it holds.
+
+    A cache is used by a :class:`.LasReader` once set as its
+    :attr:`.LasReader.chunk_cache`, it can be shared by many readers
+    (and threads). It also holds the blocks of a :class:`.RangeSource`.
+
+    >>> cache = ChunkCache(max_bytes=10)
+    >>> cache.put("a", np.zeros(6, np.uint8))
+    >>> cache.put("b", np.zeros(4, np.uint8))
+    >>> cache.get("a") is not None
+    True
+    >>> cache.put("c", np.zeros(4, np.uint8))  # "b" is the least recently used
+    >>> cache.get("b") is None
+    True
+    >>> cache.hits, cache.misses, cache.evictions, cache.nbytes
+    (1, 1, 1, 10)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_SIZE) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative")
+        self.max_bytes = max_bytes
+        #: Number of chunks found in the cache
+        self.hits = 0
+        #: Number of chunks that were not in the cache
+        self.misses = 0
+        #: Number of chunks removed to make room for new ones
+        self.evictions = 0
+        self._nbytes = 0
+        self._chunks: "collections.OrderedDict[Hashable, np.ndarray]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of the chunks in the cache"""
+        return self._nbytes
+
+    @property
+    def hit_ratio(self) -> float:
+        accesses = self.hits + self.misses
+        return self.hits / accesses if accesses else 0.0
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Returns the chunk data, or None if it is not in the cache"""
+        with self._lock:
+            try:
+                data = self._chunks[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._chunks.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: Hashable, data: np.ndarray) -> None:
+        """Adds the chunk data to the cache, evicting the least recently
+        used chunks if needed.
+
+        Data larger than the cache is not stored,
+        the data is made read-only as it is shared.
+        """
+        if data.nbytes > self.max_bytes:
+            return
+        data.flags.writeable = False
+        with self._lock:
+            previous = self._chunks.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            while self._chunks and self._nbytes + data.nbytes > self.max_bytes:
+                _, evicted = self._chunks.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+                self.evictions += 1
+            self._chunks[key] = data
+            self._nbytes += data.nbytes
+
+    def clear(self) -> None:
+        """Removes all the chunks, the counters are kept"""
+        with self._lock:
+            self._chunks.clear()
+            self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._chunks
+
+    def __repr__(self) -> str:
+        return (
+            f"<ChunkCache({len(self)} chunks, {self.nbytes}/{self.max_bytes} bytes,"
+            f" hits: {self.hits}, misses: {self.misses})>"
+        )
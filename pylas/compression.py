@@ -1,8 +1,12 @@
 """ The functions related to the LAZ format (compressed LAS)
 """
 import enum
+import re
 from typing import Tuple
 
+#: Oldest lazrs version supported, it must match the requirement of setup.py
+LAZRS_MIN_VERSION = (0, 4, 4)
+
 
 class LazBackend(enum.Enum):
     """Supported backends for reading and writing LAS/LAZ"""
@@ -35,6 +39,14 @@ class LazBackend(enum.Enum):
         else:
             return False
 
+    def supports_variable_chunk_size(self) -> bool:
+        """Returns true if the backend can write LAZ files with variable size chunks,
+        which lazrs does from LAZRS_MIN_VERSION
+        """
+        if self == LazBackend.Laszip or not self.is_available():
+            return False
+        return lazrs_version() >= LAZRS_MIN_VERSION
+
     @staticmethod
     def detect_available() -> Tuple["LazBackend", ...]:
         """Returns a tuple containing the available backends in the current
@@ -52,6 +64,19 @@ class LazBackend(enum.Enum):
         return tuple(available_backends)
 
 
+def lazrs_version() -> Tuple[int, ...]:
+    """Returns the (major, minor, patch) version of the installed lazrs"""
+    try:
+        from importlib.metadata import version
+    except ImportError:  # python < 3.8
+        from pkg_resources import get_distribution
+
+        text = get_distribution("lazrs").version
+    else:
+        text = version("lazrs")
+    return tuple(int(part) for part in re.findall(r"\d+", text)[:3])
+
+
 def is_point_format_compressed(point_format_id: int) -> bool:
     compression_bit_7 = (point_format_id & 0x80) >> 7
     compression_bit_6 = (point_format_id & 0x40) >> 6
@@ -65,4 +90,4 @@ def compressed_id_to_uncompressed(point_format_id: int) -> int:
 
 
 def uncompressed_id_to_compressed(point_format_id: int) -> int:
-    return (2 ** 7) | point_format_id
+    return (2**7) | point_format_id
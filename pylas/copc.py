@@ -0,0 +1,922 @@
+""" Reading and writing of COPC (Cloud Optimized Point Cloud) files.
+
+A COPC file is a LAZ 1.4 file (point format 6, 7 or 8) whose points are
+organized in an octree: each node of the octree is one chunk of compressed points,
+the nodes are listed in the hierarchy EVLR, and the cube of the octree
+is described by the :class:`.CopcInfoVlr`, which is the first VLR of the file.
+"""
+import collections
+import concurrent.futures
+import copy
+import io
+import logging
+import math
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from . import lazchunktable, lazparallel
+from .compression import LazBackend
+from .errors import PylasError
+from .header import LasHeader, Version
+from .lasreader import LasReader
+from .lib import open_las
+from .point import record
+from .point.format import PointFormat
+from .point.record import PackedPointRecord
+from .typehints import PathLike
+from .vlrs.known import CopcInfoVlr, VARIABLE_CHUNK_SIZE
+from .vlrs.vlr import VLR
+from .vlrs.vlrlist import VLRList
+
+logger = logging.getLogger(__name__)
+
+#: user_id of the VLRs of COPC files
+COPC_USER_ID = "copc"
+#: record_id of the EVLR holding the hierarchy
+HIERARCHY_RECORD_ID = 1000
+#: Point formats COPC files can have
+COPC_POINT_FORMATS = (6, 7, 8)
+#: Position of the data of the CopcInfoVlr, it follows the
+#: header of LAS 1.4 files (375 bytes) and the header of the VLR (54 bytes)
+INFO_VLR_DATA_OFFSET = 375 + 54
+#: Size of the header of an EVLR
+EVLR_HEADER_SIZE = 60
+
+#: Default number of sampling cells along each axis of a node
+DEFAULT_GRID_SIZE = 128
+#: Default number of levels of the octree described by a hierarchy page
+DEFAULT_HIERARCHY_PAGE_LEVELS = 4
+#: Default number of bytes of points kept in memory while building the octree
+DEFAULT_MEMORY_LIMIT = 512 * 1024 * 1024
+
+#: Maximum number of contiguous nodes decompressed by one task
+MAX_NODES_PER_TASK = 8
+
+#: Bounds of a query, (min_x, min_y, max_x, max_y)
+#: or (min_x, min_y, min_z, max_x, max_y, max_z)
+Bounds = Sequence[float]
+
+#: Point format of COPC files, for each point format
+_COPC_POINT_FORMAT_IDS = {0: 6, 1: 6, 2: 7, 3: 7, 4: 6, 5: 7, 9: 6, 10: 8}
+
+
+class VoxelKey(NamedTuple):
+    """Identifies a node of the octree, the root is (0, 0, 0, 0),
+    the children of a node (l, x, y, z) are (l + 1, 2x + i, 2y + j, 2z + k)
+    """
+
+    level: int
+    x: int
+    y: int
+    z: int
+
+    def parent(self) -> "VoxelKey":
+        return VoxelKey(self.level - 1, self.x // 2, self.y // 2, self.z // 2)
+
+    def ancestor(self, level: int) -> "VoxelKey":
+        """The node of the given level that contains this node"""
+        shift = self.level - level
+        return VoxelKey(level, self.x >> shift, self.y >> shift, self.z >> shift)
+
+    def children(self) -> List["VoxelKey"]:
+        return [
+            VoxelKey(self.level + 1, 2 * self.x + i, 2 * self.y + j, 2 * self.z + k)
+            for i in (0, 1)
+            for j in (0, 1)
+            for k in (0, 1)
+        ]
+
+
+class HierarchyEntry(NamedTuple):
+    """Entry of a hierarchy page.
+
+    For a node of the octree, the position and size in bytes of its chunk
+    of compressed points. When point_count is -1, the entry describes
+    the position and size of another hierarchy page, the one of the subtree
+    of the node.
+    """
+
+    key: VoxelKey
+    offset: int
+    byte_size: int
+    point_count: int
+
+
+_ENTRY_STRUCT = struct.Struct("<4iQ2i")
+
+
+def encode_page(entries: Iterable[HierarchyEntry]) -> bytes:
+    """Returns the bytes of a hierarchy page
+
+    >>> entry = HierarchyEntry(VoxelKey(0, 0, 0, 0), 1000, 200, 50)
+    >>> decode_page(encode_page([entry])) == [entry]
+    True
+    """
+    return b"".join(
+        _ENTRY_STRUCT.pack(*entry.key, entry.offset, entry.byte_size, entry.point_count)
+        for entry in entries
+    )
+
+
+def decode_page(data: bytes) -> List[HierarchyEntry]:
+    """Returns the entries of a hierarchy page"""
+    return [
+        HierarchyEntry(VoxelKey(level, x, y, z), offset, byte_size, point_count)
+        for level, x, y, z, offset, byte_size, point_count in _ENTRY_STRUCT.iter_unpack(
+            data
+        )
+    ]
+
+
+class Octree:
+    """The cube of an octree, given by its center and half of its size
+
+    >>> octree = Octree.from_bounds([0.0, 0.0, 0.0], [10.0, 4.0, 2.0])
+    >>> octree.node_bounds(VoxelKey(1, 1, 0, 0))
+    (array([ 5., -3., -4.]), array([10.,  2.,  1.]))
+    """
+
+    def __init__(self, center: np.ndarray, halfsize: float) -> None:
+        if halfsize <= 0:
+            raise ValueError("The halfsize of the octree must be greater than 0")
+        self.center = np.array(center, np.float64)
+        self.halfsize = float(halfsize)
+
+    @classmethod
+    def from_bounds(cls, mins: np.ndarray, maxs: np.ndarray) -> "Octree":
+        """The smallest cube that contains the bounds"""
+        mins = np.array(mins, np.float64)
+        maxs = np.array(maxs, np.float64)
+        halfsize = float(np.max(maxs - mins)) / 2
+        return cls((mins + maxs) / 2, halfsize if halfsize > 0 else 1.0)
+
+    @property
+    def mins(self) -> np.ndarray:
+        return self.center - self.halfsize
+
+    @property
+    def size(self) -> float:
+        return 2 * self.halfsize
+
+    def node_bounds(self, key: VoxelKey) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the mins and maxs of the cube of a node"""
+        node_size = self.size / (1 << key.level)
+        mins = self.mins + np.array(key[1:], np.float64) * node_size
+        return mins, mins + node_size
+
+    def cells(self, xyz: np.ndarray, resolution: int) -> np.ndarray:
+        """Returns, as an (n, 3) array, the indices of the cells of a regular
+        grid of resolution³ cells covering the cube, that contain the points.
+        Points outside the cube are put in the closest cell.
+        """
+        cells = np.floor((xyz - self.mins) * (resolution / self.size))
+        return np.clip(cells, 0, resolution - 1).astype(np.int64)
+
+    def __repr__(self) -> str:
+        return f"<Octree(center: {self.center}, halfsize: {self.halfsize})>"
+
+
+def copc_point_format(point_format: PointFormat) -> PointFormat:
+    """Returns the point format (6, 7 or 8) of COPC files that keeps
+    the most dimensions of the point format (and its extra bytes)
+    """
+    if point_format.id in COPC_POINT_FORMATS:
+        return point_format
+    copc_format = PointFormat(_COPC_POINT_FORMAT_IDS[point_format.id])
+    copc_format.dimensions.extend(point_format.extra_dimensions)
+    return copc_format
+
+
+def default_max_depth(point_count: int, grid_size: int) -> int:
+    """Depth of an octree whose leaves have at most about grid_size² points,
+    when points are on a surface (as for aerial lidar)
+
+    >>> default_max_depth(1_000_000, 128)
+    3
+    """
+    depth = 0
+    while point_count > grid_size ** 2 * 4 ** depth and depth < _deepest_level(
+        grid_size
+    ):
+        depth += 1
+    return depth
+
+
+def _deepest_level(grid_size: int) -> int:
+    """Deepest level for which the cell indices fit in an int64"""
+    level = 0
+    while (grid_size << (level + 1)) ** 3 < 2 ** 63:
+        level += 1
+    return level
+
+
+class _NodeStore:
+    """The points of each node, they are kept in memory until they take
+    more than memory_limit bytes, then they are appended to one file per node.
+
+    reserved_bytes is memory used by others (the occupied cells of the octree)
+    that counts against the memory_limit.
+    """
+
+    def __init__(self, directory: Path, memory_limit: int) -> None:
+        self.directory = directory
+        self.memory_limit = memory_limit
+        self.reserved_bytes = 0
+        self.point_counts: Dict[VoxelKey, int] = collections.Counter()
+        self._buffers: Dict[VoxelKey, List[np.ndarray]] = collections.defaultdict(list)
+        self._buffered_bytes = 0
+        self._spilled = set()
+
+    def add(self, key: VoxelKey, array: np.ndarray) -> None:
+        self._buffers[key].append(array)
+        self._buffered_bytes += array.nbytes
+        self.point_counts[key] += len(array)
+        if self._buffered_bytes > self.memory_limit - self.reserved_bytes:
+            self.spill()
+
+    def spill(self) -> None:
+        """Appends the points in memory to the files of their node"""
+        for key, arrays in self._buffers.items():
+            with open(self._path(key), "ab") as f:
+                for array in arrays:
+                    np.ascontiguousarray(array).tofile(f)
+            self._spilled.add(key)
+        self._buffers.clear()
+        self._buffered_bytes = 0
+
+    def pop(self, key: VoxelKey, dtype: np.dtype) -> np.ndarray:
+        """Returns the points of the node and forgets them"""
+        arrays = self._buffers.pop(key, [])
+        if key in self._spilled:
+            path = self._path(key)
+            arrays.insert(0, np.fromfile(path, dtype))
+            os.remove(path)
+        return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+    def _path(self, key: VoxelKey) -> Path:
+        return self.directory / "{}-{}-{}-{}.bin".format(*key)
+
+
+class _OctreeBuilder:
+    """Distributes points to the nodes of the octree.
+
+    Each node is divided into grid_size³ cells, a point is kept in
+    the first node, from the root, where its cell is still empty.
+    Nodes of the last level keep all the points that reach them.
+    """
+
+    def __init__(
+        self, octree: Octree, max_depth: int, grid_size: int, store: _NodeStore
+    ) -> None:
+        self.octree = octree
+        self.max_depth = max_depth
+        self.grid_size = grid_size
+        self.store = store
+        # Sorted indices (within their node) of the occupied cells, for each node
+        self._occupied: Dict[Tuple[int, int], np.ndarray] = {}
+        self._cell_id_type = np.uint32 if grid_size ** 3 <= 2 ** 32 else np.uint64
+
+    def add(self, points: PackedPointRecord, xyz: np.ndarray) -> None:
+        remaining = np.arange(len(points))
+        for level in range(self.max_depth + 1):
+            if len(remaining) == 0:
+                break
+            resolution = self.grid_size << level
+            cells = self.octree.cells(xyz[remaining], resolution)
+            if level == self.max_depth:
+                kept = np.ones(len(remaining), np.bool_)
+            else:
+                kept = self._occupy(level, cells, resolution)
+            self._add_to_nodes(
+                level, cells[kept] // self.grid_size, points.array[remaining[kept]]
+            )
+            remaining = remaining[~kept]
+
+    def _occupy(self, level: int, cells: np.ndarray, resolution: int) -> np.ndarray:
+        """Marks the empty cells as occupied, returns the mask of the
+        points that occupied them (the first point of each empty cell)
+        """
+        ids = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+        unique_ids, first_points = np.unique(ids, return_index=True)
+        unique_cells = cells[first_points]
+        nodes_per_axis, grid_size = 1 << level, self.grid_size
+        nodes = unique_cells // grid_size
+        node_ids = (nodes[:, 0] * nodes_per_axis + nodes[:, 1]) * nodes_per_axis
+        node_ids += nodes[:, 2]
+        local = unique_cells % grid_size
+        cell_ids = (local[:, 0] * grid_size + local[:, 1]) * grid_size + local[:, 2]
+        cell_ids = cell_ids.astype(self._cell_id_type)
+
+        # Group the cells by node, each node has its own sorted array so that
+        # inserting cells only copies the arrays of the nodes they are in
+        order = np.lexsort((cell_ids, node_ids))
+        node_ids, cell_ids = node_ids[order], cell_ids[order]
+        first_points = first_points[order]
+        bounds = np.flatnonzero(np.diff(node_ids)) + 1
+        is_empty = np.ones(len(cell_ids), np.bool_)
+        for start, end in zip(
+            np.concatenate(([0], bounds)), np.concatenate((bounds, [len(node_ids)]))
+        ):
+            key = (level, int(node_ids[start]))
+            new_ids = cell_ids[start:end]
+            occupied = self._occupied.get(key)
+            if occupied is None:
+                self._occupied[key] = new_ids
+                self.store.reserved_bytes += new_ids.nbytes
+                continue
+            positions = np.searchsorted(occupied, new_ids)
+            empty = occupied[np.minimum(positions, len(occupied) - 1)] != new_ids
+            is_empty[start:end] = empty
+            self._occupied[key] = np.insert(occupied, positions[empty], new_ids[empty])
+            self.store.reserved_bytes += new_ids[empty].nbytes
+
+        kept = np.zeros(len(cells), np.bool_)
+        kept[first_points[is_empty]] = True
+        return kept
+
+    def _add_to_nodes(self, level: int, nodes: np.ndarray, array: np.ndarray) -> None:
+        if len(array) == 0:
+            return
+        keys, inverse = np.unique(nodes, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        counts = np.bincount(inverse, minlength=len(keys))
+        sorted_array = array[np.argsort(inverse, kind="stable")]
+        start = 0
+        for key, count in zip(keys, counts):
+            self.store.add(
+                VoxelKey(level, int(key[0]), int(key[1]), int(key[2])),
+                sorted_array[start : start + count],
+            )
+            start += count
+
+
+def _paginate(
+    keys: List[VoxelKey], page_levels: Optional[int]
+) -> Dict[VoxelKey, Tuple[List[VoxelKey], List[VoxelKey]]]:
+    """Splits the nodes into hierarchy pages.
+
+    A page starts at the root and at each node whose level is a multiple
+    of page_levels, it has the entries of the nodes of its subtree,
+    down to the next pages, and the entries of these pages.
+
+    Returns, by root of the page, the nodes and the roots of the sub pages
+    of the page. The first page is the one of the root.
+    """
+    pages = collections.OrderedDict()
+    for key in sorted(keys):
+        if page_levels is None or page_levels <= 0:
+            page_root = VoxelKey(0, 0, 0, 0)
+        else:
+            page_root = key.ancestor(key.level - key.level % page_levels)
+        if page_root not in pages:
+            pages[page_root] = ([], [])
+            if page_root.level > 0:
+                parent_page = page_root.ancestor(page_root.level - page_levels)
+                pages[parent_page][1].append(page_root)
+        pages[page_root][0].append(key)
+    return pages
+
+
+def _encode_hierarchy(
+    pages: Dict[VoxelKey, Tuple[List[VoxelKey], List[VoxelKey]]],
+    nodes: Dict[VoxelKey, Tuple[int, int, int]],
+    offset: int,
+) -> bytes:
+    """Returns the bytes of all the pages, the first one being at `offset`
+
+    nodes gives the offset, byte size and point count of each node
+    """
+    page_offsets = {}
+    page_sizes = {}
+    for page_root, (keys, sub_pages) in pages.items():
+        page_offsets[page_root] = offset
+        page_sizes[page_root] = _ENTRY_STRUCT.size * (len(keys) + len(sub_pages))
+        offset += page_sizes[page_root]
+
+    data = []
+    for keys, sub_pages in pages.values():
+        entries = [HierarchyEntry(key, *nodes[key]) for key in keys]
+        entries.extend(
+            HierarchyEntry(key, page_offsets[key], page_sizes[key], -1)
+            for key in sub_pages
+        )
+        data.append(encode_page(entries))
+    return b"".join(data)
+
+
+def _copc_header(header: LasHeader, point_format: PointFormat) -> LasHeader:
+    copc_header = copy.deepcopy(header)
+    copc_header.set_version_and_point_format(Version(1, 4), point_format)
+    copc_header.vlrs = VLRList(
+        vlr
+        for vlr in copc_header.vlrs
+        if vlr.user_id != COPC_USER_ID and vlr.user_id != "laszip encoded"
+    )
+    return copc_header
+
+
+def write_copc(
+    source: Union[PathLike, BinaryIO],
+    dest: Union[PathLike, BinaryIO],
+    max_depth: Optional[int] = None,
+    grid_size: int = DEFAULT_GRID_SIZE,
+    points_per_iteration: int = 1_000_000,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    hierarchy_page_levels: Optional[int] = DEFAULT_HIERARCHY_PAGE_LEVELS,
+    laz_backend: Union[LazBackend, Iterable[LazBackend]] = (
+        LazBackend.LazrsParallel,
+        LazBackend.Lazrs,
+    ),
+    temporary_directory: Optional[PathLike] = None,
+) -> List[HierarchyEntry]:
+    """Writes the points of a LAS/LAZ file as a COPC file.
+
+    The source is read once, by chunks, each point goes to the first node of the
+    octree (from the root) where its sampling cell is empty, so that each level
+    of the octree adds details to the previous ones. The points of the nodes
+    are kept in memory up to `memory_limit` bytes, then they are appended
+    to temporary files, one per node. The memory_limit also accounts for the
+    occupied sampling cells (4 or 8 bytes per point of the non-leaf nodes),
+    which cannot be written to files: once they alone reach the limit, points
+    are appended to the files as they come, and the limit is exceeded
+    by the cells only.
+
+    The nodes are then written breadth first through a :class:`.LasWriter`
+    with variable size chunks, one chunk per node, with the lazrs backend
+    (chunks are compressed in parallel with LazBackend.LazrsParallel).
+    The COPC info VLR and the hierarchy EVLR are updated once
+    the positions of the chunks are known. EVLRs of the source are not copied.
+
+    Parameters
+    ----------
+    source: the LAS/LAZ file to convert, the cube of the octree
+        is computed from the bounds of its header
+    dest: path of the COPC file or file object, which must be readable and seekable,
+        the file is written from its start
+    max_depth: optional, the level of the deepest nodes, by default it depends on
+        the number of points, see :func:`.default_max_depth`
+    grid_size: number of sampling cells along each axis of a node, the root keeps
+        at most grid_size³ points and the spacing of its points is the size
+        of the octree divided by grid_size
+    points_per_iteration: number of points read at a time
+    memory_limit: number of bytes of points (and of occupied sampling cells)
+        kept in memory, before points are written to temporary files
+    hierarchy_page_levels: number of levels of the octree whose nodes
+        are in the same page of the hierarchy, None to have only one page
+    laz_backend: the lazrs backend(s) to use, the laszip backend
+        cannot write variable size chunks
+    temporary_directory: optional, where the temporary files are created
+
+    Returns
+    -------
+    The entries of the nodes of the octree
+    """
+    if grid_size < 1:
+        raise ValueError("grid_size must be at least 1")
+
+    with open_las(source) as reader:
+        header = reader.header
+        point_format = copc_point_format(header.point_format)
+        octree = Octree.from_bounds(header.mins, header.maxs)
+        if max_depth is None:
+            max_depth = default_max_depth(header.point_count, grid_size)
+        elif not 0 <= max_depth <= _deepest_level(grid_size):
+            raise ValueError(
+                f"max_depth must be between 0 and {_deepest_level(grid_size)}"
+            )
+        logger.info(f"Writing an octree of depth {max_depth}, {octree}")
+
+        gps_times = [np.inf, -np.inf]
+        with tempfile.TemporaryDirectory(dir=temporary_directory) as directory:
+            store = _NodeStore(Path(directory), memory_limit)
+            builder = _OctreeBuilder(octree, max_depth, grid_size, store)
+            for points in reader.chunk_iterator(points_per_iteration):
+                if points.point_format != point_format:
+                    points = PackedPointRecord.from_point_record(points, point_format)
+                xyz = np.stack(
+                    [
+                        points[name] * scale + offset
+                        for name, scale, offset in zip(
+                            "XYZ", header.scales, header.offsets
+                        )
+                    ],
+                    axis=1,
+                )
+                builder.add(points, xyz)
+                gps_time = points.array["gps_time"]
+                gps_times[0] = min(gps_times[0], gps_time.min())
+                gps_times[1] = max(gps_times[1], gps_time.max())
+
+            info = CopcInfoVlr()
+            info.center = octree.center
+            info.halfsize = octree.halfsize
+            info.spacing = octree.size / grid_size
+            if store.point_counts:
+                info.gps_time_minimum, info.gps_time_maximum = gps_times
+
+            copc_header = _copc_header(header, point_format)
+            copc_header.vlrs.insert(0, info)
+
+            if isinstance(dest, (str, Path)):
+                with open(dest, "w+b") as f:
+                    return _write_nodes(
+                        f, copc_header, store, hierarchy_page_levels, laz_backend
+                    )
+            return _write_nodes(
+                dest, copc_header, store, hierarchy_page_levels, laz_backend
+            )
+
+
+def _write_nodes(
+    dest: BinaryIO,
+    header: LasHeader,
+    store: _NodeStore,
+    hierarchy_page_levels: Optional[int],
+    laz_backend: Union[LazBackend, Iterable[LazBackend]],
+) -> List[HierarchyEntry]:
+    """Writes the points of the nodes, one chunk per node, then the hierarchy,
+    and updates the CopcInfoVlr (the first VLR of the header)
+    """
+    keys = sorted(store.point_counts)
+    pages = _paginate(keys, hierarchy_page_levels)
+    hierarchy_size = _ENTRY_STRUCT.size * sum(
+        len(page_keys) + len(sub_pages) for page_keys, sub_pages in pages.values()
+    )
+
+    with open_las(
+        dest,
+        mode="w",
+        header=header,
+        laz_backend=laz_backend,
+        closefd=False,
+        variable_chunk_size=True,
+    ) as writer:
+        point_format = writer.header.point_format
+        for key in keys:
+            array = store.pop(key, point_format.dtype())
+            writer.write_points(PackedPointRecord(array, point_format), copy=False)
+            writer.end_chunk()
+        # The hierarchy is written once the positions of the chunks are known
+        writer.write_evlrs(
+            VLRList(
+                [
+                    VLR(
+                        COPC_USER_ID,
+                        HIERARCHY_RECORD_ID,
+                        "copc hierarchy",
+                        bytes(hierarchy_size),
+                    )
+                ]
+            )
+        )
+    written_header = writer.header
+
+    entries = lazchunktable.read_chunk_table(
+        dest,
+        written_header.offset_to_point_data,
+        VARIABLE_CHUNK_SIZE,
+        written_header.point_count,
+    )
+    if [e.point_count for e in entries] != [store.point_counts[k] for k in keys]:
+        raise PylasError("The chunks written do not match the nodes of the octree")
+    chunk_starts = lazchunktable.chunk_starts(
+        entries, written_header.offset_to_point_data
+    )
+    nodes = {
+        key: (int(chunk_starts[i]), entry.byte_count, entry.point_count)
+        for i, (key, entry) in enumerate(zip(keys, entries))
+    }
+
+    hierarchy_offset = written_header.start_of_first_evlr + EVLR_HEADER_SIZE
+    dest.seek(hierarchy_offset)
+    dest.write(_encode_hierarchy(pages, nodes, hierarchy_offset))
+
+    info = header.vlrs[0]
+    info.root_hierarchy_offset = hierarchy_offset
+    if pages:
+        root_keys, root_sub_pages = next(iter(pages.values()))
+        info.root_hierarchy_size = _ENTRY_STRUCT.size * (
+            len(root_keys) + len(root_sub_pages)
+        )
+    dest.seek(INFO_VLR_DATA_OFFSET)
+    dest.write(info.record_data_bytes())
+    dest.seek(0, os.SEEK_END)
+
+    return [HierarchyEntry(key, *nodes[key]) for key in keys]
+
+
+def is_copc(header: LasHeader) -> bool:
+    """Whether the header is the one of a COPC file,
+    whose first VLR is the :class:`.CopcInfoVlr`
+    """
+    return len(header.vlrs) > 0 and isinstance(header.vlrs[0], CopcInfoVlr)
+
+
+def _bounds_to_3d(bounds: Bounds) -> Tuple[np.ndarray, np.ndarray]:
+    bounds = np.array(bounds, np.float64)
+    if len(bounds) == 4:
+        return (
+            np.array([bounds[0], bounds[1], -np.inf]),
+            np.array([bounds[2], bounds[3], np.inf]),
+        )
+    elif len(bounds) == 6:
+        return bounds[:3], bounds[3:]
+    raise ValueError("bounds must have 4 (2D) or 6 (3D) values")
+
+
+class CopcHierarchy:
+    """The hierarchy of a COPC file, its pages are only read
+    when they are needed, and only once
+    """
+
+    def __init__(self, source: BinaryIO, info: CopcInfoVlr) -> None:
+        self.source = source
+        self.root_page = (info.root_hierarchy_offset, info.root_hierarchy_size)
+        self._pages: Dict[int, List[HierarchyEntry]] = {}
+
+    @property
+    def number_of_pages_read(self) -> int:
+        return len(self._pages)
+
+    def page(self, offset: int, size: int) -> List[HierarchyEntry]:
+        """Returns the entries of the page, the position of the source is restored"""
+        try:
+            return self._pages[offset]
+        except KeyError:
+            pass
+        position = self.source.tell()
+        try:
+            self.source.seek(offset, io.SEEK_SET)
+            data = self.source.read(size)
+        finally:
+            self.source.seek(position, io.SEEK_SET)
+        if len(data) != size:
+            raise PylasError("The hierarchy page is truncated")
+        entries = decode_page(data)
+        self._pages[offset] = entries
+        return entries
+
+    def nodes(
+        self, accept: Callable[[VoxelKey], bool] = lambda key: True
+    ) -> List[HierarchyEntry]:
+        """Returns the entries of the nodes (that have points) accepted, breadth first.
+
+        If a node is not accepted, its subtree must not be accepted either,
+        so that the pages of the subtree are not read.
+        """
+        nodes = {}
+        pages = [self.root_page]
+        while pages:
+            for entry in self.page(*pages.pop()):
+                if not accept(entry.key):
+                    continue
+                if entry.point_count == -1:
+                    pages.append((entry.offset, entry.byte_size))
+                elif entry.point_count > 0:
+                    nodes[entry.key] = entry
+        return [nodes[key] for key in sorted(nodes)]
+
+
+class CopcReader(LasReader):
+    """Reader of COPC files, which can also read only the points of a region,
+    and/or of the first levels of the octree (levels of detail),
+    see :meth:`.query`.
+
+    >>> with CopcReader.open("pylastests/simple.copc.laz") as reader:  # doctest: +SKIP
+    ...     overview = reader.query(max_depth=2)
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        closefd: bool = True,
+        laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+    ) -> None:
+        if not source.seekable():
+            raise PylasError("COPC files can only be read from seekable sources")
+        super().__init__(source, closefd=closefd, laz_backend=laz_backend)
+        if not is_copc(self.header) or not self.header.are_points_compressed:
+            self.close()
+            raise PylasError("The file is not a COPC file, it has no COPC info VLR")
+        self.source = source
+        #: The CopcInfoVlr of the file
+        self.copc_info: CopcInfoVlr = self.header.vlrs[0]
+        self.octree = Octree(self.copc_info.center, self.copc_info.halfsize)
+        self.hierarchy = CopcHierarchy(source, self.copc_info)
+
+    @classmethod
+    def open(
+        cls,
+        path: PathLike,
+        laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+    ) -> "CopcReader":
+        return cls(open(path, mode="rb"), closefd=True, laz_backend=laz_backend)
+
+    def depth_of_resolution(self, resolution: float) -> int:
+        """The first level of the octree whose spacing of points is at most
+        the resolution
+        """
+        if resolution <= 0:
+            raise ValueError("The resolution must be greater than 0")
+        return max(0, math.ceil(math.log2(self.copc_info.spacing / resolution)))
+
+    def nodes(
+        self,
+        bounds: Optional[Bounds] = None,
+        max_depth: Optional[int] = None,
+        resolution: Optional[float] = None,
+    ) -> List[HierarchyEntry]:
+        """Returns the entries of the nodes that intersect the bounds,
+        up to max_depth (and/or the depth of the resolution).
+        Only the hierarchy pages of these nodes are read.
+        """
+        if resolution is not None:
+            depth = self.depth_of_resolution(resolution)
+            max_depth = depth if max_depth is None else min(max_depth, depth)
+        if bounds is not None:
+            query_mins, query_maxs = _bounds_to_3d(bounds)
+
+        def accept(key: VoxelKey) -> bool:
+            if max_depth is not None and key.level > max_depth:
+                return False
+            if bounds is not None:
+                mins, maxs = self.octree.node_bounds(key)
+                return bool(np.all(mins <= query_maxs) and np.all(query_mins <= maxs))
+            return True
+
+        return self.hierarchy.nodes(accept)
+
+    def query(
+        self,
+        bounds: Optional[Bounds] = None,
+        max_depth: Optional[int] = None,
+        resolution: Optional[float] = None,
+        dimensions: Optional[Sequence[str]] = None,
+        num_workers: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> record.ScaleAwarePointRecord:
+        """Returns the points that are in the bounds (bounds included),
+        of the nodes of the octree up to max_depth.
+
+        Only the hierarchy pages and the nodes needed are read,
+        the nodes are decompressed in parallel, independently of each other.
+        Points are returned level after level, so the first ones give
+        an overview of the region.
+
+        The position of the reader is not changed.
+
+        Parameters
+        ----------
+        bounds: optional, (min_x, min_y, max_x, max_y) or
+            (min_x, min_y, min_z, max_x, max_y, max_z), in scaled coordinates
+        max_depth: optional, the deepest level of the octree to read, 0 being the root
+        resolution: optional, reads the levels down to the first one
+            whose spacing of points is at most the resolution
+        dimensions: optional, names of the dimensions to return,
+            see :meth:`.read_points`
+        num_workers: optional, number of workers, defaults to os.cpu_count()
+        executor: optional, executor to which the decompression is submitted
+            By default a ThreadPoolExecutor of num_workers threads is used.
+        """
+        point_format = self.header.point_format
+        arrays = []
+        for points_data in self._iter_decompressed_nodes(
+            self.nodes(bounds, max_depth, resolution), num_workers, executor
+        ):
+            array = np.frombuffer(points_data, point_format.dtype())
+            if bounds is not None:
+                array = array[self._points_in_bounds(array, bounds)]
+            if dimensions is not None:
+                array = record.project_points(
+                    array, record.fields_of_dimensions(point_format, dimensions)
+                )
+            arrays.append(array)
+
+        if not arrays:
+            empty = np.zeros(0, point_format.dtype())
+            if dimensions is not None:
+                empty = record.project_points(
+                    empty, record.fields_of_dimensions(point_format, dimensions)
+                )
+            arrays.append(empty)
+
+        return record.ScaleAwarePointRecord(
+            np.concatenate(arrays),
+            point_format,
+            self.header.scales,
+            self.header.offsets,
+        )
+
+    def _points_in_bounds(self, array: np.ndarray, bounds: Bounds) -> np.ndarray:
+        mins, maxs = _bounds_to_3d(bounds)
+        mask = np.ones(len(array), np.bool_)
+        for i, name in enumerate("XYZ"):
+            if np.isinf(mins[i]) and np.isinf(maxs[i]):
+                continue
+            values = array[name] * self.header.scales[i] + self.header.offsets[i]
+            mask &= (values >= mins[i]) & (values <= maxs[i])
+        return mask
+
+    def _iter_decompressed_nodes(
+        self,
+        nodes: List[HierarchyEntry],
+        num_workers: Optional[int],
+        executor: Optional[concurrent.futures.Executor],
+    ) -> Iterator[memoryview]:
+        """Decompresses the nodes in parallel, yields their points in order.
+
+        Consecutive nodes that are next to each other in the file
+        are decompressed by the same task.
+        """
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        backend = lazparallel.decoding_backend(self._laz_backend_in_use)
+        point_size = self.header.point_format.size
+
+        tasks: Deque[List[HierarchyEntry]] = collections.deque()
+        for node in nodes:
+            if (
+                tasks
+                and len(tasks[-1]) < MAX_NODES_PER_TASK
+                and tasks[-1][-1].offset + tasks[-1][-1].byte_size == node.offset
+            ):
+                tasks[-1].append(node)
+            else:
+                tasks.append([node])
+        # Bound the number of tasks submitted at once
+        # to bound the memory used by compressed & decompressed nodes
+        max_in_flight = 2 * num_workers
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_workers)
+
+        def submit(task: List[HierarchyEntry]) -> concurrent.futures.Future:
+            start = task[0].offset
+            size = task[-1].offset + task[-1].byte_size - start
+            position = self.source.tell()
+            try:
+                self.source.seek(start, io.SEEK_SET)
+                compressed_nodes = self.source.read(size)
+            finally:
+                self.source.seek(position, io.SEEK_SET)
+
+            point_count = sum(node.point_count for node in task)
+            if backend == LazBackend.Laszip:
+                header_data = lazparallel.laszip_header_data(
+                    self.header, self._laszip_vlr, point_count
+                )
+            else:
+                header_data = b""
+            return executor.submit(
+                lazparallel.decompress_chunks,
+                backend,
+                bytes(self._laszip_vlr.record_data),
+                header_data,
+                compressed_nodes,
+                [
+                    lazchunktable.ChunkTableEntry(node.point_count, node.byte_size)
+                    for node in task
+                ],
+                True,
+                point_size,
+            )
+
+        # (task, future), in submission order
+        pending = collections.deque()
+        try:
+            while tasks or pending:
+                while tasks and len(pending) < max_in_flight:
+                    task = tasks.popleft()
+                    pending.append((task, submit(task)))
+
+                task, future = pending.popleft()
+                points_data = memoryview(future.result())
+                begin = 0
+                for node in task:
+                    end = begin + node.point_count * point_size
+                    yield points_data[begin:end]
+                    begin = end
+        finally:
+            for _, future in pending:
+                future.cancel()
+            if owns_executor:
+                executor.shutdown(wait=True)
@@ -15,9 +15,10 @@ from .compression import (
     uncompressed_id_to_compressed,
 )
 from .errors import PylasError
-from .point import dims
+from .point import dims, stats
 from .point.format import PointFormat, ExtraBytesParams
 from .point.record import PackedPointRecord
+from .streams import forward_only
 from .vlrs.known import ExtraBytesStruct, ExtraBytesVlr
 from .vlrs.vlrlist import VLRList
 
@@ -348,40 +349,23 @@ class LasHeader:
         self.number_of_evlrs = 0
 
     def update(self, points: PackedPointRecord) -> None:
-        self.x_max = max(
-            self.x_max,
-            (points["X"].max() * self.x_scale) + self.x_offset,
-        )
-        self.y_max = max(
-            self.y_max,
-            (points["Y"].max() * self.y_scale) + self.y_offset,
-        )
-        self.z_max = max(
-            self.z_max,
-            (points["Z"].max() * self.z_scale) + self.z_offset,
-        )
-        self.x_min = min(
-            self.x_min,
-            (points["X"].min() * self.x_scale) + self.x_offset,
-        )
-        self.y_min = min(
-            self.y_min,
-            (points["Y"].min() * self.y_scale) + self.y_offset,
-        )
-        self.z_min = min(
-            self.z_min,
-            (points["Z"].min() * self.z_scale) + self.z_offset,
-        )
-
-        for return_number, count in zip(
-            *np.unique(points.return_number, return_counts=True)
-        ):
-            if return_number == 0:
-                continue
-            if return_number > len(self.number_of_points_by_return):
-                break  # np.unique sorts unique values
-            self.number_of_points_by_return[return_number - 1] += count
-        self.point_count += len(points)
+        """Grows the bounds, the number of points by return and the point count
+        of the header to include the points
+        """
+        self.update_from_statistics(stats.compute_statistics(points))
+
+    def update_from_statistics(self, statistics: stats.PointStatistics) -> None:
+        """Same as :meth:`.update` with already computed statistics"""
+        if statistics.point_count == 0:
+            return
+        mins, maxs = statistics.scaled_bounds(self.scales, self.offsets)
+        self.mins = np.minimum(self.mins, mins)
+        self.maxs = np.maximum(self.maxs, maxs)
+        by_return = statistics.by_return(len(self.number_of_points_by_return))
+        self.number_of_points_by_return = (
+            self.number_of_points_by_return + by_return
+        ).astype(self.number_of_points_by_return.dtype)
+        self.point_count += statistics.point_count
 
     def set_compressed(self, state: bool) -> None:
         self.are_points_compressed = state
@@ -390,6 +374,10 @@ class LasHeader:
     def read_from(cls, stream: BinaryIO, seekable=True) -> "LasHeader":
         little_endian = "little"
         header = cls()
+        if not seekable:
+            # To know the position in the stream, the header
+            # is expected to start at the current position
+            stream = forward_only(stream)
 
         file_sig = stream.read(4)
         if file_sig != LAS_FILE_SIGNATURE:
@@ -462,10 +450,7 @@ class LasHeader:
                     stream.read(8), little_endian, signed=False
                 )
 
-        if seekable:
-            current_pos = stream.tell()
-        else:
-            current_pos = LAS_HEADERS_SIZE[str(header.version)]
+        current_pos = stream.tell()
         if current_pos < header_size:
             header.extra_header_bytes = stream.read(header_size - current_pos)
         elif current_pos > header_size:
@@ -473,14 +458,13 @@ class LasHeader:
 
         header.vlrs = VLRList.read_from(stream, num_to_read=number_of_vlrs)
 
-        if seekable:
-            current_pos = stream.tell()
-            if current_pos < header.offset_to_point_data:
-                header.extra_vlr_bytes = stream.read(
-                    header.offset_to_point_data - current_pos
-                )
-            elif current_pos > header.offset_to_point_data:
-                raise PylasError("Incoherent offset to point data")
+        current_pos = stream.tell()
+        if current_pos < header.offset_to_point_data:
+            header.extra_vlr_bytes = stream.read(
+                header.offset_to_point_data - current_pos
+            )
+        elif current_pos > header.offset_to_point_data:
+            raise PylasError("Incoherent offset to point data")
 
         header.are_points_compressed = is_point_format_compressed(point_format_id)
         point_format_id = compressed_id_to_uncompressed(point_format_id)
@@ -163,17 +163,18 @@ class LazrsAppender:
         self.dest.seek(header.offset_to_point_data, io.SEEK_SET)
         decompressor = lazrs.LasZipDecompressor(self.dest, laszip_vlr.record_data)
         vlr = decompressor.vlr()
+        self.vlr = vlr
         number_of_complete_chunk = int(
             math.floor(header.point_count / vlr.chunk_size())
         )
 
         self.dest.seek(header.offset_to_point_data, io.SEEK_SET)
-        chunk_table = lazrs.read_chunk_table(self.dest)
+        chunk_table = lazrs.read_chunk_table(self.dest, vlr)
         if chunk_table is None:
             # The file does not have a chunk table
             # we cannot seek to the last chunk, so instead, we will
             # decompress points (which is slower) and build the chunk table
-            # to write it later
+            # to write it later, entries are (point count, byte count)
 
             self.chunk_table = []
             start_of_chunk = self.dest.tell()
@@ -182,7 +183,7 @@ class LazrsAppender:
             for _ in range(number_of_complete_chunk):
                 decompressor.decompress_many(point_buf)
                 pos = self.dest.tell()
-                self.chunk_table.append(pos - start_of_chunk)
+                self.chunk_table.append((vlr.chunk_size(), pos - start_of_chunk))
                 start_of_chunk = pos
         else:
             self.chunk_table = chunk_table[:-1]
@@ -203,7 +204,9 @@ class LazrsAppender:
             self.compressor = lazrs.LasZipCompressor(
                 self.dest, vlr
             )  # This overwrites the old offset
-        self.dest.seek(sum(self.chunk_table), io.SEEK_CUR)
+        self.dest.seek(
+            sum(byte_count for _, byte_count in self.chunk_table), io.SEEK_CUR
+        )
         self.compressor.compress_many(points_of_last_chunk)
 
     def write_points(self, points: PackedPointRecord) -> None:
@@ -220,6 +223,6 @@ class LazrsAppender:
         self.dest.seek(self.offset_to_point_data, io.SEEK_SET)
         offset_to_chunk_table = int.from_bytes(self.dest.read(8), "little", signed=True)
         self.dest.seek(-8, io.SEEK_CUR)
-        chunk_table = self.chunk_table + lazrs.read_chunk_table(self.dest)
+        chunk_table = self.chunk_table + lazrs.read_chunk_table(self.dest, self.vlr)
         self.dest.seek(offset_to_chunk_table, io.SEEK_SET)
-        lazrs.write_chunk_table(self.dest, chunk_table)
+        lazrs.write_chunk_table(self.dest, chunk_table, self.vlr)
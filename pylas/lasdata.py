@@ -4,11 +4,11 @@ from typing import Union, Optional, List, Sequence, overload, BinaryIO
 
 import numpy as np
 
-from . import errors
+from . import arrow, errors
 from .compression import LazBackend
 from .header import LasHeader
 from .laswriter import LasWriter
-from .point import record, dims, ExtraBytesParams, PointFormat
+from .point import record, dims, sorting, stats, ExtraBytesParams, PointFormat
 from .point.dims import ScaledArrayView
 from .vlrs.vlrlist import VLRList
 
@@ -149,17 +149,14 @@ class LasData:
         self.header.point_count = len(self.points)
         self.header.point_data_record_length = self.points.point_size
 
-        if len(self.points) > 0:
-            self.header.x_max = self.x.max()
-            self.header.y_max = self.y.max()
-            self.header.z_max = self.z.max()
-
-            self.header.x_min = self.x.min()
-            self.header.y_min = self.y.min()
-            self.header.z_min = self.z.min()
-
-            unique, counts = np.unique(self.return_number, return_counts=True)
-            self.header.number_of_points_by_return = counts
+        statistics = stats.compute_statistics(self.points)
+        if statistics.point_count > 0:
+            self.header.mins, self.header.maxs = statistics.scaled_bounds(
+                self.header.scales, self.header.offsets
+            )
+            self.header.number_of_points_by_return = statistics.by_return(
+                len(self.header.number_of_points_by_return)
+            ).astype(self.header.number_of_points_by_return.dtype)
 
         if self.header.version.minor >= 4:
             if self.evlrs is not None:
@@ -238,6 +235,51 @@ class LasData:
             if self.header.version.minor >= 4 and self.evlrs is not None:
                 writer.write_evlrs(self.evlrs)
 
+    def to_arrow(
+        self, dimensions: Optional[Sequence[str]] = None, scaled: bool = True
+    ) -> "arrow.pa.RecordBatch":
+        """Returns the points as an Apache Arrow record batch,
+        one column per dimension (requires pyarrow).
+
+        See :func:`pylas.arrow.points_to_arrow` for the parameters
+        """
+        return arrow.points_to_arrow(
+            self.points, self.header.scales, self.header.offsets, dimensions, scaled
+        )
+
+    @classmethod
+    def from_arrow(cls, batch, header: LasHeader) -> "LasData":
+        """Creates a LasData from an Apache Arrow record batch (or table),
+        whose columns are dimensions of the header's point format.
+
+        See :func:`pylas.arrow.points_from_arrow`
+        """
+        points = arrow.points_from_arrow(batch, header)
+        las = cls(header=header, points=points)
+        las.update_header()
+        return las
+
+    def sort(self, order: sorting.Order = "hilbert", use_z: bool = False) -> None:
+        """Sorts the points, with one permutation of the points array.
+
+        Sorting points along a space filling curve makes LAZ files smaller
+        and spatial reads of the file faster.
+
+        >>> import pylas
+        >>> las = pylas.read("pylastests/simple.las")
+        >>> las.sort("gps_time")
+        >>> bool(np.all(np.diff(las.gps_time) >= 0))
+        True
+
+        Parameters
+        ----------
+        order: "hilbert" or "morton" to sort the points along a space filling curve
+            computed on the raw X, Y (and Z) integers, otherwise a dimension name
+            or a list of dimension names (e.g. ["point_source_id", "gps_time"])
+        use_z: whether the space filling curve is 3D instead of 2D
+        """
+        self.points = sorting.sort_points(self.points, order, use_z)
+
     def change_scaling(self, scales=None, offsets=None) -> None:
         if scales is None:
             scales = self.header.scales
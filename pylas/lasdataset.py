@@ -0,0 +1,318 @@
+""" LasDataset, to read many LAS/LAZ files as if they were one
+"""
+import collections
+import contextlib
+import logging
+import math
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .catalog import Catalog, CatalogEntry
+from .compression import LazBackend
+from .lasreader import LasReader
+from .lib import open_las
+from .point import record
+from .zonemap import Where
+
+logger = logging.getLogger(__name__)
+
+#: Default maximum number of readers kept open by a dataset
+DEFAULT_MAX_OPEN_READERS = 16
+
+Rectangle = Tuple[float, float, float, float]
+
+
+class DatasetFile(NamedTuple):
+    """What a dataset knows about one of its files, taken from its header"""
+
+    path: Path
+    point_count: int
+    point_format_id: int
+    #: min x, y, z
+    mins: Tuple[float, float, float]
+    #: max x, y, z
+    maxs: Tuple[float, float, float]
+
+    @classmethod
+    def from_catalog_entry(cls, entry: CatalogEntry) -> "DatasetFile":
+        return cls(
+            Path(entry.path),
+            entry.point_count,
+            entry.point_format_id,
+            entry.mins,
+            entry.maxs,
+        )
+
+    def intersects(self, rectangle: Rectangle) -> bool:
+        min_x, min_y, max_x, max_y = rectangle
+        return (
+            self.mins[0] <= max_x
+            and min_x <= self.maxs[0]
+            and self.mins[1] <= max_y
+            and min_y <= self.maxs[1]
+        )
+
+
+class GridIndex:
+    """Regular grid over the x, y extents of files,
+    each cell lists the files whose extent overlaps the cell.
+    """
+
+    def __init__(self, files: Sequence[DatasetFile]) -> None:
+        self.files = files
+        self.cells: Dict[Tuple[int, int], List[int]] = collections.defaultdict(list)
+        if not files:
+            self.origin = np.zeros(2)
+            self.cell_size = np.ones(2)
+            return
+
+        mins = np.array([f.mins[:2] for f in files], np.float64)
+        maxs = np.array([f.maxs[:2] for f in files], np.float64)
+        self.origin = mins.min(axis=0)
+        extent = maxs.max(axis=0) - self.origin
+        # Around one file per cell for tiles on a regular layout
+        cells_per_axis = max(1, math.ceil(math.sqrt(len(files))))
+        self.cell_size = np.where(extent > 0, extent / cells_per_axis, 1.0)
+
+        first_cells = self._cell_coordinates(mins)
+        last_cells = self._cell_coordinates(maxs)
+        for i, (first, last) in enumerate(zip(first_cells, last_cells)):
+            for cell_x in range(first[0], last[0] + 1):
+                for cell_y in range(first[1], last[1] + 1):
+                    self.cells[(cell_x, cell_y)].append(i)
+
+    def _cell_coordinates(self, positions: np.ndarray) -> np.ndarray:
+        return np.floor((positions - self.origin) / self.cell_size).astype(np.int64)
+
+    def query(self, rectangle: Rectangle) -> List[int]:
+        """Returns the sorted indices of the files whose extent
+        intersects the (min_x, min_y, max_x, max_y) rectangle
+        """
+        min_x, min_y, max_x, max_y = rectangle
+        if not self.cells:
+            return []
+        first, last = self._cell_coordinates(np.array([[min_x, min_y], [max_x, max_y]]))
+        occupied = np.array(list(self.cells.keys()))
+        # Clamp to the cells that exist to avoid iterating over huge empty ranges
+        first = np.maximum(first, occupied.min(axis=0))
+        last = np.minimum(last, occupied.max(axis=0))
+
+        candidates = set()
+        for cell_x in range(first[0], last[0] + 1):
+            for cell_y in range(first[1], last[1] + 1):
+                candidates.update(self.cells.get((cell_x, cell_y), ()))
+        return sorted(i for i in candidates if self.files[i].intersects(rectangle))
+
+
+class ReaderPool:
+    """Bounded pool of open :class:`.LasReader`, the least recently used
+    readers that are not in use are closed when there are too many readers open.
+    """
+
+    def __init__(
+        self,
+        max_open_readers: int = DEFAULT_MAX_OPEN_READERS,
+        laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+    ) -> None:
+        if max_open_readers < 1:
+            raise ValueError("max_open_readers must be at least 1")
+        self.max_open_readers = max_open_readers
+        self.laz_backend = laz_backend
+        self._readers: "collections.OrderedDict[Path, LasReader]" = (
+            collections.OrderedDict()
+        )
+        self._uses: Dict[Path, int] = collections.Counter()
+
+    def __len__(self) -> int:
+        return len(self._readers)
+
+    @contextlib.contextmanager
+    def acquire(self, path: Path) -> Iterator[LasReader]:
+        """Returns an open reader for the file, the reader is positioned
+        at the first point.
+        """
+        try:
+            reader = self._readers[path]
+        except KeyError:
+            reader = open_las(path, laz_backend=self.laz_backend)
+            self._readers[path] = reader
+        else:
+            self._readers.move_to_end(path)
+            reader.seek(0)
+
+        self._uses[path] += 1
+        try:
+            self._evict()
+            yield reader
+        finally:
+            self._uses[path] -= 1
+            self._evict()
+
+    def _evict(self) -> None:
+        for path in list(self._readers.keys()):
+            if len(self._readers) <= self.max_open_readers:
+                break
+            if self._uses[path] == 0:
+                self._readers.pop(path).close()
+                del self._uses[path]
+
+    def close(self) -> None:
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+        self._uses.clear()
+
+
+class LasDataset:
+    """A collection of LAS/LAZ files read as one sequence of points.
+
+    Only the headers of the files are read when the dataset is created,
+    files are opened when their points are needed, and at most
+    `max_open_readers` files are kept open.
+
+    >>> dataset = LasDataset(["pylastests/simple.las", "pylastests/test1_4.las"])
+    >>> dataset.point_count
+    2065
+    >>> len(dataset.files_intersecting((637000.0, 849000.0, 637100.0, 849100.0)))
+    1
+    >>> dataset.close()
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Union[str, Path]],
+        laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+        max_open_readers: int = DEFAULT_MAX_OPEN_READERS,
+        cache_path: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        paths: paths of the LAS/LAZ files of the dataset
+        laz_backend: the LAZ backend used to open the files
+        max_open_readers: maximum number of files kept open
+        cache_path: optional, path of the catalog cache file,
+            see :meth:`.Catalog.scan`
+        max_workers: number of threads used to read the headers
+        """
+        catalog = Catalog.scan(paths, max_workers=max_workers, cache_path=cache_path)
+        self.files: List[DatasetFile] = [
+            DatasetFile.from_catalog_entry(entry) for entry in catalog
+        ]
+        self.grid = GridIndex(self.files)
+        self.readers = ReaderPool(max_open_readers, laz_backend)
+
+    @classmethod
+    def from_directory(
+        cls,
+        directory: Union[str, Path],
+        recursive: bool = False,
+        **kwargs,
+    ) -> "LasDataset":
+        """Creates a dataset of all the .las & .laz files of a directory,
+        sorted by path
+        """
+        directory = Path(directory)
+        candidates = directory.rglob("*") if recursive else directory.glob("*")
+        paths = sorted(
+            p
+            for p in candidates
+            if p.suffix.lower() in (".las", ".laz") and p.is_file()
+        )
+        return cls(paths, **kwargs)
+
+    @property
+    def point_count(self) -> int:
+        return sum(f.point_count for f in self.files)
+
+    @property
+    def mins(self) -> np.ndarray:
+        return np.array([f.mins for f in self.files]).min(axis=0)
+
+    @property
+    def maxs(self) -> np.ndarray:
+        return np.array([f.maxs for f in self.files]).max(axis=0)
+
+    def files_intersecting(self, rectangle: Rectangle) -> List[DatasetFile]:
+        """Returns the files whose extent intersect the
+        (min_x, min_y, max_x, max_y) rectangle
+        """
+        return [self.files[i] for i in self.grid.query(rectangle)]
+
+    def chunk_iterator(
+        self,
+        points_per_iteration: int,
+        dimensions: Optional[Sequence[str]] = None,
+        where: Optional[Where] = None,
+        files: Optional[Sequence[DatasetFile]] = None,
+    ) -> Iterator[record.ScaleAwarePointRecord]:
+        """Reads the points of all the files, file after file, by chunks.
+
+        Chunks do not span multiple files, each chunk has
+        the point format, scales and offsets of its file.
+
+        Parameters
+        ----------
+        points_per_iteration: maximum number of points per chunk
+        dimensions: optional, names of the dimensions to read,
+            see :meth:`.LasReader.read_points`
+        where: optional, filter on the points,
+            see :meth:`.LasReader.chunk_iterator`
+        files: optional, the files to read, by default all the files
+        """
+        if files is None:
+            files = self.files
+        for file in files:
+            with self.readers.acquire(file.path) as reader:
+                yield from reader.chunk_iterator(
+                    points_per_iteration, dimensions, where=where
+                )
+
+    def query(
+        self,
+        rectangle: Rectangle,
+        points_per_iteration: int = 1_000_000,
+        dimensions: Optional[Sequence[str]] = None,
+    ) -> Iterator[record.ScaleAwarePointRecord]:
+        """Reads the points that are in the (min_x, min_y, max_x, max_y)
+        rectangle (bounds included), only the files intersecting the
+        rectangle are opened.
+
+        The spatial index (.lax) of the files is used when it exists.
+        """
+        min_x, min_y, max_x, max_y = rectangle
+        return self.chunk_iterator(
+            points_per_iteration,
+            dimensions,
+            where={"x": (min_x, max_x), "y": (min_y, max_y)},
+            files=self.files_intersecting(rectangle),
+        )
+
+    def close(self) -> None:
+        """Closes all the files that are open"""
+        self.readers.close()
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __enter__(self) -> "LasDataset":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<LasDataset({len(self.files)} files, {self.point_count} points)>"
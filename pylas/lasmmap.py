@@ -1,20 +1,42 @@
 import io
+import logging
 import mmap
+from typing import Optional
 
 from . import lasdata
 from .header import LasHeader
 from .point import record
 from .typehints import PathLike
 
+logger = logging.getLogger(__name__)
+
 WHOLE_FILE = 0
 
+#: The modes a file can be mapped with:
+#: the mode used to open the file and the mmap access
+MMAP_MODES = {
+    "r": ("rb", mmap.ACCESS_READ),
+    "c": ("rb", mmap.ACCESS_COPY),
+    "r+": ("r+b", mmap.ACCESS_WRITE),
+}
+
+#: Names of the madvise hints that can be given for the points,
+#: (the constants only exist on platforms that support them)
+MADVISE_HINTS = {
+    "normal": "MADV_NORMAL",
+    "sequential": "MADV_SEQUENTIAL",
+    "random": "MADV_RANDOM",
+    "willneed": "MADV_WILLNEED",
+    "dontneed": "MADV_DONTNEED",
+}
+
 
 class LasMMAP(lasdata.LasData):
     """Memory map a LAS file.
     It works like a regular LasData however the data is not actually read in memory,
 
-    Access to dimensions are made directly from the file itself, changes made to the points
-    are directly reflected in the mmap file.
+    Access to dimensions are made directly from the file itself, depending on the mode,
+    changes made to the points are directly reflected in the mmap file.
 
     Vlrs cannot be modified.
 
@@ -24,12 +46,39 @@ class LasMMAP(lasdata.LasData):
         A LAZ (compressed LAS) cannot be mmapped
     """
 
-    def __init__(self, filename: PathLike) -> None:
-        fileref = open(filename, mode="r+b")
+    def __init__(
+        self, filename: PathLike, mode: str = "r+", advice: Optional[str] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        filename: path of the file to map
+        mode: optional, how the file is mapped:
+            - "r+" (default): the points can be modified, changes are written to the file
+            - "r": the points are read-only, the file can be on a read-only filesystem
+            - "c": copy-on-write, the points can be modified but changes are
+              only made in memory, not in the file
+            With "r" and "c", processes mapping the same file share its pages in memory.
+        advice: optional, hint about how the points will be accessed,
+            see :meth:`.advise`
+        """
+        try:
+            file_mode, access = MMAP_MODES[mode]
+        except KeyError:
+            raise ValueError(
+                f"Invalid mode '{mode}', expected one of {list(MMAP_MODES)}"
+            ) from None
+        fileref = open(filename, mode=file_mode)
 
-        m = mmap.mmap(fileref.fileno(), length=WHOLE_FILE, access=mmap.ACCESS_WRITE)
+        try:
+            m = mmap.mmap(fileref.fileno(), length=WHOLE_FILE, access=access)
+        except Exception:
+            fileref.close()
+            raise
         header = LasHeader.read_from(m)
         if header.are_points_compressed:
+            m.close()
+            fileref.close()
             raise ValueError("Cannot mmap a compressed LAZ file")
 
         points_data = record.PackedPointRecord.from_buffer(
@@ -41,7 +90,45 @@ class LasMMAP(lasdata.LasData):
         super().__init__(header=header, points=points_data)
 
         self.fileref, self.mmap = fileref, m
+        self.mode = mode
         self.mmap.seek(0, io.SEEK_SET)
+        if advice is not None:
+            self.advise(advice)
+
+    def advise(self, advice: str) -> bool:
+        """Tells the OS how the points will be accessed (madvise),
+        to tune the read ahead and caching of the pages of the point records.
+
+        Parameters
+        ----------
+        advice: one of "normal", "sequential", "random", "willneed", "dontneed"
+
+        Returns
+        -------
+        False if the hint is not supported on this platform / python version,
+        in which case it is ignored
+        """
+        try:
+            option_name = MADVISE_HINTS[advice]
+        except KeyError:
+            raise ValueError(
+                f"Invalid advice '{advice}', expected one of {list(MADVISE_HINTS)}"
+            ) from None
+        option = getattr(mmap, option_name, None)
+        if option is None or not hasattr(self.mmap, "madvise"):
+            logger.debug(f"madvise {option_name} is not supported, ignoring it")
+            return False
+
+        # madvise needs the start to be aligned on pages
+        start = self.header.offset_to_point_data
+        start -= start % mmap.PAGESIZE
+        end = self.header.offset_to_point_data + (
+            self.header.point_count * self.header.point_format.size
+        )
+        length = min(end, len(self.mmap)) - start
+        if length > 0:
+            self.mmap.madvise(option, start, length)
+        return True
 
     def close(self) -> None:
         # These need to be set to None, so that
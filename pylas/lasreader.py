@@ -1,14 +1,32 @@
 import abc
+import collections
+import concurrent.futures
 import io
 import logging
-from typing import Optional, BinaryIO, Iterable, Union
+import queue
+import struct
+import threading
+import weakref
+from typing import (
+    Optional,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    Union,
+    List,
+    Tuple,
+    Sequence,
+)
 
-from . import errors
+import numpy as np
+
+from . import arrow, errors, lax, lazchunktable, lazparallel, streams, zonemap
+from .chunkcache import ChunkCache
 from .compression import LazBackend
 from .header import LasHeader
 from .lasdata import LasData
 from .point import record
-from .vlrs.known import LasZipVlr
+from .vlrs.known import LasZipVlr, VARIABLE_CHUNK_SIZE
 from .vlrs.vlrlist import VLRList
 
 try:
@@ -23,6 +41,20 @@ except ModuleNotFoundError:
 
 logger = logging.getLogger(__name__)
 
+PointBuffer = Union[record.PackedPointRecord, np.ndarray]
+
+#: When reading points at random positions of an uncompressed file,
+#: points separated by less than this number of bytes are read in one go
+#: instead of seeking past the gap between them.
+MAX_GAP_BYTES = 64 * 1024
+
+#: Number of points read at once by :meth:`.LasReader.query_rectangle`
+QUERY_POINTS_PER_ITERATION = 1_000_000
+
+#: Size in bytes of the full points read at once when reading only
+#: some dimensions, they are projected before reading the next ones
+PROJECTION_BUFFER_SIZE = 16 * 1024 * 1024
+
 
 class LasReader:
     """The reader class handles LAS and LAZ via one of the supported backend"""
@@ -37,7 +69,20 @@ class LasReader:
         if laz_backend is None:
             laz_backend = LazBackend.detect_available()
         self.laz_backend = laz_backend
-        self.header = LasHeader.read_from(source)
+        if not source.seekable():
+            # Pipes, stdin...: the file is read forward only
+            source = streams.ForwardOnlyStream(source)
+        self.header = LasHeader.read_from(source, seekable=source.seekable())
+        self._laszip_vlr: Optional[LasZipVlr] = None
+        self._laz_backend_in_use: Optional[LazBackend] = None
+        self._chunk_table: Optional[List[lazchunktable.ChunkTableEntry]] = None
+        #: The LAX spatial index of the file, if any. When set, it is used
+        #: to only read the parts of the file that may contain points
+        #: matching the x, y ranges of a `where` filter
+        self.spatial_index: Optional[lax.LaxIndex] = None
+        # Stops the thread of the last prefetching iterator
+        self._stop_prefetching: Optional[weakref.finalize] = None
+        self._chunk_cache: Optional[ChunkCache] = None
 
         if self.header.are_points_compressed:
             if not laz_backend:
@@ -51,12 +96,92 @@ class LasReader:
                 )
         else:
             self.point_source = UncompressedPointReader(
-                source, self.header.point_format.size
+                source, self.header.point_format.size, self.header.offset_to_point_data
             )
 
         self.points_read = 0
 
-    def read_points(self, n: int) -> Optional[record.ScaleAwarePointRecord]:
+    @property
+    def chunk_cache(self) -> Optional[ChunkCache]:
+        """The cache of decompressed chunks of the LAZ file, None by default.
+
+        When set, the points of the LAZ file are decompressed chunk by chunk,
+        and decompressed chunks are kept in the cache so that reading
+        points of a chunk again (after seeking, with :meth:`.read_points_at`,
+        :meth:`.query_rectangle`...) only copies them from the cache.
+
+        >>> import pylas
+        >>> with pylas.open("pylastests/simple.laz") as reader:  # doctest: +SKIP
+        ...     reader.chunk_cache = pylas.ChunkCache(max_bytes=64 * 1024 * 1024)
+
+        Raises
+        ------
+        LazError when set on a file that is not compressed
+        """
+        return self._chunk_cache
+
+    @chunk_cache.setter
+    def chunk_cache(self, cache: Optional[ChunkCache]) -> None:
+        if cache is not None and not self.header.are_points_compressed:
+            raise errors.LazError("Only the chunks of LAZ files can be cached")
+
+        if isinstance(self.point_source, CachingPointReader):
+            self.point_source = self.point_source.uncached(self.points_read)
+        if cache is not None:
+            self.point_source = CachingPointReader(
+                self.point_source,
+                self._first_point_of_chunks(),
+                cache,
+                self.points_read,
+            )
+        self._chunk_cache = cache
+
+    def _first_point_of_chunks(self) -> np.ndarray:
+        """Index of the first point of each chunk, plus the point count"""
+        chunk_size = self._laszip_vlr.chunk_size
+        if chunk_size == VARIABLE_CHUNK_SIZE:
+            return lazchunktable.first_point_of_chunks(self.read_chunk_table())
+        return np.append(
+            np.arange(0, self.header.point_count, chunk_size, dtype=np.int64),
+            np.int64(self.header.point_count),
+        )
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        """Seeks to the point at position `pos`, the next call
+        to :meth:`.read_points` will return points starting from this position.
+
+        Parameters
+        ----------
+        pos: index of the point to seek to (relative to whence)
+        whence: one of io.SEEK_SET, io.SEEK_CUR, io.SEEK_END
+
+        Returns
+        -------
+        The new position (index of the next point to be read)
+        """
+        if whence == io.SEEK_SET:
+            new_pos = pos
+        elif whence == io.SEEK_CUR:
+            new_pos = self.points_read + pos
+        elif whence == io.SEEK_END:
+            new_pos = self.header.point_count + pos
+        else:
+            raise ValueError(f"Invalid value for whence: {whence}")
+
+        if not 0 <= new_pos <= self.header.point_count:
+            raise IndexError(
+                f"Cannot seek to point {new_pos}, "
+                f"the file has {self.header.point_count} points"
+            )
+
+        if new_pos < self.header.point_count:
+            self.point_source.seek(new_pos)
+        self.points_read = new_pos
+        return self.points_read
+
+    def read_points(
+        self, n: int, dimensions: Optional[Sequence[str]] = None
+    ) -> Optional[record.ScaleAwarePointRecord]:
         """Read n points from the file
 
         If there are no points left to read, returns None.
@@ -65,6 +190,13 @@ class LasReader:
         ----------
         n: The number of points to read
            if n is less than 0, this function will read the remaining points
+        dimensions: optional, names of the dimensions to read
+           If given, the returned record will only hold the fields needed
+           to access these dimensions, which takes less memory than full points.
+           Points are read by blocks of PROJECTION_BUFFER_SIZE bytes
+           that are projected one at a time, so full points of the n points
+           are never in memory at once.
+           Such a record cannot be written with a :class:`.LasWriter`.
         """
         points_left = self.header.point_count - self.points_read
         if points_left <= 0:
@@ -75,18 +207,171 @@ class LasReader:
         else:
             n = min(n, points_left)
 
-        r = record.PackedPointRecord.from_buffer(
-            self.point_source.read_n_points(n), self.header.point_format, n
-        )
+        point_format = self.header.point_format
+        if dimensions is None:
+            array = record.PackedPointRecord.from_buffer(
+                self.point_source.read_n_points(n), point_format, n
+            ).array
+        else:
+            array = self._read_projected_points(
+                n, record.fields_of_dimensions(point_format, dimensions)
+            )
         points = record.ScaleAwarePointRecord(
-            r.array, r.point_format, self.header.scales, self.header.offsets
+            array, point_format, self.header.scales, self.header.offsets
         )
         self.points_read += n
         return points
 
-    def read(self) -> LasData:
-        """Reads all the points not read and returns a LasData object"""
-        points = self.read_points(-1)
+    def _read_projected_points(self, n: int, fields: List[str]) -> np.ndarray:
+        """Reads n points, block by block, only keeping the fields"""
+        dtype = self.header.point_format.dtype()
+        array = np.empty(n, record.projected_dtype(dtype, fields))
+        block_size = max(1, min(n, PROJECTION_BUFFER_SIZE // dtype.itemsize))
+        block = np.empty(block_size, dtype)
+        for start in range(0, n, block_size):
+            count = min(block_size, n - start)
+            self.point_source.readinto(block[:count].view(np.uint8))
+            for name in fields:
+                array[name][start : start + count] = block[name][:count]
+        return array
+
+    def read_points_into(
+        self, points: Union[record.PackedPointRecord, np.ndarray]
+    ) -> int:
+        """Reads points directly into the memory of an existing point record
+        or numpy structured array, so that no new memory is allocated.
+
+        At most len(points) points are read, they are stored
+        at the beginning of the array.
+
+        Parameters
+        ----------
+        points: the record or array to read the points into, its dtype
+            must be the dtype of the file's point format
+
+        Returns
+        -------
+        The number of points read, 0 if there are no more points to read
+        """
+        if isinstance(points, record.PackedPointRecord):
+            array = points.array
+        else:
+            array = points
+
+        if array.dtype != self.header.point_format.dtype():
+            raise errors.IncompatibleDataFormat(
+                "The array dtype does not match the file's point format"
+            )
+        if not array.flags.c_contiguous or not array.flags.writeable:
+            raise ValueError("The array must be contiguous and writeable")
+
+        n = min(len(array), self.header.point_count - self.points_read)
+        if n <= 0:
+            return 0
+
+        self.point_source.readinto(array[:n].view(np.uint8))
+        self.points_read += n
+        return n
+
+    def read_points_at(
+        self, indices, dimensions: Optional[Sequence[str]] = None
+    ) -> record.ScaleAwarePointRecord:
+        """Read the points at the given indices (in the order of the indices).
+
+        Contrary to :meth:`.read_points`, this does not need to read
+        all the points preceding the last index:
+
+        - for LAS files, indices close to each other are coalesced into
+          ranges of points that are read in one go, and the gaps between
+          ranges are seeked over.
+        - for LAZ files, indices are grouped by chunk of compressed points
+          and only the chunks that contain requested points are decompressed.
+
+        The position of the reader (as used by :meth:`.read_points`)
+        is not modified.
+
+        Parameters
+        ----------
+        indices: array like of int
+            indices of the points to read, they do not have to be sorted
+            nor unique
+        dimensions: optional, names of the dimensions to read,
+            see :meth:`.read_points`
+
+        Returns
+        -------
+        The points at the requested indices
+        """
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        points_dtype = self.header.point_format.dtype()
+        if dimensions is None:
+            fields, gathered_dtype = None, points_dtype
+        else:
+            fields = record.fields_of_dimensions(self.header.point_format, dimensions)
+            gathered_dtype = record.project_points(
+                np.zeros(0, points_dtype), fields
+            ).dtype
+
+        if len(indices) == 0:
+            return record.ScaleAwarePointRecord(
+                np.zeros(0, gathered_dtype),
+                self.header.point_format,
+                self.header.scales,
+                self.header.offsets,
+            )
+
+        if indices.min() < 0 or indices.max() >= self.header.point_count:
+            raise IndexError(
+                f"Point indices must be in [0, {self.header.point_count}), "
+                f"got [{indices.min()}, {indices.max()}]"
+            )
+
+        unique_indices, inverse = np.unique(indices, return_inverse=True)
+        gathered = np.zeros(len(unique_indices), gathered_dtype)
+        gathered_pos = 0
+        for start, stop in self._coalesce_indices(unique_indices):
+            self.point_source.seek(start)
+            points_data = self.point_source.read_n_points(stop - start)
+            range_points = np.frombuffer(points_data, points_dtype)
+            if fields is not None:
+                range_points = range_points[fields]
+            num_wanted = np.searchsorted(unique_indices, stop) - gathered_pos
+            wanted = unique_indices[gathered_pos : gathered_pos + num_wanted] - start
+            gathered[gathered_pos : gathered_pos + num_wanted] = range_points[wanted]
+            gathered_pos += num_wanted
+
+        if self.points_read < self.header.point_count:
+            self.point_source.seek(self.points_read)
+
+        return record.ScaleAwarePointRecord(
+            gathered[inverse],
+            self.header.point_format,
+            self.header.scales,
+            self.header.offsets,
+        )
+
+    def read(
+        self,
+        num_workers: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> LasData:
+        """Reads all the points not read and returns a LasData object
+
+        Parameters
+        ----------
+        num_workers: optional, number of workers used to decompress points
+            When this or `executor` is given and the file is a LAZ file with
+            a chunk table, its chunks are decompressed in parallel,
+            see :meth:`.parallel_chunk_iterator`.
+            Otherwise points are read sequentially.
+        executor: optional, executor to which the decompression is submitted
+        """
+        points = None
+        if num_workers is not None or executor is not None:
+            points = self._read_points_parallel(num_workers, executor)
+        if points is None:
+            points = self.read_points(-1)
+
         if points is None:
             points = record.PackedPointRecord.empty(self.header.point_format)
         else:
@@ -94,34 +379,310 @@ class LasReader:
 
         las_data = LasData(header=self.header, points=points)
         if self.header.version.minor >= 4:
-            if (
-                self.header.are_points_compressed
-                and not self.point_source.source.seekable()
-            ):
-                # We explicitly require seekable stream because we have to seek
-                # past the chunk table of LAZ file
-                raise errors.PylasError(
-                    "source must be seekable, to read evlrs form LAZ file"
-                )
-            self.point_source.source.seek(self.header.start_of_first_evlr, io.SEEK_SET)
-            las_data.evlrs = self._read_evlrs(self.point_source.source, seekable=True)
+            source = self.point_source.source
+            if source.seekable():
+                source.seek(self.header.start_of_first_evlr, io.SEEK_SET)
+            elif self.header.number_of_evlrs > 0:
+                # Skips the LAZ chunk table, or goes back a little
+                # if the LAZ decompressor read ahead
+                source.skip_to(self.header.start_of_first_evlr)
+            las_data.evlrs = self._read_evlrs(source, seekable=False)
 
         return las_data
 
-    def chunk_iterator(self, points_per_iteration: int) -> "PointChunkIterator":
+    def query_rectangle(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float,
+        dimensions: Optional[Sequence[str]] = None,
+    ) -> record.ScaleAwarePointRecord:
+        """Returns the points of the file that are in the rectangle (bounds included)
+
+        If the reader has a :attr:`.spatial_index`, only the intervals of points
+        of the index cells intersecting the rectangle are read, otherwise
+        all the points are read and filtered.
+
+        The position of the reader is not changed.
+
+        Parameters
+        ----------
+        min_x, min_y, max_x, max_y: bounds of the rectangle, in scaled coordinates
+        dimensions: optional, names of the dimensions to read,
+            see :meth:`.read_points`
+        """
+        where = {"x": (min_x, max_x), "y": (min_y, max_y)}
+        point_format = self.header.point_format
+        position = self.points_read
+        self.seek(0)
+        try:
+            arrays = [
+                points.array
+                for points in self.chunk_iterator(
+                    QUERY_POINTS_PER_ITERATION, dimensions, where=where
+                )
+            ]
+        finally:
+            self.seek(position)
+
+        if not arrays:
+            empty = np.zeros(0, point_format.dtype())
+            if dimensions is not None:
+                empty = record.project_points(
+                    empty, record.fields_of_dimensions(point_format, dimensions)
+                )
+            arrays.append(empty)
+
+        return record.ScaleAwarePointRecord(
+            np.concatenate(arrays),
+            point_format,
+            self.header.scales,
+            self.header.offsets,
+        )
+
+    def parallel_chunk_iterator(
+        self,
+        num_workers: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+        ordered: bool = True,
+    ) -> Iterator[Tuple[int, record.PackedPointRecord]]:
+        """Decompresses the chunks of a LAZ file using multiple workers,
+        and yields a tuple of (chunk index, points of the chunk) for each chunk.
+
+        The chunk table of the file is read once, and each worker decompresses
+        its range of chunks with its own decompressor, so this scales
+        with the number of workers regardless of the LAZ backend.
+
+        This does not change the position of the reader.
+
+        Parameters
+        ----------
+        num_workers: optional, number of workers, defaults to os.cpu_count()
+        executor: optional, executor to which the decompression is submitted
+            By default a ThreadPoolExecutor of num_workers threads is used.
+            A ProcessPoolExecutor can be given for backends that do not
+            release the GIL.
+        ordered: if True (default) chunks are yielded in order, otherwise
+            they are yielded as soon as they are decompressed.
+
+        Raises
+        ------
+        LazError if the file is not compressed, is not seekable
+        or does not have a chunk table
+        """
+        entries = self.read_chunk_table()
+        iterator = lazparallel.iter_decompressed_chunks(
+            self.point_source.source,
+            self.header,
+            self._laszip_vlr,
+            entries,
+            self._laz_backend_in_use,
+            num_workers=num_workers,
+            executor=executor,
+            ordered=ordered,
+        )
+        point_format = self.header.point_format
+        for chunk_index, _, points_data in iterator:
+            yield chunk_index, record.PackedPointRecord.from_buffer(
+                points_data, point_format, len(points_data) // point_format.size
+            )
+
+    def chunk_iterator(
+        self,
+        points_per_iteration: int,
+        dimensions: Optional[Sequence[str]] = None,
+        prefetch: int = 0,
+        buffers: Optional[Union[int, Sequence[PointBuffer]]] = None,
+        where: Optional[zonemap.Where] = None,
+        zone_map: Optional[zonemap.ZoneMap] = None,
+    ) -> "PointChunkIterator":
         """Returns an iterator, that will read points by chunks
         of the requested size
 
         :param points_per_iteration: number of points to be read with each iteration
+        :param dimensions: optional, names of the dimensions to read,
+                           see :meth:`.read_points`
+        :param prefetch: number of chunks to read in advance in a background thread,
+                         while the current chunk is being processed.
+                         0 (the default) means no prefetching.
+                         The reader must not be used by anything else while
+                         a prefetching iterator is active.
+        :param buffers: optional, either the number of point arrays to allocate once
+                        or a sequence of preallocated point records / arrays.
+                        Points are read directly into these buffers, used in turn,
+                        instead of allocating new memory for each chunk.
+                        A yielded chunk is only valid until its buffer is reused.
+                        (When prefetching, at least prefetch + 2 buffers are needed).
+        :param where: optional, filter on the points, only the points matching
+                      all the conditions are returned, chunks with no matching
+                      points are not yielded (so chunks may have less than
+                      points_per_iteration points).
+                      Maps dimension names to either a (min, max) tuple, (inclusive,
+                      None meaning unbounded), or a collection of accepted values.
+                      'x', 'y', 'z' filter on scaled coordinates.
+                      e.g. ``{"x": (xmin, xmax), "y": (ymin, ymax), "classification": [2, 6]}``
+        :param zone_map: optional, the :class:`.ZoneMap` of the file, used to skip
+                         the zones (LAZ chunks, LAS ranges) that cannot contain
+                         points matching `where`.
+                         If not given, the :attr:`.spatial_index` is used, if any.
         :return:
         """
-        return PointChunkIterator(self, points_per_iteration)
+        if where is not None and zone_map is None:
+            index = self.spatial_index
+        else:
+            index = zone_map
+        if prefetch > 0:
+            self._close_prefetching_iterator()
+            iterator = PrefetchingPointChunkIterator(
+                self,
+                points_per_iteration,
+                dimensions,
+                buffers,
+                prefetch,
+                where=where,
+                index=index,
+            )
+            self._stop_prefetching = iterator._stop
+            return iterator
+        return PointChunkIterator(
+            self,
+            points_per_iteration,
+            dimensions,
+            buffers,
+            where=where,
+            index=index,
+        )
+
+    def iter_arrow_batches(
+        self,
+        points_per_batch: int,
+        dimensions: Optional[Sequence[str]] = None,
+        scaled: bool = True,
+        **kwargs,
+    ) -> Iterator["arrow.pa.RecordBatch"]:
+        """Reads the points by chunks and yields them as Apache Arrow
+        record batches (requires pyarrow).
+
+        Only the fields needed by the dimensions requested are read.
+
+        :param points_per_batch: number of points of each batch
+        :param dimensions: optional, names of the columns,
+                           see :func:`pylas.arrow.points_to_arrow`
+        :param scaled: see :func:`pylas.arrow.points_to_arrow`
+        :param kwargs: passed to :meth:`.chunk_iterator`
+                       (prefetch, where, zone_map)
+        """
+        if dimensions is None:
+            dimensions = arrow.default_column_names(self.header.point_format, scaled)
+        for points in self.chunk_iterator(points_per_batch, dimensions, **kwargs):
+            yield arrow.points_to_arrow(
+                points, self.header.scales, self.header.offsets, dimensions, scaled
+            )
 
     def close(self) -> None:
         """closes the file object used by the reader"""
+        self._close_prefetching_iterator()
         if self.closefd:
             self.point_source.close()
 
+    def _close_prefetching_iterator(self) -> None:
+        # Works even if the iterator was dropped, its thread
+        # may still be reading the point source
+        if self._stop_prefetching is not None:
+            self._stop_prefetching()
+            self._stop_prefetching = None
+
+    def read_chunk_table(self) -> List[lazchunktable.ChunkTableEntry]:
+        """Returns the chunk table of the LAZ file, it is only read once
+
+        Raises
+        ------
+        LazError if the file is not compressed, is not seekable
+        or does not have a chunk table
+        """
+        if not self.header.are_points_compressed:
+            raise errors.LazError("The file is not compressed, it has no chunk table")
+        if self._chunk_table is None:
+            source = self.point_source.source
+            if not source.seekable():
+                raise errors.LazError("The source must be seekable to read chunk table")
+            entries = lazchunktable.read_chunk_table(
+                source,
+                self.header.offset_to_point_data,
+                self._laszip_vlr.chunk_size,
+                self.header.point_count,
+            )
+            if sum(e.point_count for e in entries) != self.header.point_count:
+                raise errors.LazError(
+                    "The chunk table does not match the point count of the header"
+                )
+            self._chunk_table = entries
+        return self._chunk_table
+
+    def _read_points_parallel(
+        self,
+        num_workers: Optional[int],
+        executor: Optional[concurrent.futures.Executor],
+    ) -> Optional[record.PackedPointRecord]:
+        """Reads all the points by decompressing chunks in parallel,
+        returns None if it is not possible for this file
+        """
+        if (
+            not self.header.are_points_compressed
+            or self.points_read != 0
+            or self.header.point_count == 0
+        ):
+            return None
+
+        try:
+            entries = self.read_chunk_table()
+        except (errors.LazError, struct.error) as e:
+            logger.info(f"Cannot decompress in parallel, reading sequentially: {e}")
+            return None
+
+        point_format = self.header.point_format
+        array = np.empty(self.header.point_count, point_format.dtype())
+        raw_array = array.view(np.uint8)
+        iterator = lazparallel.iter_decompressed_chunks(
+            self.point_source.source,
+            self.header,
+            self._laszip_vlr,
+            entries,
+            self._laz_backend_in_use,
+            num_workers=num_workers,
+            executor=executor,
+            ordered=False,
+        )
+        for _, first_point, points_data in iterator:
+            start = first_point * point_format.size
+            raw_array[start : start + len(points_data)] = np.frombuffer(
+                points_data, np.uint8
+            )
+        self.seek(0, io.SEEK_END)
+        return record.PackedPointRecord(array, point_format)
+
+    def _coalesce_indices(self, sorted_indices: np.ndarray) -> List[Tuple[int, int]]:
+        """Groups sorted & unique point indices into [start, stop) ranges
+        of points to be read in one go
+        """
+        if self.header.are_points_compressed:
+            # Seeking in a LAZ file means decompressing from the start of
+            # the chunk that contains the point, so requested points of the same
+            # chunk are read in one range, and a new range is started for each chunk
+            chunk_size = self._laszip_vlr.chunk_size
+            if chunk_size == VARIABLE_CHUNK_SIZE:
+                max_gap = 1
+            else:
+                chunk_ids = sorted_indices // chunk_size
+                range_starts = np.flatnonzero(np.diff(chunk_ids)) + 1
+                return _split_into_ranges(sorted_indices, range_starts)
+        else:
+            max_gap = max(1, MAX_GAP_BYTES // self.header.point_format.size)
+
+        range_starts = np.flatnonzero(np.diff(sorted_indices) > max_gap) + 1
+        return _split_into_ranges(sorted_indices, range_starts)
+
     def _create_laz_backend(self, source) -> Optional["IPointReader"]:
         try:
             backends = iter(self.laz_backend)
@@ -129,22 +690,48 @@ class LasReader:
             backends = (self.laz_backend,)
 
         laszip_vlr = self.header.vlrs.pop(self.header.vlrs.index("LasZipVlr"))
+        self._laszip_vlr = laszip_vlr
+        failures = []
         for backend in backends:
             try:
                 if not backend.is_available():
                     raise errors.PylasError(f"The '{backend}' is not available")
 
                 if backend == LazBackend.LazrsParallel:
-                    return LazrsPointReader(source, laszip_vlr, parallel=True)
+                    # Parallel decompression needs the chunk table,
+                    # which is at the end of the file
+                    point_reader = LazrsPointReader(
+                        source,
+                        laszip_vlr,
+                        parallel=source.seekable(),
+                        header=self.header,
+                    )
                 elif backend == LazBackend.Lazrs:
-                    return LazrsPointReader(source, laszip_vlr, parallel=False)
+                    point_reader = LazrsPointReader(
+                        source, laszip_vlr, parallel=False, header=self.header
+                    )
                 elif backend == LazBackend.Laszip:
-                    return LaszipPointReader(source, self.header)
+                    if not source.seekable():
+                        raise errors.LazError(
+                            "The laszip backend cannot read from a non-seekable source,"
+                            " use the lazrs backend"
+                        )
+                    point_reader = LaszipPointReader(source, self.header)
                 else:
                     raise errors.PylasError("Unknown LazBackend: {}".format(backend))
+                self._laz_backend_in_use = backend
+                return point_reader
 
             except errors.LazError as e:
                 logger.error(e)
+                failures.append(str(e))
+
+        if failures:
+            raise errors.PylasError(
+                "Data is compressed, but no LazBacked could be initialized: "
+                + "; ".join(failures)
+            )
+        return None
 
     def _read_evlrs(self, source, seekable=False) -> Optional[VLRList]:
         """Reads the EVLRs of the file, will fail if the file version
@@ -167,13 +754,124 @@ class LasReader:
         self.close()
 
 
+def _split_into_ranges(
+    sorted_indices: np.ndarray, range_starts: np.ndarray
+) -> List[Tuple[int, int]]:
+    first_indices = sorted_indices[np.concatenate(([0], range_starts))]
+    last_indices = sorted_indices[np.concatenate((range_starts - 1, [-1]))]
+    return [
+        (int(first), int(last) + 1) for first, last in zip(first_indices, last_indices)
+    ]
+
+
 class PointChunkIterator:
-    def __init__(self, reader: LasReader, points_per_iteration: int) -> None:
+    def __init__(
+        self,
+        reader: LasReader,
+        points_per_iteration: int,
+        dimensions: Optional[Sequence[str]] = None,
+        buffers: Optional[Union[int, Sequence[PointBuffer]]] = None,
+        where: Optional[zonemap.Where] = None,
+        index: Optional[Union[zonemap.ZoneMap, lax.LaxIndex]] = None,
+    ) -> None:
         self.reader = reader
         self.points_per_iteration = points_per_iteration
+        self.dimensions = dimensions
+        self.where = where
+
+        if buffers is None:
+            self.buffers: Optional[List[np.ndarray]] = None
+        else:
+            if dimensions is not None:
+                raise ValueError("buffers and dimensions cannot be used together")
+            if isinstance(buffers, int):
+                points_dtype = reader.header.point_format.dtype()
+                buffers = [
+                    np.zeros(points_per_iteration, points_dtype) for _ in range(buffers)
+                ]
+            self.buffers = [
+                b.array if isinstance(b, record.PackedPointRecord) else b
+                for b in buffers
+            ]
+            if not self.buffers:
+                raise ValueError("At least one buffer is needed")
+        self._next_buffer = 0
+
+        # [start, stop) ranges of points left to read, when filtering
+        self._ranges: Optional[collections.deque] = None
+        if where is not None:
+            header = reader.header
+            zonemap.check_where(where, header.point_format)
+            if index is not None:
+                index.check_compatible_with(header)
+                ranges = index.ranges_to_read(where, header)
+            else:
+                ranges = [(0, header.point_count)]
+            start = reader.points_read
+            self._ranges = collections.deque(
+                (max(first, start), stop) for first, stop in ranges if stop > start
+            )
+        elif index is not None:
+            raise ValueError("zone_map is only used to filter points with where")
+
+    def _read_points(
+        self, n: int, dimensions: Optional[Sequence[str]]
+    ) -> Optional[record.ScaleAwarePointRecord]:
+        if self.buffers is None:
+            return self.reader.read_points(n, dimensions)
+
+        buffer = self.buffers[self._next_buffer][:n]
+        self._next_buffer = (self._next_buffer + 1) % len(self.buffers)
+        n = self.reader.read_points_into(buffer)
+        if n == 0:
+            return None
+        return record.ScaleAwarePointRecord(
+            buffer[:n],
+            self.reader.header.point_format,
+            self.reader.header.scales,
+            self.reader.header.offsets,
+        )
+
+    def _read_chunk(self) -> Optional[record.ScaleAwarePointRecord]:
+        if self.where is None:
+            return self._read_points(self.points_per_iteration, self.dimensions)
+
+        while self._ranges:
+            start, stop = self._ranges[0]
+            if self.reader.points_read != start:
+                self.reader.seek(start)
+            n = min(self.points_per_iteration, stop - start)
+            if start + n == stop:
+                self._ranges.popleft()
+            else:
+                self._ranges[0] = (start + n, stop)
+
+            # All the dimensions are needed to apply the filter,
+            # the projection is done after
+            points = self._read_points(n, None)
+            if points is None:
+                break
+            mask = zonemap.points_matching(points, self.where)
+            if not mask.any():
+                continue
+            points = points[mask]
+            if self.dimensions is not None:
+                points = record.ScaleAwarePointRecord(
+                    record.project_points(
+                        points.array,
+                        record.fields_of_dimensions(
+                            points.point_format, self.dimensions
+                        ),
+                    ),
+                    points.point_format,
+                    points.scales,
+                    points.offsets,
+                )
+            return points
+        return None
 
     def __next__(self) -> record.ScaleAwarePointRecord:
-        points = self.reader.read_points(self.points_per_iteration)
+        points = self._read_chunk()
         if points is None:
             raise StopIteration
         return points
@@ -181,6 +879,116 @@ class PointChunkIterator:
     def __iter__(self) -> "PointChunkIterator":
         return self
 
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "PointChunkIterator":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class PrefetchingPointChunkIterator(PointChunkIterator):
+    """Chunk iterator that reads (and decompresses) the next chunks
+    in a background thread, so that reading overlaps with the processing
+    of the current chunk.
+
+    At most `prefetch` chunks are kept in advance.
+    Errors raised while reading are re-raised by `__next__`.
+
+    The thread is stopped by :meth:`.close`, when the iterator is exhausted
+    or garbage collected, or when the reader is closed.
+    """
+
+    def __init__(
+        self,
+        reader: LasReader,
+        points_per_iteration: int,
+        dimensions: Optional[Sequence[str]],
+        buffers: Optional[Union[int, Sequence[PointBuffer]]],
+        prefetch: int,
+        where: Optional[zonemap.Where] = None,
+        index: Optional[Union[zonemap.ZoneMap, lax.LaxIndex]] = None,
+    ) -> None:
+        super().__init__(
+            reader, points_per_iteration, dimensions, buffers, where, index
+        )
+        if self.buffers is not None and len(self.buffers) < prefetch + 2:
+            # prefetch chunks waiting in the queue, one being read,
+            # and the one the consumer is processing
+            raise ValueError(
+                f"At least {prefetch + 2} buffers are needed to prefetch {prefetch} chunks"
+            )
+        self._chunks = queue.Queue(maxsize=prefetch)
+        self._stop_requested = threading.Event()
+        self._exhausted = False
+        # The thread only has a weak reference to the iterator, so that
+        # an iterator that is dropped without being closed is collected
+        self._thread = threading.Thread(
+            target=_read_chunks_in_background,
+            args=(weakref.ref(self), self._chunks, self._stop_requested),
+            daemon=True,
+        )
+        self._stop = weakref.finalize(
+            self, _stop_thread, self._stop_requested, self._thread
+        )
+        self._thread.start()
+
+    def __next__(self) -> record.ScaleAwarePointRecord:
+        if self._exhausted:
+            raise StopIteration
+
+        item = self._chunks.get()
+        if item is None or isinstance(item, Exception):
+            self._exhausted = True
+            self._thread.join()
+            if item is None:
+                raise StopIteration
+            raise item
+        return item
+
+    def close(self) -> None:
+        """Stops the background reading"""
+        self._exhausted = True
+        self._stop()
+
+
+def _read_chunks_in_background(
+    iterator_ref: "weakref.ReferenceType[PrefetchingPointChunkIterator]",
+    chunks: queue.Queue,
+    stop_requested: threading.Event,
+) -> None:
+    while not stop_requested.is_set():
+        iterator = iterator_ref()
+        if iterator is None:
+            break
+        try:
+            item = iterator._read_chunk()
+        except Exception as e:
+            item = e
+        del iterator
+
+        # Use a timeout so that the thread notices when
+        # the consumer stopped iterating while the queue is full
+        while not stop_requested.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            else:
+                break
+        if item is None or isinstance(item, Exception):
+            break
+
+
+def _stop_thread(stop_requested: threading.Event, thread: threading.Thread) -> None:
+    stop_requested.set()
+    # The thread itself drops the last reference to the iterator
+    # in between two reads
+    if thread is not threading.current_thread():
+        thread.join()
+
 
 class IPointReader(abc.ABC):
     """The interface to be implemented by the class that actually reads
@@ -190,8 +998,27 @@ class IPointReader(abc.ABC):
     reader
     """
 
+    @property
+    @abc.abstractmethod
+    def point_size(self) -> int:
+        """The size in bytes of a point"""
+        ...
+
     @abc.abstractmethod
+    def readinto(self, buffer) -> None:
+        """Reads (and decompresses) points directly into the buffer,
+        the buffer length must be a multiple of the point size
+        """
+        ...
+
     def read_n_points(self, n: int) -> bytearray:
+        points_data = bytearray(n * self.point_size)
+        self.readinto(points_data)
+        return points_data
+
+    @abc.abstractmethod
+    def seek(self, point_index: int) -> None:
+        """Seeks so that the next point read is the point at `point_index`"""
         ...
 
     @abc.abstractmethod
@@ -202,20 +1029,30 @@ class IPointReader(abc.ABC):
 class UncompressedPointReader(IPointReader):
     """Implementation of IPointReader for the simple uncompressed case"""
 
-    def __init__(self, source, point_size) -> None:
+    def __init__(self, source, point_size, offset_to_point_data) -> None:
         self.source = source
-        self.point_size = point_size
+        self._point_size = point_size
+        self.offset_to_point_data = offset_to_point_data
 
-    def read_n_points(self, n: int) -> bytearray:
+    @property
+    def point_size(self) -> int:
+        return self._point_size
+
+    def readinto(self, buffer) -> None:
         try:
             readinto = self.source.readinto
         except AttributeError:
-            data = bytearray(self.source.read(n * self.point_size))
+            data = self.source.read(len(buffer))
+            memoryview(buffer)[: len(data)] = data
         else:
-            data = bytearray(n * self.point_size)
-            readinto(data)
+            readinto(buffer)
 
-        return data
+    def seek(self, point_index: int) -> None:
+        position = self.offset_to_point_data + (point_index * self.point_size)
+        if self.source.seekable():
+            self.source.seek(position, io.SEEK_SET)
+        else:
+            self.source.skip_to(position)
 
     def close(self):
         self.source.close()
@@ -226,29 +1063,133 @@ class LaszipPointReader(IPointReader):
 
     def __init__(self, source: BinaryIO, header: LasHeader) -> None:
         self.source = source
+        self.header = header
+        self._create_unzipper()
+
+    def _create_unzipper(self) -> None:
         self.source.seek(0)
-        self.unzipper = laszip.LasUnZipper(source)
+        self.unzipper = laszip.LasUnZipper(self.source)
         unzipper_header = self.unzipper.header
-        assert unzipper_header.point_data_format == header.point_format.id
-        assert unzipper_header.point_data_record_length == header.point_format.size
-        self.point_size = header.point_format.size
+        assert unzipper_header.point_data_format == self.header.point_format.id
+        assert unzipper_header.point_data_record_length == self.header.point_format.size
+        self.current_point = 0
 
-    def read_n_points(self, n: int) -> bytearray:
-        points_data = bytearray(n * self.point_size)
-        self.unzipper.decompress_into(points_data)
-        return points_data
+    @property
+    def point_size(self) -> int:
+        return self.header.point_format.size
+
+    def readinto(self, buffer) -> None:
+        self.unzipper.decompress_into(buffer)
+        self.current_point += len(buffer) // self.point_size
+
+    def seek(self, point_index: int) -> None:
+        if point_index == self.current_point:
+            return
+
+        try:
+            unzipper_seek = self.unzipper.seek
+        except AttributeError:
+            # Bindings that cannot seek, restart from the beginning if needed
+            # and decompress (and discard) the points up to the requested one
+            if point_index < self.current_point:
+                self._create_unzipper()
+            while self.current_point < point_index:
+                self.read_n_points(min(point_index - self.current_point, 1_000_000))
+        else:
+            unzipper_seek(point_index)
+            self.current_point = point_index
 
     def close(self) -> None:
         self.source.close()
 
 
+class CachingPointReader(IPointReader):
+    """Reads the points of a LAZ file chunk by chunk, through a :class:`.ChunkCache`.
+
+    Seeking is free, a chunk is only decompressed by the wrapped
+    point reader when it is not in the cache.
+    """
+
+    def __init__(
+        self,
+        point_reader: IPointReader,
+        first_point_of_chunks: np.ndarray,
+        cache: ChunkCache,
+        position: int,
+    ) -> None:
+        self.point_reader = point_reader
+        self.first_point_of_chunks = first_point_of_chunks
+        self.cache = cache
+        self.position = position
+        # The position of the wrapped reader
+        self._reader_position = position
+        # To not mix the chunks of files sharing the same cache
+        self._cache_key = object()
+
+    @property
+    def source(self):
+        return self.point_reader.source
+
+    @property
+    def point_size(self) -> int:
+        return self.point_reader.point_size
+
+    def _chunk(self, chunk_index: int) -> np.ndarray:
+        key = (self._cache_key, chunk_index)
+        data = self.cache.get(key)
+        if data is None:
+            first_point = int(self.first_point_of_chunks[chunk_index])
+            end_point = int(self.first_point_of_chunks[chunk_index + 1])
+            if self._reader_position != first_point:
+                self.point_reader.seek(first_point)
+            data = np.frombuffer(
+                self.point_reader.read_n_points(end_point - first_point), np.uint8
+            )
+            self._reader_position = end_point
+            self.cache.put(key, data)
+        return data
+
+    def readinto(self, buffer) -> None:
+        view = memoryview(buffer).cast("B")
+        point_size = self.point_size
+        num_written = 0
+        while num_written < len(view):
+            chunk_index = (
+                np.searchsorted(self.first_point_of_chunks, self.position, "right") - 1
+            )
+            data = self._chunk(chunk_index)
+            offset = (
+                self.position - int(self.first_point_of_chunks[chunk_index])
+            ) * point_size
+            n = min(len(data) - offset, len(view) - num_written)
+            view[num_written : num_written + n] = data[offset : offset + n]
+            num_written += n
+            self.position += n // point_size
+
+    def seek(self, point_index: int) -> None:
+        self.position = point_index
+
+    def uncached(self, position: int) -> IPointReader:
+        """Returns the wrapped reader, positioned at `position`"""
+        if self._reader_position != position:
+            self.point_reader.seek(position)
+        return self.point_reader
+
+    def close(self) -> None:
+        self.point_reader.close()
+
+
 class LazrsPointReader(IPointReader):
     """Implementation for the laz-rs backend, supports single-threaded decompression
     as well as multi-threaded decompression
     """
 
-    def __init__(self, source, laszip_vlr: LasZipVlr, parallel: bool) -> None:
+    def __init__(
+        self, source, laszip_vlr: LasZipVlr, parallel: bool, header: LasHeader
+    ) -> None:
         self.source = source
+        self.laszip_vlr = laszip_vlr
+        self.header = header
         self.vlr = lazrs.LazVlr(laszip_vlr.record_data)
         if parallel:
             self.decompressor = lazrs.ParLasZipDecompressor(
@@ -257,10 +1198,83 @@ class LazrsPointReader(IPointReader):
         else:
             self.decompressor = lazrs.LasZipDecompressor(source, laszip_vlr.record_data)
 
-    def read_n_points(self, n: int) -> bytearray:
-        point_bytes = bytearray(n * self.vlr.item_size())
-        self.decompressor.decompress_many(point_bytes)
-        return point_bytes
+        # The decompressors of lazrs do not seek correctly in files
+        # with variable-size chunks, after a seek in such files,
+        # the points are decompressed chunk by chunk using the chunk table
+        self._chunk_table: Optional[List[lazchunktable.ChunkTableEntry]] = None
+        self._first_points: Optional[np.ndarray] = None
+        self._chunk_starts: Optional[np.ndarray] = None
+        self._next_chunk: Optional[int] = None
+        self._pending = memoryview(b"")
+
+    @property
+    def point_size(self) -> int:
+        return self.vlr.item_size()
+
+    def readinto(self, buffer) -> None:
+        if self._next_chunk is None:
+            self.decompressor.decompress_many(buffer)
+            return
+
+        view = memoryview(buffer).cast("B")
+        num_written = 0
+        while num_written < len(view):
+            if not self._pending:
+                self._pending = self._decompress_chunk(self._next_chunk)
+                self._next_chunk += 1
+            n = min(len(self._pending), len(view) - num_written)
+            view[num_written : num_written + n] = self._pending[:n]
+            self._pending = self._pending[n:]
+            num_written += n
+
+    def seek(self, point_index: int) -> None:
+        if self.laszip_vlr.chunk_size != VARIABLE_CHUNK_SIZE:
+            self.decompressor.seek(point_index)
+            return
+
+        if self._chunk_table is None:
+            self._load_chunk_table()
+        first_points = self._first_points
+        chunk_index = int(np.searchsorted(first_points, point_index, "right")) - 1
+        self._next_chunk = chunk_index + 1
+        if chunk_index >= len(self._chunk_table):
+            self._pending = memoryview(b"")
+            return
+        points_data = self._decompress_chunk(chunk_index)
+        offset = (point_index - int(first_points[chunk_index])) * self.point_size
+        self._pending = points_data[offset:]
+
+    def _load_chunk_table(self) -> None:
+        self._chunk_table = lazchunktable.read_chunk_table(
+            self.source,
+            self.header.offset_to_point_data,
+            self.laszip_vlr.chunk_size,
+            self.header.point_count,
+        )
+        self._first_points = lazchunktable.first_point_of_chunks(self._chunk_table)
+        self._chunk_starts = lazchunktable.chunk_starts(
+            self._chunk_table, self.header.offset_to_point_data
+        )
+
+    def _decompress_chunk(self, chunk_index: int) -> memoryview:
+        if chunk_index >= len(self._chunk_table):
+            raise errors.LazError("Cannot read past the last chunk")
+        starts = self._chunk_starts
+        self.source.seek(int(starts[chunk_index]), io.SEEK_SET)
+        compressed_chunk = self.source.read(
+            int(starts[chunk_index + 1] - starts[chunk_index])
+        )
+        return memoryview(
+            lazparallel.decompress_chunks(
+                LazBackend.Lazrs,
+                bytes(self.laszip_vlr.record_data),
+                b"",
+                compressed_chunk,
+                self._chunk_table[chunk_index : chunk_index + 1],
+                True,
+                self.point_size,
+            )
+        )
 
     def close(self) -> None:
         self.source.close()
@@ -1,13 +1,17 @@
 import abc
 import io
 import logging
+import os
+import queue
+import threading
 from copy import copy
-from typing import BinaryIO, Optional, Union, Iterable
+from typing import BinaryIO, Callable, List, Optional, Union, Iterable
 
 import numpy as np
 
+from . import arrow
 from .compression import LazBackend
-from .errors import PylasError
+from .errors import LazError, PylasError
 from .header import LasHeader
 from .point import dims
 from .point.format import PointFormat
@@ -40,6 +44,11 @@ class LasWriter:
         do_compress: Optional[bool] = None,
         laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
         closefd: bool = True,
+        queue_size: int = 0,
+        buffer_size: int = 0,
+        trust_header: bool = False,
+        chunk_size: Optional[int] = None,
+        variable_chunk_size: bool = False,
     ) -> None:
         """
         Parameters
@@ -61,12 +70,56 @@ class LasWriter:
 
         closefd: default True
             should the `dest` be closed when the writer is closed
+
+        queue_size: default 0
+            number of point records that can wait to be written by a
+            background thread, which updates the header and compresses them,
+            so that the compression overlaps with the production of the next points.
+            When the queue is full, :meth:`.write_points` waits.
+            0 means points are written synchronously by :meth:`.write_points`.
+            Errors of the background thread are raised by the next call to
+            :meth:`.write_points`, :meth:`.flush` or :meth:`.close`.
+
+        buffer_size: default 0 (no buffer)
+            size in bytes of the buffer where the points of small :meth:`.write_points`
+            calls are gathered, to update the header and compress them in large batches,
+            which is a lot faster than for many small batches (a few MiB is enough).
+            The file written is the same.
+            The buffer is allocated by the first :meth:`.write_points` that needs it.
+            Points are written once the buffer is full, or on :meth:`.flush`
+            or :meth:`.close`, so the :attr:`.header` is only up to date, and
+            write errors are only raised, after them.
+
+        trust_header: default False
+            If True, the bounds and the number of points by return of the `header`
+            are written as they are, instead of being computed from the points
+            written, which saves time when they are already known
+            (only the number of points is counted).
+
+        chunk_size: optional int
+            LAZ only (lazrs backends), number of points of each compressed chunk,
+            the backend's default if None.
+            With variable_chunk_size, the maximum number of points of a chunk.
+
+        variable_chunk_size: default False
+            LAZ only (lazrs backends), if True, chunks end when :meth:`.end_chunk`
+            is called (or when they reach chunk_size points), so that chunks can be
+            made of spatially coherent points (e.g. cells) and readers only
+            decompress the chunks they need.
         """
         self.closefd = closefd
+        self.trust_header = trust_header
         self.header = copy(header)
         self.header.partial_reset()
-        self.header.maxs = [np.finfo("f8").min] * 3
-        self.header.mins = [np.finfo("f8").max] * 3
+        if trust_header:
+            self.header.mins = np.array(header.mins, np.float64)
+            self.header.maxs = np.array(header.maxs, np.float64)
+            self.header.number_of_points_by_return = np.array(
+                header.number_of_points_by_return, np.uint32
+            )
+        else:
+            self.header.maxs = [np.finfo("f8").min] * 3
+            self.header.mins = [np.finfo("f8").max] * 3
 
         self.dest = dest
         self.done = False
@@ -84,6 +137,10 @@ class LasWriter:
                 do_compress = False
             self.laz_backend = LazBackend.detect_available()
         self.header.are_points_compressed = do_compress
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+        self.chunk_size = chunk_size
+        self.variable_chunk_size = variable_chunk_size
 
         if do_compress:
             self.point_writer: IPointWriter = self._create_laz_backend(self.laz_backend)
@@ -92,19 +149,121 @@ class LasWriter:
 
         self.point_writer.write_initial_header_and_vlrs(self.header)
 
-    def write_points(self, points: PackedPointRecord) -> None:
+        self._background_writer: Optional[BackgroundPointWriter] = None
+        if queue_size > 0:
+            self._background_writer = BackgroundPointWriter(
+                self._write_points, queue_size
+            )
+
+        self._buffer: Optional[np.ndarray] = None
+        self._buffered_count = 0
+        self._buffer_point_count = buffer_size // self.header.point_format.size
+
+    def write_points(self, points: PackedPointRecord, copy: bool = True) -> None:
+        """Writes the points (compressing them if the file is LAZ)
+
+        Parameters
+        ----------
+        points: the points to write
+        copy: only used when points are written in a background thread (queue_size > 0),
+            if True (the default) the points are copied before being queued
+            (small writes are always copied into the buffer),
+            if False, the writer takes the ownership of the points, they must not
+            be modified afterwards (until :meth:`.flush` returns)
+        """
         if not points:
             return
 
         if self.done:
             raise PylasError("Cannot write points anymore")
 
-        if points.point_format != self.header.point_format:
+        if (
+            points.point_format != self.header.point_format
+            or points.point_size != self.header.point_format.size
+        ):
             raise PylasError("Incompatible point formats")
 
-        self.header.update(points)
+        array = points.array
+        while len(array) > 0:
+            if self._buffered_count == 0 and len(array) >= self._buffer_point_count:
+                # Large enough on its own, no need to go through the buffer
+                self._hand_over(PackedPointRecord(array, points.point_format), copy)
+                break
+            if self._buffer is None:
+                self._buffer = np.empty(
+                    self._buffer_point_count, self.header.point_format.dtype()
+                )
+            n = min(len(array), len(self._buffer) - self._buffered_count)
+            self._buffer[self._buffered_count : self._buffered_count + n] = array[:n]
+            self._buffered_count += n
+            array = array[n:]
+            if self._buffered_count == len(self._buffer):
+                self._write_buffered_points()
+
+    def _write_buffered_points(self) -> None:
+        if self._buffered_count == 0:
+            return
+        points = PackedPointRecord(
+            self._buffer[: self._buffered_count], self.header.point_format
+        )
+        self._buffered_count = 0
+        if self._background_writer is None:
+            self._write_points(points)
+        else:
+            # The background thread takes the ownership of the buffer,
+            # the next small write allocates a new one
+            self._buffer = None
+            self._background_writer.put(points)
+
+    def _hand_over(self, points: PackedPointRecord, copy: bool) -> None:
+        if self._background_writer is None:
+            self._write_points(points)
+        else:
+            if copy:
+                points = PackedPointRecord(points.array.copy(), points.point_format)
+            self._background_writer.put(points)
+
+    def _write_points(self, points: PackedPointRecord) -> None:
+        if self.trust_header:
+            self.header.point_count += len(points)
+        else:
+            self.header.update(points)
         self.point_writer.write_points(points)
 
+    def end_chunk(self) -> None:
+        """Ends the current LAZ chunk, the next points will start a new one.
+
+        Only for writers created with variable_chunk_size=True,
+        does nothing for LAS files.
+        """
+        if not self.header.are_points_compressed:
+            return
+        if not self.variable_chunk_size:
+            raise LazError(
+                "end_chunk needs a writer created with variable_chunk_size=True"
+            )
+        self._write_buffered_points()
+        if self._background_writer is None:
+            self.point_writer.end_chunk()
+        else:
+            self._background_writer.call(self.point_writer.end_chunk)
+
+    def flush(self) -> None:
+        """Writes the points in the buffer and waits until all the points
+        given to :meth:`.write_points` are written,
+        raises the error of the background thread if there was one.
+        """
+        self._write_buffered_points()
+        if self._background_writer is not None:
+            self._background_writer.join()
+
+    def write_arrow(self, batch) -> None:
+        """Writes the points of an Apache Arrow record batch (or table),
+        whose columns are dimensions of the point format of the file
+        (requires pyarrow), see :func:`pylas.arrow.points_from_arrow`
+        """
+        self.write_points(arrow.points_from_arrow(batch, self.header), copy=False)
+
     def write_evlrs(self, evlrs: VLRList) -> None:
         if self.header.version.minor < 4:
             raise PylasError(
@@ -112,6 +271,7 @@ class LasWriter:
             )
 
         if len(evlrs) > 0:
+            self.flush()
             self.point_writer.done()
             self.done = True
             self.header.number_of_evlrs = len(evlrs)
@@ -119,12 +279,20 @@ class LasWriter:
             evlrs.write_to(self.dest, as_extended=True)
 
     def close(self) -> None:
-        if self.point_writer is not None:
-            if not self.done:
-                self.point_writer.done()
-            self.point_writer.write_updated_header(self.header)
-        if self.closefd:
-            self.dest.close()
+        try:
+            try:
+                if not self.done:
+                    self._write_buffered_points()
+            finally:
+                if self._background_writer is not None:
+                    self._background_writer.stop()
+            if self.point_writer is not None:
+                if not self.done:
+                    self.point_writer.done()
+                self.point_writer.write_updated_header(self.header)
+        finally:
+            if self.closefd:
+                self.dest.close()
 
     def _create_laz_backend(
         self, laz_backends: Union[LazBackend, Iterable[LazBackend]]
@@ -141,14 +309,26 @@ class LasWriter:
                     raise PylasError(f"The '{backend}' is not available")
 
                 if backend == LazBackend.Laszip:
+                    if self.chunk_size is not None or self.variable_chunk_size:
+                        raise LazError(
+                            "The laszip backend does not support choosing chunk sizes"
+                        )
                     return LaszipPointWriter(self.dest, self.header)
-                elif backend == LazBackend.LazrsParallel:
-                    return LazrsPointWriter(
-                        self.dest, self.header.point_format, parallel=True
-                    )
-                elif backend == LazBackend.Lazrs:
+                elif backend in (LazBackend.LazrsParallel, LazBackend.Lazrs):
+                    if (
+                        self.variable_chunk_size
+                        and not backend.supports_variable_chunk_size()
+                    ):
+                        raise LazError(
+                            "The installed lazrs version does not support"
+                            " variable size chunks"
+                        )
                     return LazrsPointWriter(
-                        self.dest, self.header.point_format, parallel=False
+                        self.dest,
+                        self.header.point_format,
+                        parallel=backend == LazBackend.LazrsParallel,
+                        chunk_size=self.chunk_size,
+                        variable_chunk_size=self.variable_chunk_size,
                     )
                 else:
                     raise PylasError("Unknown LazBacked: {}".format(backend))
@@ -168,6 +348,65 @@ class LasWriter:
         self.close()
 
 
+class BackgroundPointWriter:
+    """Thread writing the point records put in a bounded queue,
+    used by the :class:`.LasWriter` when its queue_size is not 0.
+
+    The first error raised by the `write` function is kept (the following
+    records are discarded) and raised by every subsequent call
+    to :meth:`.put`, :meth:`.call`, :meth:`.join` and :meth:`.stop`.
+    """
+
+    def __init__(self, write, queue_size: int) -> None:
+        self.write = write
+        # Functions to call in the thread, None to stop
+        self._records = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._write_records, daemon=True)
+        self._thread.start()
+
+    def _write_records(self) -> None:
+        while True:
+            task = self._records.get()
+            try:
+                if task is None:
+                    break
+                if self._error is None:
+                    task()
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._records.task_done()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def put(self, points: PackedPointRecord) -> None:
+        self.call(lambda: self.write(points))
+
+    def call(self, function: Callable[[], None]) -> None:
+        """Calls the function in the thread, after the records already queued
+        are written
+        """
+        self._raise_error()
+        if not self._thread.is_alive():
+            raise PylasError("The background writer is stopped")
+        self._records.put(function)
+
+    def join(self) -> None:
+        """Waits until the records in the queue are written"""
+        self._records.join()
+        self._raise_error()
+
+    def stop(self) -> None:
+        """Writes the records in the queue and stops the thread"""
+        if self._thread.is_alive():
+            self._records.put(None)
+            self._thread.join()
+        self._raise_error()
+
+
 class IPointWriter(abc.ABC):
     """Interface to be implemented by the actual
     PointWriter backend
@@ -190,6 +429,10 @@ class IPointWriter(abc.ABC):
     def done(self) -> None:
         ...
 
+    def end_chunk(self) -> None:
+        """Ends the current chunk of compressed points, if supported"""
+        pass
+
     def write_updated_header(self, header):
         self.destination.seek(0, io.SEEK_SET)
         header.write_to(self.destination)
@@ -267,13 +510,41 @@ class LazrsPointWriter(IPointWriter):
     """
 
     def __init__(
-        self, dest: BinaryIO, point_format: PointFormat, parallel: bool
+        self,
+        dest: BinaryIO,
+        point_format: PointFormat,
+        parallel: bool,
+        chunk_size: Optional[int] = None,
+        variable_chunk_size: bool = False,
     ) -> None:
         self.dest = dest
-        self.vlr = lazrs.LazVlr.new_for_compression(
-            point_format.id, point_format.num_extra_bytes
-        )
+        if variable_chunk_size:
+            self.vlr = lazrs.LazVlr.new_for_compression(
+                point_format.id,
+                point_format.num_extra_bytes,
+                use_variable_size_chunks=True,
+            )
+        else:
+            self.vlr = lazrs.LazVlr.new_for_compression(
+                point_format.id, point_format.num_extra_bytes
+            )
+            if chunk_size is not None:
+                record_data = bytearray(self.vlr.record_data())
+                record_data[12:16] = chunk_size.to_bytes(4, "little", signed=False)
+                self.vlr = lazrs.LazVlr(bytes(record_data))
         self.parallel = parallel
+        self.point_size = point_format.size
+        self.variable_chunk_size = variable_chunk_size
+        # With variable size chunks, chunks are ended after this number of points
+        self.max_chunk_size = chunk_size if variable_chunk_size else None
+        self.points_in_chunk = 0
+        # The sequential compressor always ends its current chunk when done,
+        # so chunks are only ended when points follow, to avoid an empty last chunk
+        self.chunk_end_pending = False
+        # The parallel compressor compresses whole chunks, points of the current
+        # chunk and complete chunks are kept until there are enough of them
+        self.current_chunk: List[np.ndarray] = []
+        self.complete_chunks: List[np.ndarray] = []
         self.compressor: Optional[
             Union[lazrs.ParLasZipCompressor, lazrs.LasZipCompressor]
         ] = None
@@ -299,8 +570,48 @@ class LazrsPointWriter(IPointWriter):
             self.compressor is not None
         ), "Trying to write points without having written header"
         points_bytes = np.frombuffer(points.array, np.uint8)
-        self.compressor.compress_many(points_bytes)
+        if not self.variable_chunk_size:
+            self.compressor.compress_many(points_bytes)
+            return
+
+        while len(points_bytes) > 0:
+            n = len(points_bytes) // self.point_size
+            if self.max_chunk_size is not None:
+                n = min(n, self.max_chunk_size - self.points_in_chunk)
+            chunk_part = points_bytes[: n * self.point_size]
+            points_bytes = points_bytes[n * self.point_size :]
+            if self.parallel:
+                # The caller may reuse its points once they are written
+                self.current_chunk.append(chunk_part.copy())
+            else:
+                if self.chunk_end_pending:
+                    self.compressor.finish_current_chunk()
+                    self.chunk_end_pending = False
+                self.compressor.compress_many(chunk_part)
+            self.points_in_chunk += n
+            if self.points_in_chunk == self.max_chunk_size:
+                self.end_chunk()
+
+    def end_chunk(self) -> None:
+        if not self.variable_chunk_size or self.points_in_chunk == 0:
+            return
+        if self.parallel:
+            self.complete_chunks.append(np.concatenate(self.current_chunk))
+            self.current_chunk = []
+            if len(self.complete_chunks) >= (os.cpu_count() or 1):
+                self._compress_complete_chunks()
+        else:
+            self.chunk_end_pending = True
+        self.points_in_chunk = 0
+
+    def _compress_complete_chunks(self) -> None:
+        if self.complete_chunks:
+            self.compressor.compress_chunks(self.complete_chunks)
+            self.complete_chunks = []
 
     def done(self) -> None:
         if self.compressor is not None:
+            if self.parallel:
+                self.end_chunk()
+                self._compress_complete_chunks()
             self.compressor.done()
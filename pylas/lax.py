@@ -0,0 +1,503 @@
+""" Reading & writing of LAX files, the quadtree spatial index of LAStools' lasindex.
+
+A LAX file contains a quadtree covering the x, y bounds of a LAS/LAZ file
+and, for each cell of the quadtree, the intervals of points (point indices)
+that fall into the cell. To find the points in a rectangle, only the
+intervals of the cells that intersect the rectangle have to be read.
+
+Layout of the file (little endian)::
+
+    "LASX" u32 version
+    "LASS" u32 type (0: quadtree)
+    "LASQ" u32 version u32 levels u32 level_index u32 implicit_levels
+    f32 min_x f32 max_x f32 min_y f32 max_y
+    "LASV" u32 version i32 number_of_cells
+    for each cell:
+        i32 cell_index u32 number_of_intervals u32 number_of_points
+        number_of_intervals * (u32 start, u32 end), with end included
+"""
+import struct
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from . import errors
+from .header import LasHeader
+
+LAX_SIGNATURE = b"LASX"
+SPATIAL_SIGNATURE = b"LASS"
+QUADTREE_SIGNATURE = b"LASQ"
+INTERVAL_SIGNATURE = b"LASV"
+QUADTREE_TYPE = 0
+
+#: Default values of lasindex
+DEFAULT_THRESHOLD = 1000
+DEFAULT_MINIMUM_POINTS = 100_000
+DEFAULT_MAXIMUM_INTERVALS = -20
+
+#: Number of points read at once when building an index
+POINTS_PER_ITERATION = 1_000_000
+
+Rectangle = Tuple[float, float, float, float]
+
+
+def lax_path(las_path: Union[str, Path]) -> Path:
+    """Returns the path of the LAX file of a LAS/LAZ file
+
+    >>> str(lax_path("tiles/tile.laz"))
+    'tiles/tile.lax'
+    """
+    return Path(las_path).with_suffix(".lax")
+
+
+def level_offsets(levels: int) -> np.ndarray:
+    """Returns the index of the first cell of each level of the quadtree
+
+    >>> level_offsets(3).tolist()
+    [0, 1, 5, 21]
+    """
+    offsets = np.zeros(levels + 1, np.int64)
+    np.cumsum(4 ** np.arange(levels, dtype=np.int64), out=offsets[1:])
+    return offsets
+
+
+class QuadTree:
+    """The quadtree that divides the space in cells.
+
+    The bounds are stored as float32 like lasindex does, and the computations
+    of cell limits are done in float32 so that points are assigned to the
+    same cells as LAStools would.
+    """
+
+    def __init__(
+        self, levels: int, min_x: float, max_x: float, min_y: float, max_y: float
+    ) -> None:
+        self.levels = levels
+        self.level_offsets = level_offsets(levels)
+        self.min_x = np.float32(min_x)
+        self.max_x = np.float32(max_x)
+        self.min_y = np.float32(min_y)
+        self.max_y = np.float32(max_y)
+
+    @classmethod
+    def covering(
+        cls, min_x: float, max_x: float, min_y: float, max_y: float, cell_size: float
+    ) -> "QuadTree":
+        """Creates the quadtree covering the bounds with cells of (at most) cell_size,
+        the bounds are enlarged to be a multiple of cell_size, like lasindex does.
+        """
+
+        def align_min(value):
+            cells = int(value / cell_size)
+            return cell_size * (cells if value >= 0 else cells - 1)
+
+        def align_max(value):
+            cells = int(value / cell_size)
+            return cell_size * (cells + 1 if value >= 0 else cells)
+
+        min_x, max_x = align_min(min_x), align_max(max_x)
+        min_y, max_y = align_min(min_y), align_max(max_y)
+        cells_x = int(round((max_x - min_x) / cell_size))
+        cells_y = int(round((max_y - min_y) / cell_size))
+        levels = max(cells_x, cells_y, 1) - 1
+        levels = levels.bit_length()
+
+        # Enlarge the bounding box to the size of the quadtree
+        missing = (1 << levels) - cells_x
+        min_x -= (missing - missing // 2) * cell_size
+        max_x += (missing // 2) * cell_size
+        missing = (1 << levels) - cells_y
+        min_y -= (missing - missing // 2) * cell_size
+        max_y += (missing // 2) * cell_size
+        return cls(levels, min_x, max_x, min_y, max_y)
+
+    def cell_indices(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Returns the index of the cells of the deepest level containing the points"""
+        n = len(x)
+        cell_min_x = np.full(n, self.min_x, np.float32)
+        cell_max_x = np.full(n, self.max_x, np.float32)
+        cell_min_y = np.full(n, self.min_y, np.float32)
+        cell_max_y = np.full(n, self.max_y, np.float32)
+        level_index = np.zeros(n, np.int64)
+        for _ in range(self.levels):
+            level_index <<= 2
+            mid_x = (cell_min_x + cell_max_x) / np.float32(2)
+            mid_y = (cell_min_y + cell_max_y) / np.float32(2)
+
+            upper_x = x >= mid_x
+            np.copyto(cell_min_x, mid_x, where=upper_x)
+            np.copyto(cell_max_x, mid_x, where=~upper_x)
+            level_index |= upper_x
+
+            upper_y = y >= mid_y
+            np.copyto(cell_min_y, mid_y, where=upper_y)
+            np.copyto(cell_max_y, mid_y, where=~upper_y)
+            level_index |= upper_y.astype(np.int64) << 1
+
+        return level_index + self.level_offsets[self.levels]
+
+    def levels_of(self, cell_indices: np.ndarray) -> np.ndarray:
+        """Returns the level of each cell"""
+        return np.searchsorted(self.level_offsets, cell_indices, side="right") - 1
+
+    def parents(self, cell_indices: np.ndarray) -> np.ndarray:
+        """Returns the index of the parent of each cell (cells must not be the root)"""
+        levels = self.levels_of(cell_indices)
+        if np.any(levels == 0):
+            raise ValueError("The root cell has no parent")
+        level_indices = cell_indices - self.level_offsets[levels]
+        return self.level_offsets[levels - 1] + (level_indices >> 2)
+
+    def cells_bounds(
+        self, cell_indices: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the min_x, min_y, max_x, max_y bounds of the cells"""
+        cell_indices = np.asarray(cell_indices, np.int64)
+        levels = self.levels_of(cell_indices)
+        level_indices = cell_indices - self.level_offsets[levels]
+
+        n = len(cell_indices)
+        min_x = np.full(n, self.min_x, np.float32)
+        max_x = np.full(n, self.max_x, np.float32)
+        min_y = np.full(n, self.min_y, np.float32)
+        max_y = np.full(n, self.max_y, np.float32)
+        for depth in range(1, self.levels + 1):
+            active = levels >= depth
+            shifts = np.where(active, 2 * (levels - depth), 0)
+            quadrants = (level_indices >> shifts) & 3
+            mid_x = (min_x + max_x) / np.float32(2)
+            mid_y = (min_y + max_y) / np.float32(2)
+
+            upper_x = (quadrants & 1).astype(np.bool_)
+            np.copyto(min_x, mid_x, where=active & upper_x)
+            np.copyto(max_x, mid_x, where=active & ~upper_x)
+            upper_y = (quadrants & 2).astype(np.bool_)
+            np.copyto(min_y, mid_y, where=active & upper_y)
+            np.copyto(max_y, mid_y, where=active & ~upper_y)
+        return min_x, min_y, max_x, max_y
+
+    def cell_bounds(self, cell_index: int) -> Rectangle:
+        """Returns the (min_x, min_y, max_x, max_y) bounds of a cell"""
+        bounds = self.cells_bounds(np.array([cell_index]))
+        return tuple(float(b[0]) for b in bounds)
+
+
+class LaxIndex:
+    """Spatial index of a LAS/LAZ file, as written by lasindex.
+
+    cells maps a cell index to an array of shape (n, 2) of
+    the [start, end] (end included) point intervals of the cell,
+    point_counts maps a cell index to the number of points in the cell
+    (intervals may also span points of other cells).
+    """
+
+    def __init__(
+        self,
+        quadtree: QuadTree,
+        cells: Dict[int, np.ndarray],
+        point_counts: Dict[int, int],
+        version: int = 0,
+    ) -> None:
+        self.quadtree = quadtree
+        self.cells = cells
+        self.point_counts = point_counts
+        self.version = version
+
+    @property
+    def number_of_points(self) -> int:
+        return sum(self.point_counts.values())
+
+    @classmethod
+    def build(
+        cls,
+        reader,
+        cell_size: Optional[float] = None,
+        threshold: int = DEFAULT_THRESHOLD,
+        minimum_points: int = DEFAULT_MINIMUM_POINTS,
+        maximum_intervals: int = DEFAULT_MAXIMUM_INTERVALS,
+    ) -> "LaxIndex":
+        """Builds the index of a file by reading all its points.
+
+        The position of the reader is restored afterwards.
+
+        Parameters
+        ----------
+        reader: the :class:`pylas.LasReader` of the file
+        cell_size: size of the cells of the deepest level, by default it is
+            chosen from the density of points (10, 100 or 1000 units)
+        threshold: points of a same cell separated by at most this number of
+            points are put in the same interval
+        minimum_points: cells with less points are merged into their parent
+            cell, as long as the parent has less than this number of points
+        maximum_intervals: maximum total number of intervals, if negative,
+            the maximum is -maximum_intervals times the number of cells.
+            The closest intervals are merged to respect it.
+        """
+        header = reader.header
+        if cell_size is None:
+            area = max(header.x_max - header.x_min, 1.0) * max(
+                header.y_max - header.y_min, 1.0
+            )
+            density = header.point_count / area
+            if density > 10:
+                cell_size = 10.0
+            elif density > 0.1:
+                cell_size = 100.0
+            else:
+                cell_size = 1000.0
+
+        quadtree = QuadTree.covering(
+            header.x_min, header.x_max, header.y_min, header.y_max, cell_size
+        )
+
+        # runs of consecutive points in the same cell
+        run_cells, run_starts, run_ends = [], [], []
+        position = reader.points_read
+        try:
+            reader.seek(0)
+            first_point = 0
+            for points in reader.chunk_iterator(
+                POINTS_PER_ITERATION, dimensions=["x", "y"]
+            ):
+                cells = quadtree.cell_indices(
+                    np.asarray(points.x), np.asarray(points.y)
+                )
+                run_first = np.flatnonzero(np.diff(cells)) + 1
+                run_first = np.concatenate(([0], run_first))
+                run_last = np.concatenate((run_first[1:] - 1, [len(cells) - 1]))
+                run_cells.append(cells[run_first])
+                run_starts.append(run_first + first_point)
+                run_ends.append(run_last + first_point)
+                first_point += len(cells)
+        finally:
+            reader.seek(position)
+
+        if not run_cells:
+            return cls(quadtree, {}, {})
+
+        intervals, point_counts = _merge_runs(
+            np.concatenate(run_cells),
+            np.concatenate(run_starts),
+            np.concatenate(run_ends),
+            threshold,
+        )
+        index = cls(quadtree, intervals, point_counts)
+        if minimum_points:
+            index._merge_small_cells(minimum_points)
+        if maximum_intervals:
+            if maximum_intervals < 0:
+                maximum_intervals = -maximum_intervals * len(index.cells)
+            index._limit_intervals(maximum_intervals)
+        return index
+
+    def _merge_small_cells(self, minimum_points: int) -> None:
+        """Merges, level by level, sibling cells into their parent when
+        they have fewer than minimum_points points together
+        """
+        for level in range(self.quadtree.levels, 0, -1):
+            cell_indices = np.fromiter(self.cells.keys(), np.int64, len(self.cells))
+            cell_indices = cell_indices[self.quadtree.levels_of(cell_indices) == level]
+            parents = self.quadtree.parents(cell_indices)
+            by_parent: Dict[int, List[int]] = {}
+            for cell_index, parent in zip(cell_indices.tolist(), parents.tolist()):
+                by_parent.setdefault(parent, []).append(cell_index)
+
+            for parent, children in by_parent.items():
+                if parent in self.cells:
+                    children.append(parent)
+                number_of_points = sum(self.point_counts[c] for c in children)
+                if number_of_points >= minimum_points:
+                    continue
+                intervals = np.concatenate([self.cells.pop(c) for c in children])
+                self.cells[parent] = _union_intervals(intervals, threshold=1)
+                for c in children:
+                    del self.point_counts[c]
+                self.point_counts[parent] = number_of_points
+
+    def _limit_intervals(self, maximum_intervals: int) -> None:
+        """Merges the closest intervals of each cell until the total number
+        of intervals is at most maximum_intervals
+        """
+        total = sum(len(i) for i in self.cells.values())
+        if total <= maximum_intervals:
+            return
+        gaps = [i[1:, 0] - i[:-1, 1] for i in self.cells.values() if len(i) > 1]
+        if not gaps:
+            # each cell has a single interval, nothing can be merged
+            return
+        gaps = np.concatenate(gaps)
+        # merge every gap smaller or equal to the gap that
+        # brings the number of intervals under the maximum
+        # (a cell keeps at least one interval)
+        k = min(total - maximum_intervals, len(gaps)) - 1
+        threshold = np.partition(gaps, k)[k]
+        for cell_index, intervals in self.cells.items():
+            self.cells[cell_index] = _union_intervals(intervals, threshold)
+
+    def cells_intersecting(self, rectangle: Rectangle) -> List[int]:
+        """Returns the indices of the cells intersecting the
+        (min_x, min_y, max_x, max_y) rectangle
+        """
+        r_min_x, r_min_y, r_max_x, r_max_y = rectangle
+        cell_indices = np.fromiter(self.cells.keys(), np.int64, len(self.cells))
+        min_x, min_y, max_x, max_y = self.quadtree.cells_bounds(cell_indices)
+        intersects = (
+            (min_x <= r_max_x)
+            & (r_min_x <= max_x)
+            & (min_y <= r_max_y)
+            & (r_min_y <= max_y)
+        )
+        return cell_indices[intersects].tolist()
+
+    def intervals_intersecting(self, rectangle: Rectangle) -> List[Tuple[int, int]]:
+        """Returns the sorted, non overlapping, [start, stop) ranges of points
+        that may be in the (min_x, min_y, max_x, max_y) rectangle
+        """
+        cells = self.cells_intersecting(rectangle)
+        if not cells:
+            return []
+        intervals = _union_intervals(
+            np.concatenate([self.cells[c] for c in cells]), threshold=1
+        )
+        return [(int(start), int(end) + 1) for start, end in intervals]
+
+    def ranges_to_read(self, where, header: LasHeader) -> List[Tuple[int, int]]:
+        """Returns the [start, stop) ranges of points that may match
+        the x & y ranges of a `where` filter,
+        (see :meth:`pylas.LasReader.chunk_iterator`)
+        """
+        x_range = where.get("x")
+        y_range = where.get("y")
+        if not isinstance(x_range, tuple) and not isinstance(y_range, tuple):
+            return [(0, header.point_count)]
+
+        infinity = float("inf")
+        min_x, max_x = x_range if isinstance(x_range, tuple) else (None, None)
+        min_y, max_y = y_range if isinstance(y_range, tuple) else (None, None)
+        rectangle = (
+            -infinity if min_x is None else min_x,
+            -infinity if min_y is None else min_y,
+            infinity if max_x is None else max_x,
+            infinity if max_y is None else max_y,
+        )
+        return self.intervals_intersecting(rectangle)
+
+    def check_compatible_with(self, header: LasHeader) -> None:
+        last_point = max((int(c[:, 1].max()) for c in self.cells.values()), default=-1)
+        if last_point >= header.point_count:
+            raise errors.PylasError(
+                f"The index references point {last_point}, "
+                f"but the file has {header.point_count} points"
+            )
+
+    @classmethod
+    def read_from(cls, source: Union[str, Path, BinaryIO]) -> "LaxIndex":
+        if isinstance(source, (str, Path)):
+            with open(source, mode="rb") as f:
+                return cls.read_from(f)
+
+        def read_exact(size):
+            data = source.read(size)
+            if len(data) != size:
+                raise errors.PylasError("The LAX file is truncated")
+            return data
+
+        if read_exact(4) != LAX_SIGNATURE:
+            raise errors.PylasError("Not a LAX file, wrong signature")
+        (version,) = struct.unpack("<I", read_exact(4))
+
+        signature = read_exact(4)
+        if signature == SPATIAL_SIGNATURE:
+            (spatial_type,) = struct.unpack("<I", read_exact(4))
+            if spatial_type != QUADTREE_TYPE:
+                raise errors.PylasError(f"Unsupported LAX spatial type {spatial_type}")
+            signature = read_exact(4)
+        if signature != QUADTREE_SIGNATURE:
+            raise errors.PylasError("Invalid LAX file, expected quadtree signature")
+        _, levels, _, _ = struct.unpack("<4I", read_exact(16))
+        min_x, max_x, min_y, max_y = struct.unpack("<4f", read_exact(16))
+        quadtree = QuadTree(levels, min_x, max_x, min_y, max_y)
+
+        if read_exact(4) != INTERVAL_SIGNATURE:
+            raise errors.PylasError("Invalid LAX file, expected interval signature")
+        _, number_of_cells = struct.unpack("<Ii", read_exact(8))
+        cells, point_counts = {}, {}
+        for _ in range(number_of_cells):
+            cell_index, number_of_intervals, number_of_points = struct.unpack(
+                "<iII", read_exact(12)
+            )
+            intervals = np.frombuffer(
+                read_exact(8 * number_of_intervals), np.dtype("<u4")
+            )
+            cells[cell_index] = intervals.reshape(-1, 2).astype(np.int64)
+            point_counts[cell_index] = number_of_points
+        return cls(quadtree, cells, point_counts, version)
+
+    def write_to(self, destination: Union[str, Path, BinaryIO]) -> None:
+        if isinstance(destination, (str, Path)):
+            with open(destination, mode="wb") as f:
+                return self.write_to(f)
+
+        quadtree = self.quadtree
+        destination.write(LAX_SIGNATURE)
+        destination.write(struct.pack("<I", self.version))
+        destination.write(SPATIAL_SIGNATURE)
+        destination.write(struct.pack("<I", QUADTREE_TYPE))
+        destination.write(QUADTREE_SIGNATURE)
+        destination.write(struct.pack("<4I", 0, quadtree.levels, 0, 0))
+        destination.write(
+            struct.pack(
+                "<4f", quadtree.min_x, quadtree.max_x, quadtree.min_y, quadtree.max_y
+            )
+        )
+        destination.write(INTERVAL_SIGNATURE)
+        destination.write(struct.pack("<Ii", 0, len(self.cells)))
+        for cell_index, intervals in self.cells.items():
+            destination.write(
+                struct.pack(
+                    "<iII", cell_index, len(intervals), self.point_counts[cell_index]
+                )
+            )
+            destination.write(intervals.astype("<u4").tobytes())
+
+    def __repr__(self) -> str:
+        return f"<LaxIndex({self.quadtree.levels} levels, {len(self.cells)} cells)>"
+
+
+def _union_intervals(intervals: np.ndarray, threshold: int) -> np.ndarray:
+    """Sorts and merges intervals (end included) separated
+    by at most `threshold` points
+    """
+    intervals = intervals[np.argsort(intervals[:, 0], kind="stable")]
+    ends = np.maximum.accumulate(intervals[:, 1])
+    new_interval = np.ones(len(intervals), np.bool_)
+    new_interval[1:] = intervals[1:, 0] - ends[:-1] > threshold
+    firsts = np.flatnonzero(new_interval)
+    lasts = np.concatenate((firsts[1:] - 1, [len(intervals) - 1]))
+    return np.stack((intervals[firsts, 0], ends[lasts]), axis=1)
+
+
+def _merge_runs(
+    cells: np.ndarray, starts: np.ndarray, ends: np.ndarray, threshold: int
+) -> Tuple[Dict[int, np.ndarray], Dict[int, int]]:
+    """Groups the runs of points by cell, merging the runs of a cell
+    separated by at most threshold points.
+
+    Returns the intervals and the number of points of each cell
+    """
+    order = np.lexsort((starts, cells))
+    cells, starts, ends = cells[order], starts[order], ends[order]
+
+    cell_firsts = np.flatnonzero(np.diff(cells)) + 1
+    cell_firsts = np.concatenate(([0], cell_firsts, [len(cells)]))
+    intervals, point_counts = {}, {}
+    for first, last in zip(cell_firsts[:-1], cell_firsts[1:]):
+        cell_index = int(cells[first])
+        intervals[cell_index] = _union_intervals(
+            np.stack((starts[first:last], ends[first:last]), axis=1), threshold
+        )
+        point_counts[cell_index] = int(
+            (ends[first:last] - starts[first:last] + 1).sum()
+        )
+    return intervals, point_counts
@@ -0,0 +1,475 @@
+""" Reading and writing of the chunk table of LAZ files.
+
+In a LAZ file, the points are compressed in chunks that can each be
+decompressed independently. The chunk table, written after the last chunk,
+stores the size in bytes (and, for files with variable chunk sizes,
+the number of points) of each chunk, it is what allows to seek
+in a LAZ file without decompressing everything.
+
+The entries of the table are themselves compressed using the same
+arithmetic coder and integer compressor that laszip uses for points,
+which this module implements so that the chunk table can be used
+whatever the LAZ backend is.
+"""
+import io
+import struct
+from typing import BinaryIO, List, NamedTuple, Optional
+
+import numpy as np
+
+from .errors import LazError
+from .vlrs.known import VARIABLE_CHUNK_SIZE
+
+AC_MIN_LENGTH = 0x01000000
+AC_MAX_LENGTH = 0xFFFFFFFF
+
+BM_LENGTH_SHIFT = 13
+BM_MAX_COUNT = 1 << BM_LENGTH_SHIFT
+
+DM_LENGTH_SHIFT = 15
+DM_MAX_COUNT = 1 << DM_LENGTH_SHIFT
+
+U32_MASK = 0xFFFFFFFF
+
+CHUNK_TABLE_VERSION = 0
+
+#: Size of the offset to the chunk table, written at the start of the point data
+OFFSET_TO_CHUNK_TABLE_SIZE = 8
+
+
+class ChunkTableEntry(NamedTuple):
+    point_count: int
+    byte_count: int
+
+
+def _as_i32(value: int) -> int:
+    value &= U32_MASK
+    return value - (1 << 32) if value & 0x80000000 else value
+
+
+class _ArithmeticBitModel:
+    def __init__(self) -> None:
+        self.bit_0_count = 1
+        self.bit_count = 2
+        self.bit_0_prob = 1 << (BM_LENGTH_SHIFT - 1)
+        self.update_cycle = 4
+        self.bits_until_update = 4
+
+    def update(self) -> None:
+        self.bit_count += self.update_cycle
+        if self.bit_count > BM_MAX_COUNT:
+            self.bit_count = (self.bit_count + 1) >> 1
+            self.bit_0_count = (self.bit_0_count + 1) >> 1
+            if self.bit_0_count == self.bit_count:
+                self.bit_count += 1
+
+        scale = 0x80000000 // self.bit_count
+        self.bit_0_prob = (self.bit_0_count * scale) >> (31 - BM_LENGTH_SHIFT)
+        self.update_cycle = min((5 * self.update_cycle) >> 2, 64)
+        self.bits_until_update = self.update_cycle
+
+
+class _ArithmeticModel:
+    def __init__(self, symbols: int) -> None:
+        self.symbols = symbols
+        self.last_symbol = symbols - 1
+        self.distribution = [0] * symbols
+        self.symbol_count = [1] * symbols
+        self.total_count = 0
+        self.update_cycle = symbols
+        self.update()
+        self.update_cycle = (symbols + 6) >> 1
+        self.symbols_until_update = self.update_cycle
+
+    def update(self) -> None:
+        self.total_count += self.update_cycle
+        if self.total_count > DM_MAX_COUNT:
+            self.total_count = 0
+            for i in range(self.symbols):
+                self.symbol_count[i] = (self.symbol_count[i] + 1) >> 1
+                self.total_count += self.symbol_count[i]
+
+        scale = 0x80000000 // self.total_count
+        cumulative_count = 0
+        for i in range(self.symbols):
+            self.distribution[i] = (scale * cumulative_count) >> (31 - DM_LENGTH_SHIFT)
+            cumulative_count += self.symbol_count[i]
+
+        self.update_cycle = min((5 * self.update_cycle) >> 2, (self.symbols + 6) << 3)
+        self.symbols_until_update = self.update_cycle
+
+
+class _ArithmeticEncoder:
+    def __init__(self) -> None:
+        self.base = 0
+        self.length = AC_MAX_LENGTH
+        self.output = bytearray()
+
+    def encode_bit(self, model: _ArithmeticBitModel, bit: int) -> None:
+        x = model.bit_0_prob * (self.length >> BM_LENGTH_SHIFT)
+        if bit == 0:
+            self.length = x
+            model.bit_0_count += 1
+        else:
+            init_base = self.base
+            self.base = (self.base + x) & U32_MASK
+            self.length -= x
+            if init_base > self.base:
+                self._propagate_carry()
+
+        if self.length < AC_MIN_LENGTH:
+            self._renorm_interval()
+
+        model.bits_until_update -= 1
+        if model.bits_until_update == 0:
+            model.update()
+
+    def encode_symbol(self, model: _ArithmeticModel, symbol: int) -> None:
+        init_base = self.base
+        if symbol == model.last_symbol:
+            x = model.distribution[symbol] * (self.length >> DM_LENGTH_SHIFT)
+            self.base = (self.base + x) & U32_MASK
+            self.length -= x
+        else:
+            self.length >>= DM_LENGTH_SHIFT
+            x = model.distribution[symbol] * self.length
+            self.base = (self.base + x) & U32_MASK
+            self.length = model.distribution[symbol + 1] * self.length - x
+
+        if init_base > self.base:
+            self._propagate_carry()
+        if self.length < AC_MIN_LENGTH:
+            self._renorm_interval()
+
+        model.symbol_count[symbol] += 1
+        model.symbols_until_update -= 1
+        if model.symbols_until_update == 0:
+            model.update()
+
+    def write_bits(self, bits: int, value: int) -> None:
+        if bits > 19:
+            self.write_bits(16, value & 0xFFFF)
+            value >>= 16
+            bits -= 16
+
+        init_base = self.base
+        self.length >>= bits
+        self.base = (self.base + value * self.length) & U32_MASK
+        if init_base > self.base:
+            self._propagate_carry()
+        if self.length < AC_MIN_LENGTH:
+            self._renorm_interval()
+
+    def done(self) -> bytes:
+        init_base = self.base
+        another_byte = True
+        if self.length > 2 * AC_MIN_LENGTH:
+            self.base = (self.base + AC_MIN_LENGTH) & U32_MASK
+            self.length = AC_MIN_LENGTH >> 1
+        else:
+            self.base = (self.base + (AC_MIN_LENGTH >> 1)) & U32_MASK
+            self.length = AC_MIN_LENGTH >> 9
+            another_byte = False
+
+        if init_base > self.base:
+            self._propagate_carry()
+        self._renorm_interval()
+
+        # Zeros to be in sync with the bytes read by the decoder
+        self.output += b"\0\0\0" if another_byte else b"\0\0"
+        return bytes(self.output)
+
+    def _propagate_carry(self) -> None:
+        i = len(self.output) - 1
+        while self.output[i] == 0xFF:
+            self.output[i] = 0
+            i -= 1
+        self.output[i] += 1
+
+    def _renorm_interval(self) -> None:
+        while True:
+            self.output.append(self.base >> 24)
+            self.base = (self.base << 8) & U32_MASK
+            self.length = (self.length << 8) & U32_MASK
+            if self.length >= AC_MIN_LENGTH:
+                break
+
+
+class _ArithmeticDecoder:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+        self.length = AC_MAX_LENGTH
+        self.value = 0
+        for _ in range(4):
+            self.value = (self.value << 8) | self._next_byte()
+
+    def _next_byte(self) -> int:
+        # Reading past the end is not an error for the last bytes
+        # of the stream as they only ever are zeros
+        try:
+            byte = self.data[self.pos]
+        except IndexError:
+            byte = 0
+        self.pos += 1
+        return byte
+
+    def decode_bit(self, model: _ArithmeticBitModel) -> int:
+        x = model.bit_0_prob * (self.length >> BM_LENGTH_SHIFT)
+        if self.value < x:
+            bit = 0
+            self.length = x
+            model.bit_0_count += 1
+        else:
+            bit = 1
+            self.value -= x
+            self.length -= x
+
+        if self.length < AC_MIN_LENGTH:
+            self._renorm_interval()
+
+        model.bits_until_update -= 1
+        if model.bits_until_update == 0:
+            model.update()
+        return bit
+
+    def decode_symbol(self, model: _ArithmeticModel) -> int:
+        y = self.length
+        self.length >>= DM_LENGTH_SHIFT
+
+        # bisection search of the symbol
+        symbol, x, n = 0, 0, model.symbols
+        k = n >> 1
+        while True:
+            z = self.length * model.distribution[k]
+            if z > self.value:
+                n = k
+                y = z
+            else:
+                symbol = k
+                x = z
+            k = (symbol + n) >> 1
+            if k == symbol:
+                break
+
+        self.value -= x
+        self.length = y - x
+
+        if self.length < AC_MIN_LENGTH:
+            self._renorm_interval()
+
+        model.symbol_count[symbol] += 1
+        model.symbols_until_update -= 1
+        if model.symbols_until_update == 0:
+            model.update()
+        return symbol
+
+    def read_bits(self, bits: int) -> int:
+        if bits > 19:
+            low = self.read_bits(16)
+            high = self.read_bits(bits - 16)
+            return (high << 16) | low
+
+        self.length >>= bits
+        value = self.value // self.length
+        self.value -= self.length * value
+        if self.length < AC_MIN_LENGTH:
+            self._renorm_interval()
+        return value
+
+    def _renorm_interval(self) -> None:
+        while True:
+            self.value = ((self.value << 8) & U32_MASK) | self._next_byte()
+            self.length = (self.length << 8) & U32_MASK
+            if self.length >= AC_MIN_LENGTH:
+                break
+
+
+class _IntegerCompressor:
+    """Compresses 32 bits integers as a correction to a predicted value"""
+
+    CORR_BITS = 32
+    CORR_MIN = -(1 << 31)
+
+    def __init__(self, contexts: int, bits_high: int = 8) -> None:
+        self.bits_high = bits_high
+        self.m_bits = [_ArithmeticModel(self.CORR_BITS + 1) for _ in range(contexts)]
+        self.m_corrector_0 = _ArithmeticBitModel()
+        self.m_corrector = [None] + [
+            _ArithmeticModel(1 << min(i, bits_high))
+            for i in range(1, self.CORR_BITS + 1)
+        ]
+
+    def compress(
+        self, encoder: _ArithmeticEncoder, predicted: int, real: int, context: int
+    ) -> None:
+        corr = _as_i32(real - predicted)
+
+        k = (-corr if corr <= 0 else corr - 1).bit_length()
+        encoder.encode_symbol(self.m_bits[context], k)
+        if k == 0:
+            encoder.encode_bit(self.m_corrector_0, corr)
+        elif k < 32:
+            if corr < 0:
+                corr += (1 << k) - 1
+            else:
+                corr -= 1
+
+            if k <= self.bits_high:
+                encoder.encode_symbol(self.m_corrector[k], corr)
+            else:
+                k1 = k - self.bits_high
+                encoder.encode_symbol(self.m_corrector[k], corr >> k1)
+                encoder.write_bits(k1, corr & ((1 << k1) - 1))
+
+    def decompress(
+        self, decoder: _ArithmeticDecoder, predicted: int, context: int
+    ) -> int:
+        k = decoder.decode_symbol(self.m_bits[context])
+        if k == 0:
+            corr = decoder.decode_bit(self.m_corrector_0)
+        elif k < 32:
+            if k <= self.bits_high:
+                corr = decoder.decode_symbol(self.m_corrector[k])
+            else:
+                k1 = k - self.bits_high
+                corr = decoder.decode_symbol(self.m_corrector[k])
+                corr = (corr << k1) | decoder.read_bits(k1)
+
+            if corr >= (1 << (k - 1)):
+                corr += 1
+            else:
+                corr -= (1 << k) - 1
+        else:
+            corr = self.CORR_MIN
+
+        return _as_i32(predicted + corr)
+
+
+def encode_chunk_table(entries: List[ChunkTableEntry], variable_size: bool) -> bytes:
+    """Returns the bytes of the chunk table (version & number of chunks included)"""
+    header = struct.pack("<II", CHUNK_TABLE_VERSION, len(entries))
+    if not entries:
+        return header
+
+    encoder = _ArithmeticEncoder()
+    compressor = _IntegerCompressor(contexts=2)
+    previous = ChunkTableEntry(0, 0)
+    for entry in entries:
+        if variable_size:
+            compressor.compress(encoder, previous.point_count, entry.point_count, 0)
+        compressor.compress(encoder, previous.byte_count, entry.byte_count, 1)
+        previous = entry
+    return header + encoder.done()
+
+
+def decode_chunk_table(
+    data: bytes, number_of_chunks: int, chunk_size: int, point_count: int
+) -> List[ChunkTableEntry]:
+    """Decodes the compressed entries of a chunk table,
+    `data` starts after the version and number of chunks.
+
+    For fixed size chunks, the point count of each entry is deduced
+    from the chunk_size and the total point_count.
+    """
+    variable_size = chunk_size == VARIABLE_CHUNK_SIZE
+    decoder = _ArithmeticDecoder(data)
+    compressor = _IntegerCompressor(contexts=2)
+
+    entries = []
+    previous = ChunkTableEntry(0, 0)
+    points_left = point_count
+    for _ in range(number_of_chunks):
+        if variable_size:
+            chunk_point_count = (
+                compressor.decompress(decoder, previous.point_count, 0) & U32_MASK
+            )
+        else:
+            chunk_point_count = min(chunk_size, max(points_left, 0))
+        byte_count = compressor.decompress(decoder, previous.byte_count, 1) & U32_MASK
+        previous = ChunkTableEntry(chunk_point_count, byte_count)
+        entries.append(previous)
+        points_left -= chunk_point_count
+    return entries
+
+
+def read_offset_to_chunk_table(source: BinaryIO, offset_to_point_data: int) -> int:
+    source.seek(offset_to_point_data, io.SEEK_SET)
+    offset = struct.unpack("<q", source.read(OFFSET_TO_CHUNK_TABLE_SIZE))[0]
+    if offset == -1:
+        # The writer could not go back to write the offset,
+        # it is then stored in the last 8 bytes of the file
+        source.seek(-OFFSET_TO_CHUNK_TABLE_SIZE, io.SEEK_END)
+        offset = struct.unpack("<q", source.read(OFFSET_TO_CHUNK_TABLE_SIZE))[0]
+    return offset
+
+
+def read_chunk_table(
+    source: BinaryIO, offset_to_point_data: int, chunk_size: int, point_count: int
+) -> List[ChunkTableEntry]:
+    """Reads the chunk table of a LAZ file, the position of the source is restored.
+
+    Raises
+    ------
+    LazError if the file has no valid chunk table
+    """
+    position = source.tell()
+    try:
+        offset = read_offset_to_chunk_table(source, offset_to_point_data)
+        if offset <= offset_to_point_data:
+            raise LazError("The file does not have a chunk table")
+
+        source.seek(offset, io.SEEK_SET)
+        header = source.read(8)
+        if len(header) != 8:
+            raise LazError("The chunk table is truncated")
+        version, number_of_chunks = struct.unpack("<II", header)
+        if version != CHUNK_TABLE_VERSION:
+            raise LazError(f"Unknown chunk table version {version}")
+
+        # Each entry takes at most a few bytes, this is an upper bound
+        entries_data = source.read(16 * number_of_chunks + 16)
+        entries = decode_chunk_table(
+            entries_data, number_of_chunks, chunk_size, point_count
+        )
+    finally:
+        source.seek(position, io.SEEK_SET)
+
+    return entries
+
+
+def write_chunk_table(
+    dest: BinaryIO, entries: List[ChunkTableEntry], variable_size: bool
+) -> None:
+    dest.write(encode_chunk_table(entries, variable_size))
+
+
+def chunk_starts(
+    entries: List[ChunkTableEntry], offset_to_point_data: int
+) -> np.ndarray:
+    """Returns the absolute byte position of the start of each chunk,
+    plus the position of the end of the last chunk.
+    """
+    byte_counts = np.array([e.byte_count for e in entries], np.uint64)
+    starts = np.zeros(len(entries) + 1, np.uint64)
+    np.cumsum(byte_counts, out=starts[1:])
+    starts += np.uint64(offset_to_point_data + OFFSET_TO_CHUNK_TABLE_SIZE)
+    return starts
+
+
+def first_point_of_chunks(entries: List[ChunkTableEntry]) -> np.ndarray:
+    """Returns the index of the first point of each chunk,
+    plus the total number of points
+    """
+    first_points = np.zeros(len(entries) + 1, np.int64)
+    np.cumsum([e.point_count for e in entries], out=first_points[1:])
+    return first_points
+
+
+def chunk_table_or_none(
+    source: BinaryIO, offset_to_point_data: int, chunk_size: int, point_count: int
+) -> Optional[List[ChunkTableEntry]]:
+    try:
+        return read_chunk_table(source, offset_to_point_data, chunk_size, point_count)
+    except (LazError, struct.error):
+        return None
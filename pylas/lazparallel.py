@@ -0,0 +1,249 @@
+""" Decompression of LAZ points using multiple independent decompressors.
+
+The chunk table of the file is read once, chunks are then grouped into
+contiguous ranges that are each decompressed by a worker of an executor
+(a thread pool or a process pool).
+
+Each worker receives a small, self-contained LAZ point stream made of
+its chunks and a chunk table describing only these chunks,
+so that any backend can decompress it without knowing about the rest of the file.
+"""
+import collections
+import concurrent.futures
+import copy
+import io
+import os
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from .compression import LazBackend
+from .errors import LazError
+from .header import LasHeader
+from .lazchunktable import (
+    ChunkTableEntry,
+    OFFSET_TO_CHUNK_TABLE_SIZE,
+    chunk_starts,
+    encode_chunk_table,
+    first_point_of_chunks,
+)
+from .vlrs.known import LasZipVlr, VARIABLE_CHUNK_SIZE
+
+try:
+    import lazrs
+except ModuleNotFoundError:
+    pass
+
+try:
+    import laszip
+except ModuleNotFoundError:
+    pass
+
+#: Number of tasks created per worker, having more tasks
+#: than workers helps balancing the work when chunks do not
+#: take the same time to decompress
+TASKS_PER_WORKER = 4
+#: Maximum number of chunks decompressed by one task,
+#: bounds the memory used by a task on large files
+MAX_CHUNKS_PER_TASK = 8
+
+
+def decompress_chunks(
+    backend: LazBackend,
+    laszip_vlr_data: bytes,
+    header_data: bytes,
+    compressed_chunks: bytes,
+    entries: List[ChunkTableEntry],
+    variable_size: bool,
+    point_size: int,
+) -> bytearray:
+    """Decompresses a contiguous range of chunks.
+
+    This is the function that runs in the workers, so it only takes
+    and returns picklable objects. It is also used to decompress
+    single chunks of files with variable-size chunks.
+
+    header_data is only needed by the laszip backend, it has to be the bytes
+    of a header (with its vlrs) of a file containing exactly the points
+    of the chunks.
+    """
+    point_count = sum(entry.point_count for entry in entries)
+    points_data = bytearray(point_count * point_size)
+    if point_count == 0:
+        return points_data
+
+    offset_to_chunk_table = (
+        len(header_data) + OFFSET_TO_CHUNK_TABLE_SIZE + len(compressed_chunks)
+    )
+    with io.BytesIO() as stream:
+        stream.write(header_data)
+        stream.write(offset_to_chunk_table.to_bytes(8, "little", signed=True))
+        stream.write(compressed_chunks)
+        stream.write(encode_chunk_table(entries, variable_size))
+
+        if backend == LazBackend.Laszip:
+            stream.seek(0, io.SEEK_SET)
+            unzipper = laszip.LasUnZipper(stream)
+            unzipper.decompress_into(points_data)
+        else:
+            lazrs.decompress_points(
+                stream.getvalue(), laszip_vlr_data, points_data, False
+            )
+
+    return points_data
+
+
+def laszip_header_data(
+    header: LasHeader, laszip_vlr: LasZipVlr, point_count: int
+) -> bytes:
+    """Returns the bytes of a header describing a LAZ file that only
+    contains `point_count` points and no EVLRs
+    """
+    header = copy.deepcopy(header)
+    header.vlrs.append(laszip_vlr)
+    header.point_count = point_count
+    header.start_of_first_evlr = 0
+    header.number_of_evlrs = 0
+    header.are_points_compressed = True
+    with io.BytesIO() as out:
+        header.write_to(out)
+        return out.getvalue()
+
+
+def partition_chunks(number_of_chunks: int, num_workers: int) -> List[Tuple[int, int]]:
+    """Splits the chunks into contiguous [start, stop) ranges,
+    each range is decompressed by one task
+
+    >>> partition_chunks(10, 1)
+    [(0, 3), (3, 6), (6, 9), (9, 10)]
+    >>> partition_chunks(2, 4)
+    [(0, 1), (1, 2)]
+    >>> len(partition_chunks(1000, 2))
+    125
+    >>> partition_chunks(0, 4)
+    []
+    """
+    number_of_tasks = max(1, num_workers) * TASKS_PER_WORKER
+    chunks_per_task = -(-number_of_chunks // number_of_tasks)
+    chunks_per_task = max(1, min(chunks_per_task, MAX_CHUNKS_PER_TASK))
+    return [
+        (start, min(start + chunks_per_task, number_of_chunks))
+        for start in range(0, number_of_chunks, chunks_per_task)
+    ]
+
+
+def decoding_backend(backend: LazBackend) -> LazBackend:
+    """Returns the backend used by the workers to decompress chunks,
+    each worker decompress its chunks in a single thread.
+    """
+    if backend == LazBackend.LazrsParallel:
+        return LazBackend.Lazrs
+    return backend
+
+
+def iter_decompressed_chunks(
+    source: BinaryIO,
+    header: LasHeader,
+    laszip_vlr: LasZipVlr,
+    entries: List[ChunkTableEntry],
+    backend: LazBackend,
+    num_workers: Optional[int] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+    ordered: bool = True,
+) -> Iterator[Tuple[int, int, memoryview]]:
+    """Decompresses the chunks of a LAZ file using multiple workers.
+
+    Yields, for each chunk, a tuple of (chunk index, index of the first point
+    of the chunk, decompressed points bytes).
+
+    The compressed bytes are read from the source by the caller's thread, the
+    position of the source is restored before each yield.
+
+    Parameters
+    ----------
+    source: the (seekable) LAZ file
+    header: the header of the file, it should not contain the LasZipVlr
+    laszip_vlr: the LasZipVlr of the file
+    entries: the chunk table of the file
+    backend: the backend used to decompress
+    num_workers: number of workers, defaults to os.cpu_count()
+    executor: optional, the executor to submit the work to. If None, a
+        ThreadPoolExecutor is created and shut down once the iteration is over
+    ordered: if True, the chunks are yielded in the order they appear in the file,
+        otherwise they are yielded as soon as their decompression is done.
+    """
+    if not source.seekable():
+        raise LazError("The source must be seekable to decompress chunks in parallel")
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, num_workers)
+    backend = decoding_backend(backend)
+    variable_size = laszip_vlr.chunk_size == VARIABLE_CHUNK_SIZE
+    point_size = header.point_format.size
+
+    starts = chunk_starts(entries, header.offset_to_point_data)
+    first_points = first_point_of_chunks(entries)
+    tasks = collections.deque(partition_chunks(len(entries), num_workers))
+    # Bound the number of tasks submitted at once
+    # to bound the memory used by compressed & decompressed chunks
+    max_in_flight = 2 * num_workers
+
+    owns_executor = executor is None
+    if owns_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_workers)
+
+    def submit(chunk_range: Tuple[int, int]) -> concurrent.futures.Future:
+        first, last = chunk_range
+        position = source.tell()
+        try:
+            source.seek(int(starts[first]), io.SEEK_SET)
+            compressed_chunks = source.read(int(starts[last] - starts[first]))
+        finally:
+            source.seek(position, io.SEEK_SET)
+
+        task_entries = entries[first:last]
+        if backend == LazBackend.Laszip:
+            header_data = laszip_header_data(
+                header, laszip_vlr, sum(e.point_count for e in task_entries)
+            )
+        else:
+            header_data = b""
+        return executor.submit(
+            decompress_chunks,
+            backend,
+            bytes(laszip_vlr.record_data),
+            header_data,
+            compressed_chunks,
+            task_entries,
+            variable_size,
+            point_size,
+        )
+
+    def split(
+        chunk_range: Tuple[int, int], points_data: bytearray
+    ) -> Iterator[Tuple[int, int, memoryview]]:
+        first, last = chunk_range
+        points_data = memoryview(points_data)
+        for chunk_index in range(first, last):
+            begin = int(first_points[chunk_index] - first_points[first]) * point_size
+            end = int(first_points[chunk_index + 1] - first_points[first]) * point_size
+            yield chunk_index, int(first_points[chunk_index]), points_data[begin:end]
+
+    # future -> chunk range, in submission order
+    pending = collections.OrderedDict()
+    try:
+        while tasks or pending:
+            while tasks and len(pending) < max_in_flight:
+                chunk_range = tasks.popleft()
+                pending[submit(chunk_range)] = chunk_range
+
+            if ordered:
+                done = next(iter(pending))
+            else:
+                done = next(concurrent.futures.as_completed(pending))
+            chunk_range = pending.pop(done)
+            yield from split(chunk_range, done.result())
+    finally:
+        for future in pending:
+            future.cancel()
+        if owns_executor:
+            executor.shutdown(wait=True)
@@ -0,0 +1,440 @@
+""" Lazy, partitioned, arrays over the dimensions of a LAS/LAZ file
+"""
+import concurrent.futures
+import contextlib
+import operator
+import threading
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .compression import LazBackend
+from .errors import PylasError
+from .lasreader import LasReader
+from .lib import open_las
+from .point import record
+from .typehints import PathLike
+
+try:
+    import dask
+    import dask.array
+except ModuleNotFoundError:
+    pass
+
+#: Default number of points of a partition, for LAZ files,
+#: partitions are made of whole chunks and may be a bit bigger.
+DEFAULT_PARTITION_SIZE = 1_000_000
+
+#: Function computing the values of a lazy array for one partition
+#: from the values of the dimensions it needs
+PartitionFunction = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+
+def partition_starts(
+    reader: LasReader, partition_size: int = DEFAULT_PARTITION_SIZE
+) -> np.ndarray:
+    """Index of the first point of each partition, plus the point count.
+
+    Partitions of LAZ files are aligned to chunks, so that each partition
+    is decompressed independently of the others.
+
+    >>> import pylas
+    >>> with pylas.open("pylastests/simple.las") as reader:
+    ...     partition_starts(reader, 500)
+    array([   0,  500, 1000, 1065])
+    """
+    if partition_size <= 0:
+        raise ValueError("partition_size must be greater than 0")
+    point_count = reader.header.point_count
+    if not reader.header.are_points_compressed:
+        starts = np.arange(0, point_count, partition_size, dtype=np.int64)
+        return np.append(starts, np.int64(point_count))
+
+    chunk_starts = reader._first_point_of_chunks()
+    starts = [0]
+    for chunk_start in chunk_starts[1:-1]:
+        if chunk_start - starts[-1] >= partition_size:
+            starts.append(int(chunk_start))
+    starts.append(point_count)
+    return np.array(starts, np.int64)
+
+
+class LazyLasData:
+    """Dimensions of a LAS/LAZ file as lazy arrays (see :class:`.LazyArray`),
+    the points are only read when values are computed.
+
+    Use :func:`.lazy_open` to create one.
+
+    The points are split into partitions (ranges of points, made of whole
+    chunks for LAZ files), each partition is read by its own reader,
+    only the fields needed are kept, and partitions are computed in parallel
+    by a pool of `max_workers` threads.
+
+    >>> with lazy_open("pylastests/simple.las", partition_size=500) as las:
+    ...     print(las.npartitions, las.z.max(), (las.classification == 2).sum())
+    3 586.38 276
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+        partition_size: int = DEFAULT_PARTITION_SIZE,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.laz_backend = laz_backend
+        self.max_workers = max_workers
+        self._idle_readers: List[LasReader] = []
+        self._lock = threading.Lock()
+        with self._reader() as reader:
+            self.header = reader.header
+            self.starts = partition_starts(reader, partition_size)
+
+    @property
+    def point_format(self):
+        return self.header.point_format
+
+    @property
+    def npartitions(self) -> int:
+        return len(self.starts) - 1
+
+    @property
+    def dimension_names(self) -> List[str]:
+        """Names of the dimensions, x, y, z being the scaled coordinates"""
+        return ["x", "y", "z"] + list(self.point_format.dimension_names)
+
+    def __len__(self) -> int:
+        return self.header.point_count
+
+    def __getattr__(self, item: str) -> "LazyArray":
+        if item.startswith("_"):
+            raise AttributeError(item)
+        try:
+            return self[item]
+        except PylasError:
+            raise AttributeError(item) from None
+
+    def __getitem__(self, name: str) -> "LazyArray":
+        if name not in self.dimension_names:
+            raise PylasError(
+                f"Point format {self.point_format} has no dimension {name}"
+            )
+        return LazyArray(self, (name,), operator.itemgetter(name))
+
+    @contextlib.contextmanager
+    def _reader(self) -> Iterator[LasReader]:
+        """Returns a reader not used by other threads, readers are reused"""
+        with self._lock:
+            reader = self._idle_readers.pop() if self._idle_readers else None
+        if reader is None:
+            reader = open_las(self.path, laz_backend=self.laz_backend)
+        try:
+            yield reader
+        except BaseException:
+            reader.close()
+            raise
+        else:
+            with self._lock:
+                self._idle_readers.append(reader)
+
+    def read_partition(
+        self, index: int, dimensions: Optional[Sequence[str]] = None
+    ) -> record.ScaleAwarePointRecord:
+        """Reads the points of a partition, only the fields needed by
+        the dimensions are kept if they are given
+        """
+        if not 0 <= index < self.npartitions:
+            raise IndexError(f"Partition index {index} out of range")
+        start, stop = int(self.starts[index]), int(self.starts[index + 1])
+        with self._reader() as reader:
+            reader.seek(start)
+            points = reader.read_points(stop - start, dimensions)
+        if points is None:
+            points = self._empty_points()
+        return points
+
+    def _empty_points(self) -> record.ScaleAwarePointRecord:
+        return record.ScaleAwarePointRecord(
+            np.zeros(0, self.point_format.dtype()),
+            self.point_format,
+            self.header.scales,
+            self.header.offsets,
+        )
+
+    def map_partitions(self, func: Callable[[int], Any]) -> List[Any]:
+        """Calls func(partition_index) for each partition, in parallel,
+        and returns the results in the order of the partitions
+        """
+        if self.max_workers == 1 or self.npartitions <= 1:
+            return [func(i) for i in range(self.npartitions)]
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            return list(executor.map(func, range(self.npartitions)))
+
+    def close(self) -> None:
+        """Closes the readers"""
+        with self._lock:
+            for reader in self._idle_readers:
+                reader.close()
+            self._idle_readers.clear()
+
+    def __enter__(self) -> "LazyLasData":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<LazyLasData({self.path}, {len(self)} points,"
+            f" {self.npartitions} partitions)>"
+        )
+
+
+class LazyArray:
+    """A one dimensional (or two for array extra bytes) array whose values
+    are computed partition by partition, only when requested.
+
+    Element-wise arithmetic & comparisons with numbers or other lazy arrays
+    of the same file are lazy too, reductions (:meth:`.min`, :meth:`.max`,
+    :meth:`.sum`, :meth:`.mean`, :meth:`.histogram`) reduce each partition
+    in parallel and then combine the results, :meth:`.compute` returns
+    the whole array.
+    """
+
+    def __init__(
+        self,
+        las: LazyLasData,
+        dimensions: Tuple[str, ...],
+        func: PartitionFunction,
+    ) -> None:
+        self.las = las
+        #: Names of the dimensions needed to compute the array
+        self.dimensions = dimensions
+        self.func = func
+        self._meta: Optional[np.ndarray] = None
+
+    @property
+    def npartitions(self) -> int:
+        return self.las.npartitions
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._empty().dtype
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (len(self.las),) + self._empty().shape[1:]
+
+    def __len__(self) -> int:
+        return len(self.las)
+
+    def _empty(self) -> np.ndarray:
+        """The (empty) result of the function for no points, to know its dtype"""
+        if self._meta is None:
+            self._meta = self._apply(self.las._empty_points())
+        return self._meta
+
+    def _apply(self, points: record.PackedPointRecord) -> np.ndarray:
+        return np.asarray(
+            self.func({name: np.asarray(points[name]) for name in self.dimensions})
+        )
+
+    def partition(self, index: int) -> np.ndarray:
+        """Computes the values of one partition"""
+        return self._apply(self.las.read_partition(index, self.dimensions))
+
+    def map_partitions(self, func: Callable[[np.ndarray], Any]) -> List[Any]:
+        """Returns the results of func applied to the values of each partition,
+        partitions are computed in parallel.
+        """
+        return self.las.map_partitions(lambda i: func(self.partition(i)))
+
+    def compute(self) -> np.ndarray:
+        """Computes and returns all the values"""
+        parts = self.map_partitions(lambda values: values)
+        if not parts:
+            return self._empty()
+        return np.concatenate(parts)
+
+    def __array__(self, dtype=None) -> np.ndarray:
+        return np.asarray(self.compute(), dtype=dtype)
+
+    def _reduce(self, partition_reduction, combine, empty_error: bool = True):
+        results = [
+            r
+            for r in self.map_partitions(
+                lambda values: partition_reduction(values) if len(values) else None
+            )
+            if r is not None
+        ]
+        if not results:
+            if empty_error:
+                raise ValueError("zero-size array to reduction operation")
+            return combine([partition_reduction(self._empty())])
+        return combine(results)
+
+    def min(self):
+        return self._reduce(lambda v: v.min(axis=0), lambda r: np.min(r, axis=0))
+
+    def max(self):
+        return self._reduce(lambda v: v.max(axis=0), lambda r: np.max(r, axis=0))
+
+    def sum(self):
+        return self._reduce(
+            lambda v: v.sum(axis=0), lambda r: np.sum(r, axis=0), empty_error=False
+        )
+
+    def mean(self):
+        sums_and_counts = self._reduce(
+            lambda v: (v.sum(axis=0, dtype=np.float64), len(v)), list
+        )
+        total = np.sum([s for s, _ in sums_and_counts], axis=0)
+        return total / sum(c for _, c in sums_and_counts)
+
+    def histogram(
+        self, bins: Union[int, Sequence[float]] = 10, range=None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Same as numpy.histogram, if `range` is not given and `bins`
+        is a number, the min & max are computed first (one more pass)
+        """
+        if range is None and np.ndim(bins) == 0:
+            range = (self.min(), self.max())
+        _, edges = np.histogram(self._empty(), bins=bins, range=range)
+        counts = self.map_partitions(lambda v: np.histogram(v, bins=edges)[0])
+        return np.sum(counts, axis=0, dtype=np.int64), edges
+
+    def to_dask(self) -> "dask.array.Array":
+        """Returns a dask array with one block per partition (requires dask)"""
+        try:
+            delayed, from_delayed = dask.delayed, dask.array.from_delayed
+        except NameError:
+            raise PylasError(
+                "dask is needed to create dask arrays, install it with 'pip install dask'"
+            ) from None
+        meta = self._empty()
+        blocks = [
+            from_delayed(
+                delayed(self.partition)(i),
+                shape=(int(stop - start),) + meta.shape[1:],
+                dtype=meta.dtype,
+            )
+            for i, (start, stop) in enumerate(
+                zip(self.las.starts[:-1], self.las.starts[1:])
+            )
+        ]
+        return dask.array.concatenate(blocks) if blocks else dask.array.from_array(meta)
+
+    def _combine(self, other, op, reflected: bool = False) -> "LazyArray":
+        if isinstance(other, LazyArray):
+            if other.las is not self.las:
+                raise PylasError("Cannot combine lazy arrays of different files")
+            dimensions = self.dimensions + tuple(
+                d for d in other.dimensions if d not in self.dimensions
+            )
+            left, right = self.func, other.func
+        else:
+            dimensions = self.dimensions
+            left, right = self.func, lambda values: other
+
+        if reflected:
+            left, right = right, left
+        return LazyArray(
+            self.las, dimensions, lambda values: op(left(values), right(values))
+        )
+
+    def __add__(self, other):
+        return self._combine(other, operator.add)
+
+    def __radd__(self, other):
+        return self._combine(other, operator.add, reflected=True)
+
+    def __sub__(self, other):
+        return self._combine(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self._combine(other, operator.sub, reflected=True)
+
+    def __mul__(self, other):
+        return self._combine(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self._combine(other, operator.mul, reflected=True)
+
+    def __truediv__(self, other):
+        return self._combine(other, operator.truediv)
+
+    def __rtruediv__(self, other):
+        return self._combine(other, operator.truediv, reflected=True)
+
+    def __and__(self, other):
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other):
+        return self._combine(other, operator.or_)
+
+    def __eq__(self, other):
+        return self._combine(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._combine(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._combine(other, operator.lt)
+
+    def __le__(self, other):
+        return self._combine(other, operator.le)
+
+    def __gt__(self, other):
+        return self._combine(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._combine(other, operator.ge)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<LazyArray({', '.join(self.dimensions)}, shape: {self.shape},"
+            f" dtype: {self.dtype}, {self.npartitions} partitions)>"
+        )
+
+
+def lazy_open(
+    path: PathLike,
+    laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+    partition_size: int = DEFAULT_PARTITION_SIZE,
+    max_workers: Optional[int] = None,
+) -> LazyLasData:
+    """Opens a LAS/LAZ file to compute on its dimensions as lazy arrays,
+    without loading all the points in memory.
+
+    >>> import pylas
+    >>> with pylas.lazy_open("pylastests/simple.las") as las:
+    ...     counts, edges = las.classification.histogram(bins=[0, 1, 2, 3])
+    >>> counts
+    array([  0, 789, 276])
+
+    Parameters
+    ----------
+    path: path to the file
+    laz_backend: optional, the LAZ backend(s) to use
+    partition_size: number of points of the partitions,
+        the maximum number of points in memory is around
+        partition_size * max_workers
+    max_workers: number of threads computing partitions,
+        (ThreadPoolExecutor's default if None)
+    """
+    return LazyLasData(path, laz_backend, partition_size, max_workers)
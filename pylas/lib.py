@@ -15,6 +15,7 @@ from .lasappender import LasAppender
 from .lasdata import LasData
 from .lasmmap import LasMMAP
 from .lasreader import LasReader
+from .lax import LaxIndex, lax_path
 from .laswriter import LasWriter
 from .point import dims, record, PointFormat
 
@@ -28,6 +29,7 @@ def open_las(
     laz_backend=None,
     header=None,
     do_compress=None,
+    **writer_options,
 ) -> Union[LasReader, LasWriter, LasAppender]:
     """The pylas.open opens a LAS/LAZ file in one of the 3 supported
     mode:
@@ -89,7 +91,21 @@ def open_las(
         Whether the stream/file object shall be closed, this only work
         when using open_las in a with statement. An exception is raised if
         closefd is specified and the source is a filename
+
+    writer_options: optional, only meaningful in writing mode, the other
+        keyword arguments of :class:`pylas.LasWriter` (queue_size, buffer_size,
+        trust_header, chunk_size, variable_chunk_size)
+
+    When opening a file in read mode using its path, the LAX spatial index
+    (same path with the .lax extension) is loaded if it exists,
+    see :attr:`.LasReader.spatial_index`.
     """
+    if writer_options and mode != "w":
+        raise PylasError(
+            f"{', '.join(writer_options)} argument(s) only used when opening "
+            "in write mode, did you meant to open in write mode ?"
+        )
+
     if mode == "r":
         if header is not None:
             raise PylasError(
@@ -107,7 +123,10 @@ def open_las(
             stream = io.BytesIO(source)
         else:
             stream = source
-        return LasReader(stream, closefd=closefd, laz_backend=laz_backend)
+        reader = LasReader(stream, closefd=closefd, laz_backend=laz_backend)
+        if isinstance(source, (str, Path)):
+            reader.spatial_index = _read_lax_of(source)
+        return reader
     elif mode == "w":
         if header is None:
             raise ValueError("A header is needed when opening a file for writing")
@@ -128,6 +147,7 @@ def open_las(
             do_compress=do_compress,
             laz_backend=laz_backend,
             closefd=closefd,
+            **writer_options,
         )
     elif mode == "a":
         if isinstance(source, (str, Path)):
@@ -142,7 +162,20 @@ def open_las(
         raise ValueError(f"Unknown mode '{mode}'")
 
 
-def read_las(source, closefd=True, laz_backend=LazBackend.detect_available()):
+def _read_lax_of(las_path: Union[str, Path]) -> Optional[LaxIndex]:
+    path = lax_path(las_path)
+    if not path.is_file():
+        return None
+    try:
+        return LaxIndex.read_from(path)
+    except PylasError as e:
+        logger.warning(f"Ignoring the spatial index {path}: {e}")
+        return None
+
+
+def read_las(
+    source, closefd=True, laz_backend=LazBackend.detect_available(), num_workers=None
+):
     """Entry point for reading las data in pylas
 
     Reads the whole file into memory.
@@ -164,6 +197,10 @@ def read_las(source, closefd=True, laz_backend=LazBackend.detect_available()):
             if True and the source is a stream, the function will close it
             after it is done reading
 
+    num_workers: Optional, int
+            If given and the file is a LAZ file, its chunks are decompressed
+            in parallel by this number of workers, see :meth:`.LasReader.read`
+
 
     Returns
     -------
@@ -171,12 +208,21 @@ def read_las(source, closefd=True, laz_backend=LazBackend.detect_available()):
         The object you can interact with to get access to the LAS points & VLRs
     """
     with open_las(source, closefd=closefd, laz_backend=laz_backend) as reader:
-        return reader.read()
+        return reader.read(num_workers=num_workers)
+
 
+def mmap_las(filename, mode: str = "r+", advice: Optional[str] = None):
+    """MMap a file, much like laspy did
 
-def mmap_las(filename):
-    """MMap a file, much like laspy did"""
-    return LasMMAP(filename)
+    Parameters
+    ----------
+    filename: path of the LAS file
+    mode: "r+" (default) to modify the file, "r" for read-only access
+        or "c" for copy-on-write, see :class:`.LasMMAP`
+    advice: optional, hint on how the points will be accessed,
+        "sequential", "random", "willneed"..., see :meth:`.LasMMAP.advise`
+    """
+    return LasMMAP(filename, mode=mode, advice=advice)
 
 
 def create_las(
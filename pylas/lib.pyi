@@ -30,6 +30,11 @@ def open_las(
     header: LasHeader,
     do_compress: Optional[bool] = ...,
     laz_backend: Union[LazBackend, Iterable[LazBackend]] = ...,
+    queue_size: int = ...,
+    buffer_size: int = ...,
+    trust_header: bool = ...,
+    chunk_size: Optional[int] = ...,
+    variable_chunk_size: bool = ...,
 ) -> LasWriter: ...
 @overload
 def open_las(
@@ -39,6 +44,11 @@ def open_las(
     do_compress: Optional[bool] = ...,
     closefd: bool = ...,
     laz_backend: Union[LazBackend, Iterable[LazBackend]] = ...,
+    queue_size: int = ...,
+    buffer_size: int = ...,
+    trust_header: bool = ...,
+    chunk_size: Optional[int] = ...,
+    variable_chunk_size: bool = ...,
 ) -> LasWriter: ...
 @overload
 def open_las(
@@ -59,8 +69,11 @@ def read_las(
     laz_backend: Union[
         LazBackend, Iterable[LazBackend]
     ] = LazBackend.detect_available(),
+    num_workers: Optional[int] = ...,
 ) -> LasData: ...
-def mmap_las(filename: PathLike) -> LasMMAP: ...
+def mmap_las(
+    filename: PathLike, mode: str = "r+", advice: Optional[str] = None
+) -> LasMMAP: ...
 def merge_las(las_files: Union[Iterable[LasData], LasData]) -> LasData: ...
 def create_las(
     *, point_format: Union[int, PointFormat] = 0, file_version: Optional[str] = 0
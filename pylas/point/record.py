@@ -4,9 +4,10 @@ The PointRecord classes provide a few extra things to manage these arrays
 in the context of Las point data
 """
 import logging
-from typing import NoReturn
+from typing import NoReturn, Iterable, List
 
 import numpy as np
+from numpy.lib import recfunctions
 
 from . import dims
 from .dims import ScaledArrayView
@@ -42,6 +43,46 @@ def raise_not_enough_bytes_error(
     )
 
 
+def fields_of_dimensions(
+    point_format: PointFormat, dimensions: Iterable[str]
+) -> List[str]:
+    """Returns the names of the fields of the point format dtype
+    that have to be kept to be able to access the requested dimensions.
+
+    The names are returned in the order the fields appear in a point.
+
+    >>> fields_of_dimensions(PointFormat(3), ["classification", "x", "gps_time", "X"])
+    ['X', 'raw_classification', 'gps_time']
+    """
+    sub_fields_dict = dims.get_sub_fields_dict(point_format.id)
+    wanted_fields = set()
+    for dimension in dimensions:
+        if dimension in ("x", "y", "z"):
+            dimension = dimension.upper()
+        try:
+            wanted_fields.add(sub_fields_dict[dimension][0])
+        except KeyError:
+            point_format.dimension_by_name(dimension)
+            wanted_fields.add(dimension)
+
+    return [name for name in point_format.dtype().names if name in wanted_fields]
+
+
+def projected_dtype(dtype: np.dtype, fields: List[str]) -> np.dtype:
+    """Returns the compact dtype of the points projected on the fields"""
+    return recfunctions.repack_fields(dtype[fields])
+
+
+def project_points(points: np.ndarray, fields: List[str]) -> np.ndarray:
+    """Returns a new compact array that only contains the requested fields
+    of the points.
+
+    The fields are extracted from a strided view of the input, so the input
+    (which may be the raw buffer read from the file) is not copied as a whole.
+    """
+    return recfunctions.repack_fields(points[fields])
+
+
 class PackedPointRecord:
     """
     In the PackedPointRecord, fields that are a combinations of many sub-fields (fields stored on less than a byte)
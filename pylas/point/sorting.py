@@ -0,0 +1,237 @@
+""" Sorting of points along space filling curves (Morton, Hilbert)
+or by the values of dimensions (gps_time, ...)
+"""
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from .record import PackedPointRecord
+
+#: Orders that follow a space filling curve, the others are dimension names
+SPACE_FILLING_CURVES = ("morton", "hilbert")
+
+#: Number of bits of each coordinate in the keys of a curve,
+#: for 2 and 3 dimensions, so that keys fit in an uint64
+BITS_PER_COORDINATE = {2: 32, 3: 21}
+
+#: An order, a space filling curve, a dimension name or a list of dimension names
+Order = Union[str, Sequence[str]]
+
+
+def _spread_bits(values: np.ndarray, dimensions: int) -> np.ndarray:
+    """Inserts dimensions - 1 zero bits between the bits of the values,
+    the values must fit in BITS_PER_COORDINATE[dimensions] bits
+    """
+    v = values.astype(np.uint64)
+    if dimensions == 2:
+        masks = (
+            (16, 0x0000FFFF0000FFFF),
+            (8, 0x00FF00FF00FF00FF),
+            (4, 0x0F0F0F0F0F0F0F0F),
+            (2, 0x3333333333333333),
+            (1, 0x5555555555555555),
+        )
+    else:
+        masks = (
+            (32, 0x001F00000000FFFF),
+            (16, 0x001F0000FF0000FF),
+            (8, 0x100F00F00F00F00F),
+            (4, 0x10C30C30C30C30C3),
+            (2, 0x1249249249249249),
+        )
+    for shift, mask in masks:
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+def _interleave(coordinates: List[np.ndarray]) -> np.ndarray:
+    """Interleaves the bits of the coordinates, the bits of the
+    first coordinate being the least significant of each group
+    """
+    dimensions = len(coordinates)
+    keys = np.zeros(len(coordinates[0]), np.uint64)
+    for i, values in enumerate(coordinates):
+        keys |= _spread_bits(values, dimensions) << np.uint64(i)
+    return keys
+
+
+def _normalized_coordinates(
+    coordinates: Sequence[np.ndarray],
+    bits: int,
+    mins: Optional[Sequence[int]] = None,
+    maxs: Optional[Sequence[int]] = None,
+) -> List[np.ndarray]:
+    """Returns the coordinates minus their minimum, shifted right
+    by the same number of bits so that all of them fit in `bits` bits.
+
+    When mins and maxs are given, they are used instead of the bounds
+    of the coordinates (which are clipped to them).
+    """
+    if mins is None or maxs is None:
+        mins = [c.min() for c in coordinates]
+        maxs = [c.max() for c in coordinates]
+    mins = [int(m) for m in mins]
+    maxs = [max(int(m), int(n)) for m, n in zip(maxs, mins)]
+    ranges = [m - n for m, n in zip(maxs, mins)]
+    shift = np.uint64(max(0, max(ranges).bit_length() - bits))
+    return [
+        (np.clip(c.astype(np.int64), n, m) - n).astype(np.uint64) >> shift
+        for c, n, m in zip(coordinates, mins, maxs)
+    ]
+
+
+def morton_keys(
+    *coordinates: np.ndarray,
+    mins: Optional[Sequence[int]] = None,
+    maxs: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """Returns the keys of the points (2D or 3D) along the Morton (Z-order) curve.
+
+    Coordinates should be the raw integers (X, Y and maybe Z), the keys are
+    computed on the coordinates relative to their minimum, shifted so that they
+    fit in :const:`BITS_PER_COORDINATE` bits.
+
+    Keys of different sets of points can only be compared if they are computed
+    with the same `mins` and `maxs` (e.g. the raw bounds of the file).
+
+    >>> morton_keys(np.array([0, 1, 0, 1]), np.array([0, 0, 1, 1]))
+    array([0, 1, 2, 3], dtype=uint64)
+    """
+    bits = _bits_per_coordinate(coordinates)
+    return _interleave(_normalized_coordinates(coordinates, bits, mins, maxs))
+
+
+def hilbert_keys(
+    *coordinates: np.ndarray,
+    mins: Optional[Sequence[int]] = None,
+    maxs: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """Returns the keys of the points (2D or 3D) along the Hilbert curve,
+    consecutive keys are neighbour cells.
+
+    Coordinates are normalized as for :func:`.morton_keys`, the keys are computed
+    with Skilling's algorithm ("Programming the Hilbert curve", 2004),
+    applied to all the points at once.
+
+    >>> hilbert_keys(np.array([0, 1, 1, 0]), np.array([0, 0, 1, 1]))
+    array([0, 1, 2, 3], dtype=uint64)
+    """
+    bits = _bits_per_coordinate(coordinates)
+    x = _normalized_coordinates(coordinates, bits, mins, maxs)
+    dimensions = len(x)
+
+    # Inverse undo
+    q = 1 << (bits - 1)
+    while q > 1:
+        p = np.uint64(q - 1)
+        is_set = (x[0] & np.uint64(q)) != 0
+        x[0] = np.where(is_set, x[0] ^ p, x[0])
+        for i in range(1, dimensions):
+            is_set = (x[i] & np.uint64(q)) != 0
+            t = (x[0] ^ x[i]) & p
+            t[is_set] = 0
+            x[0] = np.where(is_set, x[0] ^ p, x[0] ^ t)
+            x[i] ^= t
+        q >>= 1
+
+    # Gray encode
+    for i in range(1, dimensions):
+        x[i] ^= x[i - 1]
+    t = np.zeros_like(x[0])
+    q = 1 << (bits - 1)
+    while q > 1:
+        is_set = (x[dimensions - 1] & np.uint64(q)) != 0
+        t[is_set] ^= np.uint64(q - 1)
+        q >>= 1
+    for i in range(dimensions):
+        x[i] ^= t
+
+    # The bits of the first coordinate are the most significant
+    return _interleave(x[::-1])
+
+
+def _bits_per_coordinate(coordinates: Sequence[np.ndarray]) -> int:
+    try:
+        return BITS_PER_COORDINATE[len(coordinates)]
+    except KeyError:
+        raise ValueError("Keys can only be computed for 2 or 3 coordinates") from None
+
+
+def is_space_filling_curve(order: Order) -> bool:
+    return isinstance(order, str) and order in SPACE_FILLING_CURVES
+
+
+def curve_dimensions(use_z: bool) -> List[str]:
+    """Names of the dimensions the space filling curves are computed on"""
+    return ["X", "Y", "Z"] if use_z else ["X", "Y"]
+
+
+def _dimension_names(order: Order) -> List[str]:
+    names = [order] if isinstance(order, str) else list(order)
+    if not names:
+        raise ValueError("The order needs at least one dimension")
+    return names
+
+
+def sort_keys(
+    points: PackedPointRecord,
+    order: Order = "hilbert",
+    use_z: bool = False,
+    mins: Optional[Sequence[int]] = None,
+    maxs: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """Returns the keys of the points for the order, the points
+    are sorted when their keys are.
+
+    The keys are the uint64 keys of the space filling curve, the values of the
+    dimension, or a structured array for a list of dimensions (compared
+    field by field). mins and maxs are the raw bounds used by the curves,
+    see :func:`.morton_keys`.
+    """
+    if is_space_filling_curve(order):
+        coordinates = [points.array[name] for name in curve_dimensions(use_z)]
+        if order == "morton":
+            return morton_keys(*coordinates, mins=mins, maxs=maxs)
+        return hilbert_keys(*coordinates, mins=mins, maxs=maxs)
+
+    names = _dimension_names(order)
+    values = [np.asarray(points[name]) for name in names]
+    if len(values) == 1:
+        return values[0]
+    keys = np.empty(len(points), [(f"key{i}", v.dtype) for i, v in enumerate(values)])
+    for i, v in enumerate(values):
+        keys[f"key{i}"] = v
+    return keys
+
+
+def sort_permutation(
+    points: PackedPointRecord, order: Order = "hilbert", use_z: bool = False
+) -> np.ndarray:
+    """Returns the indices that sort the points, the sort is stable
+
+    Parameters
+    ----------
+    points: the points to sort
+    order: "morton" or "hilbert" to sort the points along a space filling curve
+        computed on their raw X, Y (and Z) integers, otherwise a dimension name
+        or a list of dimension names (the first one being the primary key)
+    use_z: whether the space filling curve is 3D instead of 2D
+    """
+    if len(points) == 0:
+        return np.zeros(0, np.int64)
+
+    if is_space_filling_curve(order):
+        return np.argsort(sort_keys(points, order, use_z), kind="stable")
+
+    names = _dimension_names(order)
+    # lexsort uses the last key as the primary one
+    return np.lexsort([np.asarray(points[name]) for name in reversed(names)])
+
+
+def sort_points(
+    points: PackedPointRecord, order: Order = "hilbert", use_z: bool = False
+) -> PackedPointRecord:
+    """Returns the points sorted, see :func:`.sort_permutation`"""
+    return PackedPointRecord(
+        points.array[sort_permutation(points, order, use_z)], points.point_format
+    )
@@ -0,0 +1,77 @@
+""" Statistics of points stored in LAS headers (bounds, number of points by return),
+computed in a few passes over the raw point data
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from . import dims, packing
+
+#: Number of values a return number can take (4 bits)
+NUMBER_OF_RETURN_NUMBERS = 16
+
+
+class PointStatistics(NamedTuple):
+    """Statistics of points, computed with :func:`.compute_statistics`"""
+
+    point_count: int
+    #: min raw X, Y, Z (int64), only meaningful if point_count > 0
+    raw_mins: np.ndarray
+    #: max raw X, Y, Z (int64), only meaningful if point_count > 0
+    raw_maxs: np.ndarray
+    #: number of points of each return number (index 0 is return number 0)
+    return_counts: np.ndarray
+
+    def scaled_bounds(self, scales: np.ndarray, offsets: np.ndarray):
+        """Returns the scaled mins and maxs, only the 6 values are scaled"""
+        a = self.raw_mins * scales + offsets
+        b = self.raw_maxs * scales + offsets
+        # with negative scales the min of the raw values is the max
+        return np.minimum(a, b), np.maximum(a, b)
+
+    def by_return(self, n: int = 15) -> np.ndarray:
+        """Number of points of return numbers 1 to n"""
+        return self.return_counts[1 : n + 1]
+
+
+def compute_statistics(points) -> PointStatistics:
+    """Computes the bounds of the raw X, Y, Z and the number of points
+    by return number.
+
+    The bounds are computed on the raw integers (only the 6 results
+    are scaled, see :meth:`.PointStatistics.scaled_bounds`),
+    the return numbers are decoded from their bit field and counted
+    with one bincount (instead of sorting them).
+
+    >>> from pylas.point import PointFormat
+    >>> from pylas.point.record import PackedPointRecord
+    >>> points = PackedPointRecord.zeros(PointFormat(3), 4)
+    >>> points["X"] = [1, -5, 3, 2]
+    >>> points["return_number"] = np.array([1, 1, 2, 0], np.uint8)
+    >>> statistics = compute_statistics(points)
+    >>> statistics.raw_mins, statistics.raw_maxs
+    (array([-5,  0,  0]), array([3, 0, 0]))
+    >>> statistics.by_return(5)
+    array([2, 1, 0, 0, 0])
+    """
+    array = points.array
+    point_count = len(array)
+    return_counts = np.zeros(NUMBER_OF_RETURN_NUMBERS, np.int64)
+    if point_count == 0:
+        zeros = np.zeros(3, np.int64)
+        return PointStatistics(0, zeros, zeros.copy(), return_counts)
+
+    # Reductions of the strided fields one by one are faster than
+    # reductions along the first axis of a (n, 3) view of X, Y, Z
+    raw_mins = np.array([array[name].min() for name in ("X", "Y", "Z")], np.int64)
+    raw_maxs = np.array([array[name].max() for name in ("X", "Y", "Z")], np.int64)
+
+    composed_name, sub_field = dims.get_sub_fields_dict(points.point_format.id)[
+        "return_number"
+    ]
+    return_numbers = np.bitwise_and(array[composed_name], sub_field.mask)
+    return_numbers >>= packing.least_significant_bit_set(sub_field.mask)
+    counts = np.bincount(return_numbers, minlength=NUMBER_OF_RETURN_NUMBERS)
+    return_counts += counts[:NUMBER_OF_RETURN_NUMBERS]
+
+    return PointStatistics(point_count, raw_mins, raw_maxs, return_counts)
@@ -0,0 +1,225 @@
+""" File-like object reading byte ranges on demand, for files on remote storages
+"""
+import io
+import urllib.request
+from typing import Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from .chunkcache import ChunkCache
+
+#: Signature of the function that returns `length` bytes starting at `offset`,
+#: it may return less bytes only at the end of the file
+Fetch = Callable[[int, int], bytes]
+
+DEFAULT_BLOCK_SIZE = 256 * 1024
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+#: Number of blocks fetched after the ones requested when reading sequentially
+DEFAULT_READ_AHEAD = 4
+
+
+class RangeSource(io.RawIOBase):
+    """A seekable, read-only file object whose bytes are fetched
+    on demand by a user provided `fetch(offset, length)` function
+    (e.g. HTTP range requests to an object storage).
+
+    Bytes are fetched by aligned blocks that are kept in an LRU cache,
+    contiguous missing blocks are fetched in one call and, when the reads are
+    sequential, the next blocks are fetched in the same call.
+
+    It can be given to :func:`pylas.open` / :func:`pylas.read`, thanks to
+    seeking, only the parts of the file needed are fetched
+    (e.g. the header and the chunks containing the points
+    requested with :meth:`.LasReader.read_points_at`).
+
+    >>> data = open("pylastests/simple.las", mode="rb").read()
+    >>> source = RangeSource(lambda offset, length: data[offset:offset + length],
+    ...                      size=len(data), block_size=4096)
+    >>> import pylas
+    >>> with pylas.open(source) as reader:
+    ...     points = reader.read_points_at([10, 500])
+    >>> source.bytes_fetched < len(data)
+    True
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        size: Optional[int] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        fetch: function returning the `length` bytes of the file starting at `offset`
+        size: optional, the size of the file in bytes,
+            needed to seek relatively to the end of the file
+        block_size: size of the blocks fetched and cached
+        cache_size: maximum number of bytes of blocks kept in memory
+        read_ahead: number of blocks fetched in advance when reading sequentially
+        """
+        super().__init__()
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self.fetch = fetch
+        self.size = size
+        self.block_size = block_size
+        self.read_ahead = read_ahead
+        self.cache = ChunkCache(cache_size)
+        #: Number of calls to fetch
+        self.fetches = 0
+        #: Number of bytes returned by fetch
+        self.bytes_fetched = 0
+        self._position = 0
+        # Last block of the previous read, to detect sequential reads
+        self._last_block = -1
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        size: Optional[int] = None,
+        **kwargs,
+    ) -> "RangeSource":
+        """Creates a source reading a file served over HTTP(S) with range requests
+
+        Parameters
+        ----------
+        url: url of the file
+        headers: optional, extra headers of the requests (e.g. authorization)
+        size: optional, the size of the file, if not given a HEAD request is made
+        kwargs: passed to :class:`.RangeSource`
+        """
+        headers = dict(headers or {})
+        if size is None:
+            request = urllib.request.Request(url, headers=headers, method="HEAD")
+            with urllib.request.urlopen(request) as response:
+                content_length = response.headers.get("Content-Length")
+            size = int(content_length) if content_length is not None else None
+
+        def fetch(offset: int, length: int) -> bytes:
+            range_header = {"Range": f"bytes={offset}-{offset + length - 1}"}
+            request = urllib.request.Request(url, headers={**headers, **range_header})
+            with urllib.request.urlopen(request) as response:
+                data = response.read()
+                if response.status != 206:
+                    # The server does not support ranges and sent the whole file
+                    data = data[offset : offset + length]
+            return data
+
+        return cls(fetch, size=size, **kwargs)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            new_position = pos
+        elif whence == io.SEEK_CUR:
+            new_position = self._position + pos
+        elif whence == io.SEEK_END:
+            if self.size is None:
+                raise io.UnsupportedOperation(
+                    "Cannot seek from the end, the size of the source is unknown"
+                )
+            new_position = self.size + pos
+        else:
+            raise ValueError(f"Invalid value for whence: {whence}")
+        if new_position < 0:
+            raise ValueError(f"Negative seek position {new_position}")
+        self._position = new_position
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        start = self._position
+        end = start + len(view)
+        if self.size is not None:
+            end = min(end, self.size)
+        if end <= start:
+            return 0
+
+        first_block = start // self.block_size
+        last_block = (end - 1) // self.block_size
+        blocks = self._blocks(first_block, last_block)
+
+        n = 0
+        for block_index in range(first_block, last_block + 1):
+            data = blocks[block_index]
+            block_start = block_index * self.block_size
+            begin = max(start, block_start) - block_start
+            stop = min(end, block_start + self.block_size) - block_start
+            part = data[begin:stop]
+            view[n : n + len(part)] = part
+            n += len(part)
+            if len(part) < stop - begin:
+                # End of the file
+                break
+
+        self._position += n
+        return n
+
+    def _blocks(self, first_block: int, last_block: int) -> Dict[int, np.ndarray]:
+        """Returns the blocks, fetching the ones not in the cache"""
+        blocks = {}
+        missing: List[int] = []
+        for block_index in range(first_block, last_block + 1):
+            data = self.cache.get(block_index)
+            if data is None:
+                missing.append(block_index)
+            else:
+                blocks[block_index] = data
+
+        is_sequential = self._last_block <= first_block <= self._last_block + 1
+        self._last_block = last_block
+        if not missing:
+            return blocks
+
+        # Groups contiguous missing blocks, to fetch each group in one call
+        runs = [[missing[0], missing[0]]]
+        for block_index in missing[1:]:
+            if block_index == runs[-1][1] + 1:
+                runs[-1][1] = block_index
+            else:
+                runs.append([block_index, block_index])
+        if is_sequential and runs[-1][1] == last_block:
+            # Reads ahead the next blocks, up to the first one already cached
+            for _ in range(self.read_ahead):
+                block_index = runs[-1][1] + 1
+                if block_index in self.cache or (
+                    self.size is not None and block_index * self.block_size >= self.size
+                ):
+                    break
+                runs[-1][1] = block_index
+
+        for run_first, run_last in runs:
+            offset = run_first * self.block_size
+            length = (run_last - run_first + 1) * self.block_size
+            if self.size is not None:
+                length = min(length, self.size - offset)
+            data = self.fetch(offset, length) if length > 0 else b""
+            self.fetches += 1
+            self.bytes_fetched += len(data)
+
+            data = np.frombuffer(data, np.uint8)
+            for i, block_index in enumerate(range(run_first, run_last + 1)):
+                block = data[i * self.block_size : (i + 1) * self.block_size]
+                if len(block) == 0 and block_index > last_block:
+                    break
+                if len(block) > 0:
+                    if run_last > run_first:
+                        # Copied, so that the memory of the whole run
+                        # can be freed once its blocks are evicted
+                        block = block.copy()
+                    self.cache.put(block_index, block)
+                blocks[block_index] = block
+        return blocks
@@ -0,0 +1,218 @@
+""" Point records in shared memory, to give points to worker processes without copies
+
+Requires python >= 3.8 (multiprocessing.shared_memory).
+"""
+import copy
+import weakref
+from typing import BinaryIO, Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .compression import LazBackend
+from .errors import PylasError
+from .header import LasHeader
+from .lasdata import LasData
+from .lasreader import LasReader
+from .lib import open_las
+from .point import record
+from .typehints import PathLike
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    pass
+
+
+class SharedPointsHandle(NamedTuple):
+    """Small, picklable, description of points in shared memory,
+    to be sent to other processes, which use :meth:`.open` to access the points.
+    """
+
+    #: name of the shared memory block
+    name: str
+    #: header describing the points (point format, scales, offsets...)
+    header: LasHeader
+    #: number of points
+    count: int
+
+    def open(self) -> "SharedPoints":
+        """Attaches to the shared memory block of the points"""
+        return SharedPoints.attach(self)
+
+
+class SharedPoints:
+    """Points stored in a block of shared memory.
+
+    The process that creates the points (with :meth:`.create`,
+    :meth:`.from_record`, :meth:`.from_reader` or :meth:`.from_file`)
+    owns the block, other processes access the points with the :attr:`.handle`
+    without copying them (:meth:`SharedPointsHandle.open`).
+
+    The block is unlinked (freed) when the owner closes it, which should be
+    done once the workers are done with the points. Processes that merely
+    attached to the block only release their mapping when they close it.
+
+    Records and LasData returned by :meth:`.points` and :meth:`.las_data`
+    are views over the shared memory, they have to be deleted before closing.
+
+    >>> import pylas
+    >>> with SharedPoints.from_file("pylastests/simple.las") as shared:
+    ...     handle = shared.handle  # this is what is sent to the workers
+    ...     with handle.open() as worker_view:
+    ...         las = worker_view.las_data()
+    ...         print(len(las.points), las.header.point_format.id)
+    ...         del las
+    1065 3
+    """
+
+    def __init__(
+        self,
+        shm: "shared_memory.SharedMemory",
+        header: LasHeader,
+        count: int,
+        owner: bool,
+    ) -> None:
+        self._shm = shm
+        self.header = header
+        self.count = count
+        self.owner = owner
+        self._array: Optional[np.ndarray] = np.frombuffer(
+            shm.buf, header.point_format.dtype(), count=count
+        )
+        # If the object is not closed, the block is still released
+        # (and unlinked by its owner) when it is garbage collected
+        self._finalizer = weakref.finalize(self, _release, shm, owner)
+
+    @classmethod
+    def create(cls, header: LasHeader, count: Optional[int] = None) -> "SharedPoints":
+        """Creates a shared memory block for `count` points (zero initialized)
+        of the header's point format.
+
+        By default, count is the header's point count
+        """
+        if count is None:
+            count = header.point_count
+        header = copy.deepcopy(header)
+        header.point_count = count
+        size = count * header.point_format.size
+        # Blocks cannot be empty
+        shm = _shared_memory_module().SharedMemory(create=True, size=max(size, 1))
+        return cls(shm, header, count, owner=True)
+
+    @classmethod
+    def from_record(
+        cls, points: record.PackedPointRecord, header: LasHeader
+    ) -> "SharedPoints":
+        """Copies the points of the record in a new shared memory block"""
+        if points.point_format != header.point_format:
+            raise PylasError("The points and the header have different point formats")
+        shared = cls.create(header, len(points))
+        shared._array[:] = points.array
+        return shared
+
+    @classmethod
+    def from_reader(cls, reader: LasReader, n: int = -1) -> "SharedPoints":
+        """Reads the next `n` points (all the remaining points if n < 0)
+        of the reader directly into a new shared memory block
+        """
+        points_left = reader.header.point_count - reader.points_read
+        n = points_left if n < 0 else min(n, points_left)
+        shared = cls.create(reader.header, n)
+        try:
+            reader.read_points_into(shared._array)
+        except Exception:
+            shared.close()
+            raise
+        return shared
+
+    @classmethod
+    def from_file(
+        cls,
+        source: Union[BinaryIO, PathLike],
+        laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+    ) -> "SharedPoints":
+        """Reads all the points of a LAS/LAZ file into a new shared memory block"""
+        with open_las(source, laz_backend=laz_backend) as reader:
+            return cls.from_reader(reader)
+
+    @classmethod
+    def attach(cls, handle: SharedPointsHandle) -> "SharedPoints":
+        """Accesses existing shared points, see :meth:`SharedPointsHandle.open`"""
+        shared_memory_module = _shared_memory_module()
+        try:
+            # Only the owner is responsible for unlinking the block (python >= 3.13)
+            shm = shared_memory_module.SharedMemory(name=handle.name, track=False)
+        except TypeError:
+            shm = shared_memory_module.SharedMemory(name=handle.name)
+        return cls(shm, handle.header, handle.count, owner=False)
+
+    @property
+    def handle(self) -> SharedPointsHandle:
+        return SharedPointsHandle(self._shm.name, self.header, self.count)
+
+    @property
+    def array(self) -> np.ndarray:
+        """The structured array of points, a view over the shared memory"""
+        if self._array is None:
+            raise PylasError("The shared points are closed")
+        return self._array
+
+    def points(self) -> record.ScaleAwarePointRecord:
+        """Returns a point record viewing the shared points"""
+        return record.ScaleAwarePointRecord(
+            self.array,
+            self.header.point_format,
+            self.header.scales,
+            self.header.offsets,
+        )
+
+    def las_data(self) -> LasData:
+        """Returns a LasData whose points are a view over the shared points,
+        its header is a copy of the header of the shared points.
+        """
+        return LasData(
+            header=copy.deepcopy(self.header),
+            points=record.PackedPointRecord(self.array, self.header.point_format),
+        )
+
+    def close(self) -> None:
+        """Releases the shared memory of this process, the owner also unlinks it.
+
+        Raises
+        ------
+        BufferError if views of the points (records, LasData) are still alive,
+        the block is still unlinked if this is the owner
+        """
+        if self._array is None:
+            return
+        self._array = None
+        self._finalizer()
+
+    def __enter__(self) -> "SharedPoints":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<SharedPoints({self.count} points, name: {self._shm.name},"
+            f" owner: {self.owner})>"
+        )
+
+
+def _release(shm: "shared_memory.SharedMemory", owner: bool) -> None:
+    try:
+        shm.close()
+    finally:
+        if owner:
+            shm.unlink()
+
+
+def _shared_memory_module():
+    try:
+        return shared_memory
+    except NameError:
+        raise PylasError(
+            "Shared memory points need python >= 3.8 (multiprocessing.shared_memory)"
+        ) from None
@@ -0,0 +1,302 @@
+""" Sorting the points of LAS/LAZ files, see :mod:`pylas.point.sorting`
+for the orders (space filling curves, dimensions)
+"""
+import collections
+import concurrent.futures
+import copy
+import logging
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .compression import LazBackend
+from .header import LasHeader
+from .lasreader import LasReader
+from .lib import open_las
+from .point.record import PackedPointRecord
+from .point.sorting import (
+    Order,
+    curve_dimensions,
+    is_space_filling_curve,
+    sort_keys,
+    sort_points,
+)
+from .typehints import PathLike
+
+logger = logging.getLogger(__name__)
+
+#: Default number of points sorted at a time by :func:`.sort_chunks`,
+#: a multiple of the default number of points of a LAZ chunk
+DEFAULT_POINTS_PER_ITERATION = 1_000_000
+#: Default number of bytes used by :func:`.sort_file`
+DEFAULT_MEMORY_LIMIT = 512 * 1024 * 1024
+#: Minimum number of points read at a time from each run during the merge
+MIN_POINTS_PER_READ = 1024
+
+
+def sort_chunks(
+    source: Union[PathLike, BinaryIO],
+    dest: Union[PathLike, BinaryIO],
+    order: Order = "hilbert",
+    use_z: bool = False,
+    points_per_iteration: int = DEFAULT_POINTS_PER_ITERATION,
+    do_compress: Optional[bool] = None,
+    laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+) -> None:
+    """Writes the points of the source to the destination, sorting
+    each chunk of `points_per_iteration` points on its own.
+
+    Only one chunk of points is in memory at a time, so the file is not sorted
+    as a whole, but points that are close in the file become close in space
+    (or in time...), which is what matters for the size of LAZ files,
+    as LAZ compresses each point relatively to the previous one.
+
+    >>> import io
+    >>> output = io.BytesIO()
+    >>> sort_chunks("pylastests/simple.las", output, "morton", points_per_iteration=500)
+    >>> _ = output.seek(0)
+    >>> import pylas
+    >>> len(pylas.read(output).points)
+    1065
+
+    Parameters
+    ----------
+    source: the LAS/LAZ file to read
+    dest: where the sorted points are written
+    order: see :func:`pylas.point.sorting.sort_permutation`
+    use_z: whether the space filling curve is 3D instead of 2D
+    points_per_iteration: number of points sorted at a time
+    do_compress: whether the destination is a LAZ file, by default it is
+        guessed from the extension of the destination path, or is the same
+        as the source for file objects
+    laz_backend: optional, LAZ backend(s) used to read and write
+    """
+    with open_las(source, laz_backend=laz_backend, closefd=_is_path(source)) as reader:
+        if do_compress is None and not _is_path(dest):
+            do_compress = reader.header.are_points_compressed
+        with open_las(
+            dest,
+            mode="w",
+            # The writer modifies the VLRs of the header (LAZ)
+            header=copy.deepcopy(reader.header),
+            do_compress=do_compress,
+            laz_backend=laz_backend,
+            closefd=_is_path(dest),
+        ) as writer:
+            for points in reader.chunk_iterator(points_per_iteration):
+                writer.write_points(sort_points(points, order, use_z), copy=False)
+
+
+def _is_path(source) -> bool:
+    return isinstance(source, (str, Path))
+
+
+def sort_file(
+    source: Union[PathLike, BinaryIO],
+    dest: Union[PathLike, BinaryIO],
+    order: Order = "hilbert",
+    use_z: bool = False,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    num_workers: int = 1,
+    do_compress: Optional[bool] = None,
+    laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+    temporary_directory: Optional[PathLike] = None,
+) -> None:
+    """Sorts all the points of a LAS/LAZ file, even if they do not fit in memory.
+
+    This is an external merge sort: the source is read by runs of points that fit
+    in `memory_limit`, each run is sorted and written to a temporary
+    (uncompressed) LAS file, then the runs are read back together, a block of
+    points of each run at a time, and merged into the destination.
+    If the whole file fits in one run, it is sorted in memory.
+
+    The sort is stable, points with the same key keep their order of the source.
+    The keys of the space filling curves are computed relatively to the bounds
+    of the header of the source, so that they are the same for all the runs.
+
+    >>> import io
+    >>> output = io.BytesIO()
+    >>> sort_file("pylastests/simple.las", output, "gps_time", memory_limit=10_000)
+    >>> _ = output.seek(0)
+    >>> import pylas
+    >>> las = pylas.read(output)
+    >>> len(las.points), bool(np.all(np.diff(las.gps_time) >= 0))
+    (1065, True)
+
+    Parameters
+    ----------
+    source: the LAS/LAZ file to sort
+    dest: where the sorted points are written
+    order: see :func:`pylas.point.sorting.sort_permutation`
+    use_z: whether the space filling curve is 3D instead of 2D
+    memory_limit: approximate number of bytes of points (and of their keys)
+        in memory at a time, it bounds the size of the runs
+    num_workers: number of runs sorted and written at the same time, by a pool
+        of threads, while the next run is read (they share the memory_limit)
+    do_compress: whether the destination is a LAZ file, by default it is
+        guessed from the extension of the destination path, or is the same
+        as the source for file objects
+    laz_backend: optional, LAZ backend(s) used to read and write
+    temporary_directory: optional, where the runs are written
+    """
+    if num_workers < 1:
+        raise ValueError("num_workers must be at least 1")
+
+    with open_las(source, laz_backend=laz_backend, closefd=_is_path(source)) as reader:
+        header = reader.header
+        if do_compress is None and not _is_path(dest):
+            do_compress = header.are_points_compressed
+
+        mins, maxs = None, None
+        if is_space_filling_curve(order):
+            mins, maxs = _raw_bounds(header, use_z)
+
+        # The points, their sorted copy, their keys and the permutation
+        bytes_per_point = 2 * header.point_format.size + 16
+        points_per_run = max(
+            MIN_POINTS_PER_READ,
+            memory_limit // ((num_workers + 1) * bytes_per_point),
+        )
+
+        with open_las(
+            dest,
+            mode="w",
+            # The writer modifies the VLRs of the header (LAZ)
+            header=copy.deepcopy(header),
+            do_compress=do_compress,
+            laz_backend=laz_backend,
+            closefd=_is_path(dest),
+        ) as writer:
+            if header.point_count <= points_per_run:
+                points = reader.read_points(-1)
+                if points is not None:
+                    writer.write_points(
+                        _sort(points, order, use_z, mins, maxs), copy=False
+                    )
+                return
+
+            with tempfile.TemporaryDirectory(dir=temporary_directory) as directory:
+                run_paths = _write_sorted_runs(
+                    reader,
+                    Path(directory),
+                    points_per_run,
+                    num_workers,
+                    (order, use_z, mins, maxs),
+                )
+                logger.info(f"Merging {len(run_paths)} sorted runs")
+                points_per_read = max(
+                    MIN_POINTS_PER_READ,
+                    memory_limit // (2 * len(run_paths) * bytes_per_point),
+                )
+                _merge_runs(
+                    run_paths, writer, points_per_read, (order, use_z, mins, maxs)
+                )
+
+
+def _raw_bounds(header: LasHeader, use_z: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the bounds of the header as raw integers,
+    for the dimensions of the space filling curves
+    """
+    n = len(curve_dimensions(use_z))
+    mins = np.floor((header.mins - header.offsets) / header.scales)[:n]
+    maxs = np.ceil((header.maxs - header.offsets) / header.scales)[:n]
+    return mins.astype(np.int64), maxs.astype(np.int64)
+
+
+def _sort(
+    points: PackedPointRecord,
+    order: Order,
+    use_z: bool,
+    mins: Optional[Sequence[int]],
+    maxs: Optional[Sequence[int]],
+) -> PackedPointRecord:
+    keys = sort_keys(points, order, use_z, mins, maxs)
+    return PackedPointRecord(
+        points.array[np.argsort(keys, kind="stable")], points.point_format
+    )
+
+
+def _write_sorted_runs(
+    reader: LasReader,
+    directory: Path,
+    points_per_run: int,
+    num_workers: int,
+    sort_args: tuple,
+) -> List[Path]:
+    """Reads the runs, sorts them and writes each one to its own LAS file,
+    at most num_workers runs are sorted at a time (while the next one is read)
+    """
+    header = copy.deepcopy(reader.header)
+    header.vlrs.extract("LasZipVlr")
+
+    def sort_run(points: PackedPointRecord, path: Path) -> None:
+        with open_las(
+            path, mode="w", header=copy.deepcopy(header), do_compress=False
+        ) as run_writer:
+            run_writer.write_points(_sort(points, *sort_args), copy=False)
+
+    run_paths = []
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        for points in reader.chunk_iterator(points_per_run):
+            while len(pending) >= num_workers:
+                pending.popleft().result()
+            run_paths.append(directory / f"run_{len(run_paths)}.las")
+            pending.append(executor.submit(sort_run, points, run_paths[-1]))
+        while pending:
+            pending.popleft().result()
+    return run_paths
+
+
+def _merge_runs(
+    run_paths: List[Path], writer, points_per_read: int, sort_args: tuple
+) -> None:
+    """k-way merge of the sorted runs, a block of points at a time.
+
+    The bound is the smallest of the last keys of the buffers, the first run
+    whose buffer ends with it is the limiting run. The buffered points whose keys
+    are smaller than the bound are sorted together and written, as well as the
+    points equal to it from the limiting run and the runs before it: the points
+    left in the runs cannot have smaller keys, and the points equal to the bound
+    of the runs after the limiting one must come after the points left in it.
+    """
+    readers = [open_las(path) for path in run_paths]
+    try:
+        # For each run: its reader, its buffered points and their keys
+        runs = []
+        for reader in readers:
+            points = reader.read_points(points_per_read)
+            if points is not None:
+                runs.append([reader, points, sort_keys(points, *sort_args)])
+
+        while runs:
+            last_keys = np.concatenate([keys[-1:] for _, _, keys in runs])
+            limiting_run = int(np.argsort(last_keys, kind="stable")[0])
+            bound = last_keys[limiting_run : limiting_run + 1]
+            arrays, keys = [], []
+            for i, run in enumerate(runs):
+                side = "right" if i <= limiting_run else "left"
+                end = int(np.searchsorted(run[2], bound, side=side)[0])
+                arrays.append(run[1].array[:end])
+                keys.append(run[2][:end])
+                run[1] = run[1][end:]
+                run[2] = run[2][end:]
+            # Runs are in the order of the source, the stable sort keeps it for ties
+            permutation = np.argsort(np.concatenate(keys), kind="stable")
+            array = np.concatenate(arrays)[permutation]
+            writer.write_points(
+                PackedPointRecord(array, runs[0][1].point_format), copy=False
+            )
+
+            for run in runs:
+                if len(run[1]) == 0:
+                    points = run[0].read_points(points_per_read)
+                    if points is not None:
+                        run[1] = points
+                        run[2] = sort_keys(points, *sort_args)
+            runs = [run for run in runs if len(run[1]) != 0]
+    finally:
+        for reader in readers:
+            reader.close()
@@ -0,0 +1,156 @@
+""" Helpers to read LAS/LAZ files from streams that cannot seek (pipes, sockets, stdin)
+"""
+import io
+from typing import BinaryIO
+
+from .errors import PylasError
+
+#: Number of bytes kept by :class:`.ForwardOnlyStream` to be able to
+#: go back a little, for readers that read ahead (like the lazrs decompressor)
+DEFAULT_LOOKBACK = 64 * 1024
+
+#: Size of the blocks read (and discarded) when skipping data
+SKIP_BLOCK_SIZE = 1024 * 1024
+
+
+class ForwardOnlyStream:
+    """Wraps a non-seekable stream to know the position in it and to be able
+    to move forward to a position by reading and discarding the data before it.
+
+    The last `lookback` bytes read are kept, so :meth:`skip_to` can also
+    move back to a position that is not older than that.
+
+    :meth:`seek` is not supported, so that code that tries to seek,
+    like the LAZ decompressors, knows the stream is to be read sequentially.
+
+    >>> stream = ForwardOnlyStream(io.BytesIO(b"0123456789"), lookback=4)
+    >>> stream.read(2), stream.tell()
+    (b'01', 2)
+    >>> stream.skip_to(8)
+    8
+    >>> stream.skip_to(5)
+    5
+    >>> stream.read()
+    b'56789'
+    """
+
+    def __init__(self, raw: BinaryIO, lookback: int = DEFAULT_LOOKBACK) -> None:
+        """
+        Parameters
+        ----------
+        raw: the stream, its current position is considered to be the position 0
+        lookback: number of bytes kept to be able to move back
+        """
+        self.raw = raw
+        self.lookback = lookback
+        self._position = 0
+        # The last bytes read, ending at the current position
+        self._history = bytearray()
+        # Bytes to be read again, after moving back
+        self._replay = bytearray()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        raise io.UnsupportedOperation("seek")
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        """Reads until the buffer is full or the end of the stream is reached,
+        returns the number of bytes read
+        """
+        view = memoryview(buffer).cast("B")
+        n = min(len(self._replay), len(view))
+        view[:n] = self._replay[:n]
+        del self._replay[:n]
+
+        while n < len(view):
+            read = self._raw_readinto(view[n:])
+            if not read:
+                break
+            n += read
+
+        self._remember(view[:n])
+        self._position += n
+        return n
+
+    def _raw_readinto(self, view: memoryview) -> int:
+        try:
+            readinto = self.raw.readinto
+        except AttributeError:
+            data = self.raw.read(len(view))
+            view[: len(data)] = data
+            return len(data)
+        else:
+            return readinto(view) or 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = bytes(self._replay) + self.raw.read()
+            self._replay.clear()
+            self._remember(memoryview(data))
+            self._position += len(data)
+            return data
+
+        buffer = bytearray(size)
+        n = self.readinto(buffer)
+        del buffer[n:]
+        return bytes(buffer)
+
+    def _remember(self, data: memoryview) -> None:
+        if len(data) >= self.lookback:
+            self._history = bytearray(data[len(data) - self.lookback :])
+        else:
+            self._history += data
+            excess = len(self._history) - self.lookback
+            if excess > 0:
+                del self._history[:excess]
+
+    def skip_to(self, position: int) -> int:
+        """Moves to the position, by reading and discarding data if it is forward,
+        or within the last bytes read if it is backward.
+
+        Raises
+        ------
+        PylasError if the position is before the bytes kept,
+        or after the end of the stream
+        """
+        if position < self._position:
+            n = self._position - position
+            if n > len(self._history):
+                raise PylasError(
+                    f"Cannot go back to position {position} of a non-seekable stream,"
+                    f" only the last {len(self._history)} bytes read are kept"
+                )
+            self._replay[:0] = self._history[-n:]
+            del self._history[-n:]
+            self._position = position
+        elif position > self._position:
+            block = bytearray(min(SKIP_BLOCK_SIZE, position - self._position))
+            while self._position < position:
+                view = memoryview(block)[: position - self._position]
+                if self.readinto(view) != len(view):
+                    raise PylasError(
+                        f"Unexpected end of stream when skipping to position {position}"
+                    )
+        return self._position
+
+    @property
+    def closed(self) -> bool:
+        return self.raw.closed
+
+    def close(self) -> None:
+        self.raw.close()
+
+
+def forward_only(stream: BinaryIO) -> ForwardOnlyStream:
+    """Wraps the stream in a :class:`.ForwardOnlyStream` if it is not one already"""
+    if isinstance(stream, ForwardOnlyStream):
+        return stream
+    return ForwardOnlyStream(stream)
@@ -0,0 +1,281 @@
+""" Splitting (retiling) the points of LAS/LAZ files into tiles of a regular grid
+"""
+import collections
+import copy
+import logging
+import math
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .compression import LazBackend
+from .header import LasHeader
+from .lib import open_las
+from .point import record
+from .typehints import PathLike
+
+logger = logging.getLogger(__name__)
+
+#: Default maximum number of files kept open by a WriterPool
+DEFAULT_MAX_OPEN_WRITERS = 64
+
+#: Index (column, row) of a tile in a TileGrid
+TileIndex = Tuple[int, int]
+
+
+class TileGrid:
+    """Regular grid of tiles, tile (i, j) covers
+    [origin_x + i * tile_width, origin_x + (i + 1) * tile_width[
+    x [origin_y + j * tile_height, origin_y + (j + 1) * tile_height[
+
+    >>> grid = TileGrid(100.0, origin=(0.0, 0.0))
+    >>> grid.tile_bounds((1, 2))
+    (100.0, 200.0, 200.0, 300.0)
+    """
+
+    def __init__(
+        self,
+        tile_size: Union[float, Tuple[float, float]],
+        origin: Tuple[float, float] = (0.0, 0.0),
+    ) -> None:
+        """
+        Parameters
+        ----------
+        tile_size: width and height of the tiles, or one size for both
+        origin: x, y coordinates of the corner of the tile (0, 0)
+        """
+        if np.ndim(tile_size) == 0:
+            tile_size = (tile_size, tile_size)
+        self.tile_size = (float(tile_size[0]), float(tile_size[1]))
+        if self.tile_size[0] <= 0 or self.tile_size[1] <= 0:
+            raise ValueError("The tile size must be greater than 0")
+        self.origin = (float(origin[0]), float(origin[1]))
+
+    def tile_bounds(self, tile: TileIndex) -> Tuple[float, float, float, float]:
+        """Returns the min_x, min_y, max_x, max_y of the tile"""
+        min_x = self.origin[0] + tile[0] * self.tile_size[0]
+        min_y = self.origin[1] + tile[1] * self.tile_size[1]
+        return min_x, min_y, min_x + self.tile_size[0], min_y + self.tile_size[1]
+
+    def tile_indices(
+        self, points: record.PackedPointRecord, header: LasHeader
+    ) -> np.ndarray:
+        """Returns the (column, row) indices of the tiles of the points,
+        as an (n, 2) array.
+
+        Tiles are computed on the raw X, Y integers, with an integer division
+        when the tile size is a multiple of the scale, which is the usual case.
+        """
+        columns = []
+        for axis, name in enumerate(("X", "Y")):
+            scale, offset = header.scales[axis], header.offsets[axis]
+            raw_origin = (self.origin[axis] - offset) / scale
+            raw_size = self.tile_size[axis] / scale
+            values = points[name]
+            if _is_integer(raw_origin) and _is_integer(raw_size) and raw_size > 0:
+                indices = np.floor_divide(
+                    values.astype(np.int64) - np.int64(round(raw_origin)),
+                    np.int64(round(raw_size)),
+                )
+            else:
+                indices = np.floor((values - raw_origin) / raw_size).astype(np.int64)
+            columns.append(indices)
+        return np.stack(columns, axis=1)
+
+    def split(
+        self, points: record.PackedPointRecord, header: LasHeader
+    ) -> Iterator[Tuple[TileIndex, record.PackedPointRecord]]:
+        """Yields the points of each tile, for the tiles that have points.
+
+        Points are grouped with one sort of their tile indices,
+        the relative order of the points of a tile is kept.
+        """
+        if len(points) == 0:
+            return
+        indices = self.tile_indices(points, header)
+        tiles, inverse = np.unique(indices, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        counts = np.bincount(inverse, minlength=len(tiles))
+        sorted_array = points.array[order]
+        start = 0
+        for tile, count in zip(tiles, counts):
+            yield (int(tile[0]), int(tile[1])), record.PackedPointRecord(
+                sorted_array[start : start + count], points.point_format
+            )
+            start += count
+
+    def __repr__(self) -> str:
+        return f"<TileGrid(tile_size: {self.tile_size}, origin: {self.origin})>"
+
+
+def _is_integer(value: float) -> bool:
+    """Whether the value is an integer, ignoring floating point errors"""
+    return abs(value - round(value)) < 1e-6
+
+
+class WriterPool:
+    """Writes points to many files, keeping at most `max_open_writers`
+    files open.
+
+    When too many files are open, the least recently used one is closed,
+    it is reopened in append mode when points are written to it again
+    (appending to LAZ files needs the lazrs backend).
+    """
+
+    def __init__(
+        self,
+        header: LasHeader,
+        max_open_writers: int = DEFAULT_MAX_OPEN_WRITERS,
+        laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+    ) -> None:
+        if max_open_writers < 1:
+            raise ValueError("max_open_writers must be at least 1")
+        self.header = header
+        self.max_open_writers = max_open_writers
+        self.laz_backend = laz_backend
+        self._writers: "collections.OrderedDict[Path, Callable]" = (
+            collections.OrderedDict()
+        )
+        self._closers: Dict[Path, Callable[[], None]] = {}
+        #: Paths of the files written so far
+        self.paths = set()
+        #: Number of times files were reopened
+        self.reopenings = 0
+
+    def __len__(self) -> int:
+        """Number of files currently open"""
+        return len(self._writers)
+
+    def write_points(self, path: PathLike, points: record.PackedPointRecord) -> None:
+        """Writes the points at the end of the file, the file is created
+        if points were never written to it
+        """
+        path = Path(path)
+        try:
+            write = self._writers[path]
+        except KeyError:
+            write = self._open(path)
+        else:
+            self._writers.move_to_end(path)
+        write(points)
+
+    def _open(self, path: Path) -> Callable:
+        while len(self._writers) >= self.max_open_writers:
+            self._close_least_recently_used()
+
+        if path in self.paths:
+            self.reopenings += 1
+            appender = open_las(path, mode="a", laz_backend=self.laz_backend)
+            write, close = appender.append_points, appender.close
+        else:
+            # The writer modifies the VLRs of the header (LAZ)
+            writer = open_las(
+                path,
+                mode="w",
+                header=copy.deepcopy(self.header),
+                laz_backend=self.laz_backend,
+            )
+            write, close = writer.write_points, writer.close
+            self.paths.add(path)
+        self._writers[path] = write
+        self._closers[path] = close
+        return write
+
+    def _close_least_recently_used(self) -> None:
+        path, _ = self._writers.popitem(last=False)
+        self._closers.pop(path)()
+
+    def close(self) -> None:
+        """Closes all the files"""
+        errors = []
+        while self._writers:
+            try:
+                self._close_least_recently_used()
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def __enter__(self) -> "WriterPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def retile(
+    source: PathLike,
+    output_dir: PathLike,
+    tile_size: Union[float, Tuple[float, float]],
+    origin: Optional[Tuple[float, float]] = None,
+    points_per_iteration: int = 1_000_000,
+    max_open_writers: int = DEFAULT_MAX_OPEN_WRITERS,
+    laz_backend: Optional[Union[LazBackend, Iterable[LazBackend]]] = None,
+    extension: Optional[str] = None,
+) -> Dict[TileIndex, Path]:
+    """Splits the points of a file into tiles of a regular grid,
+    each tile is written to its own file named "tile_{column}_{row}{extension}".
+
+    The file is read by chunks, the points of each chunk are grouped by tile
+    and written through a :class:`.WriterPool`.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as output_dir:
+    ...     tiles = retile("pylastests/simple.las", output_dir, tile_size=2000.0)
+    ...     print(sorted(tiles))
+    [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2)]
+
+    Parameters
+    ----------
+    source: path to the file to split
+    output_dir: directory where the tiles are written, it is created if needed
+    tile_size: width and height of the tiles, or one size for both
+    origin: corner of the tile (0, 0), the minimum x, y of the file by default
+    points_per_iteration: number of points read at a time
+    max_open_writers: maximum number of tile files open at the same time
+    laz_backend: optional, LAZ backend(s) used to read and write
+    extension: extension of the tiles, ".las" or ".laz",
+        by default the one of the source
+
+    Returns
+    -------
+    The paths of the tiles written, by tile index
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if extension is None:
+        extension = Path(source).suffix.lower()
+
+    tiles: Dict[TileIndex, Path] = {}
+    with open_las(source, laz_backend=laz_backend) as reader:
+        header = reader.header
+        if origin is None:
+            origin = (header.x_min, header.y_min)
+        grid = TileGrid(tile_size, origin)
+
+        number_of_columns = math.ceil((header.x_max - origin[0]) / grid.tile_size[0])
+        number_of_rows = math.ceil((header.y_max - origin[1]) / grid.tile_size[1])
+        logger.info(
+            f"Splitting {source} into at most {number_of_columns * number_of_rows} tiles"
+        )
+
+        with WriterPool(header, max_open_writers, laz_backend) as pool:
+            for points in reader.chunk_iterator(points_per_iteration):
+                for tile, tile_points in grid.split(points, header):
+                    try:
+                        path = tiles[tile]
+                    except KeyError:
+                        path = output_dir / f"tile_{tile[0]}_{tile[1]}{extension}"
+                        tiles[tile] = path
+                    pool.write_points(path, tile_points)
+    return tiles
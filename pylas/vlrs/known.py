@@ -162,6 +162,10 @@ class ClassificationLookupVlr(BaseKnownVLR):
         return (0,)
 
 
+#: Value of the chunk size in the laszip vlr when chunks have a variable size
+VARIABLE_CHUNK_SIZE = 0xFFFFFFFF
+
+
 class LasZipVlr(BaseKnownVLR):
     """Contains the information needed by laszip (or any other laz backend)
     to compress the point records.
@@ -178,6 +182,14 @@ class LasZipVlr(BaseKnownVLR):
     def record_data_bytes(self) -> bytes:
         return self.record_data
 
+    @property
+    def chunk_size(self) -> int:
+        """The number of points per chunk of compressed points
+
+        Equals to :const:`VARIABLE_CHUNK_SIZE` if chunks are of variable size
+        """
+        return int.from_bytes(self.record_data[12:16], "little", signed=False)
+
     @staticmethod
     def official_user_id() -> str:
         return "laszip encoded"
@@ -600,6 +612,71 @@ class WktCoordinateSystemVlr(BaseKnownVLR):
         return (2112,)
 
 
+class CopcInfoVlr(BaseKnownVLR):
+    """Describes the octree of a COPC (Cloud Optimized Point Cloud) file,
+    it is the first VLR of such files.
+
+    The octree is a cube, the hierarchy (the list of its nodes) is
+    stored in an EVLR at `root_hierarchy_offset`.
+
+    >>> info = CopcInfoVlr()
+    >>> info.halfsize = 10.0
+    >>> len(info.record_data_bytes())
+    160
+    >>> raw = VLR("copc", 1, record_data=info.record_data_bytes())
+    >>> CopcInfoVlr.from_raw(raw).halfsize
+    10.0
+    """
+
+    _struct = struct.Struct("<5d2Q2d88x")
+
+    def __init__(self):
+        super().__init__(description="copc info")
+        #: x, y, z of the center of the octree's cube
+        self.center = np.zeros(3, np.float64)
+        #: half of the size of the octree's cube
+        self.halfsize: float = 0.0
+        #: space between points at the root of the octree
+        self.spacing: float = 0.0
+        #: absolute position of the first page of the hierarchy
+        self.root_hierarchy_offset: int = 0
+        #: size in bytes of the first page of the hierarchy
+        self.root_hierarchy_size: int = 0
+        self.gps_time_minimum: float = 0.0
+        self.gps_time_maximum: float = 0.0
+
+    def parse_record_data(self, record_data: bytes) -> None:
+        (
+            *center,
+            self.halfsize,
+            self.spacing,
+            self.root_hierarchy_offset,
+            self.root_hierarchy_size,
+            self.gps_time_minimum,
+            self.gps_time_maximum,
+        ) = self._struct.unpack_from(record_data)
+        self.center = np.array(center, np.float64)
+
+    def record_data_bytes(self) -> bytes:
+        return self._struct.pack(
+            *(float(v) for v in self.center),
+            self.halfsize,
+            self.spacing,
+            self.root_hierarchy_offset,
+            self.root_hierarchy_size,
+            self.gps_time_minimum,
+            self.gps_time_maximum,
+        )
+
+    @staticmethod
+    def official_user_id():
+        return "copc"
+
+    @staticmethod
+    def official_record_ids():
+        return (1,)
+
+
 def vlr_factory(vlr: VLR):
     """Given a vlr tries to find its corresponding KnownVLR class
     that can parse its data.
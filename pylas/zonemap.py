@@ -0,0 +1,257 @@
+""" Zone maps: per-zone minimum & maximum of every dimension of a file.
+
+A zone is a contiguous range of points, for LAZ files zones are the chunks
+(so that skipping a zone means skipping a chunk), for LAS files zones
+have a fixed number of points.
+
+Zone maps are used to skip the zones that cannot contain points
+matching a `where` filter, see :meth:`pylas.LasReader.chunk_iterator`.
+"""
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Mapping, Optional, Tuple, Union, Any
+
+import numpy as np
+
+from . import errors
+from .header import LasHeader
+from .lazchunktable import first_point_of_chunks
+from .point import record
+
+#: Number of points in a zone of a LAS file (LAZ files use their chunks)
+DEFAULT_ZONE_SIZE = 50_000
+
+#: Suffix appended to the path of a LAS/LAZ file to get the path of its zone map
+ZONE_MAP_SUFFIX = ".zmap"
+
+ZONE_MAP_VERSION = 1
+
+#: A `where` filter maps dimension names to either
+#: a (min, max) tuple (inclusive, None meaning unbounded)
+#: or a collection of accepted values
+Where = Mapping[str, Any]
+
+SCALED_COORDINATES = {"x": ("X", 0), "y": ("Y", 1), "z": ("Z", 2)}
+
+
+def zone_map_path(las_path: Union[str, Path]) -> Path:
+    """Returns the path of the sidecar zone map file of a LAS/LAZ file
+
+    >>> str(zone_map_path("tile.laz"))
+    'tile.laz.zmap'
+    """
+    return Path(str(las_path) + ZONE_MAP_SUFFIX)
+
+
+def check_where(where: Where, point_format) -> None:
+    """Raises a ValueError if the filter uses dimensions that do not exist"""
+    for name in where:
+        if name not in SCALED_COORDINATES:
+            point_format.dimension_by_name(name)
+
+
+def _is_range(condition) -> bool:
+    return isinstance(condition, tuple)
+
+
+def _values_match(values: np.ndarray, condition) -> np.ndarray:
+    if _is_range(condition):
+        low, high = condition
+        mask = np.ones(values.shape, np.bool_)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    else:
+        mask = np.isin(values, np.asarray(list(condition)))
+    return mask
+
+
+def _zones_may_match(mins: np.ndarray, maxs: np.ndarray, condition) -> np.ndarray:
+    if _is_range(condition):
+        low, high = condition
+        mask = np.ones(len(mins), np.bool_)
+        if low is not None:
+            mask &= maxs >= low
+        if high is not None:
+            mask &= mins <= high
+        return mask
+
+    mask = np.zeros(len(mins), np.bool_)
+    for value in condition:
+        mask |= (mins <= value) & (value <= maxs)
+    return mask
+
+
+def points_matching(points: record.PackedPointRecord, where: Where) -> np.ndarray:
+    """Returns the boolean mask of the points that match all the conditions of
+    the `where` filter.
+
+    x, y, z conditions are on scaled coordinates, other conditions are on the
+    values as returned by `points[name]`. For dimensions with multiple elements,
+    a point matches if any of its elements matches.
+    """
+    mask = np.ones(len(points), np.bool_)
+    for name, condition in where.items():
+        values = np.asarray(points[name])
+        match = _values_match(values, condition)
+        if match.ndim > 1:
+            match = match.any(axis=1)
+        mask &= match
+    return mask
+
+
+class ZoneMap:
+    """Minimum & maximum of every dimension, for each zone of a file.
+
+    Zone `i` contains the points `starts[i]` to `starts[i + 1]` (excluded).
+
+    >>> import pylas
+    >>> with pylas.open("pylastests/simple.las") as reader:
+    ...     zone_map = ZoneMap.build(reader, zone_size=500)
+    >>> zone_map.number_of_zones
+    3
+    >>> zone_map.ranges_to_read({"classification": [2]}, reader.header)
+    [(0, 1065)]
+    >>> zone_map.ranges_to_read({"x": (None, 635000.0)}, reader.header)
+    []
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        mins: Dict[str, np.ndarray],
+        maxs: Dict[str, np.ndarray],
+    ) -> None:
+        self.starts = np.asarray(starts, np.int64)
+        self.mins = mins
+        self.maxs = maxs
+
+    @property
+    def number_of_zones(self) -> int:
+        return len(self.starts) - 1
+
+    @property
+    def point_count(self) -> int:
+        return int(self.starts[-1])
+
+    @classmethod
+    def build(cls, reader, zone_size: Optional[int] = None) -> "ZoneMap":
+        """Builds the zone map of a file by reading all its points, zone by zone.
+
+        The position of the reader is restored afterwards.
+
+        Parameters
+        ----------
+        reader: the :class:`pylas.LasReader` of the file
+        zone_size: number of points per zone, by default the chunks of LAZ
+            files are used as zones, and zones of LAS files have
+            DEFAULT_ZONE_SIZE points.
+        """
+        header = reader.header
+        if zone_size is None and header.are_points_compressed:
+            starts = first_point_of_chunks(reader.read_chunk_table())
+        else:
+            zone_size = DEFAULT_ZONE_SIZE if zone_size is None else zone_size
+            if zone_size <= 0:
+                raise ValueError("zone_size must be greater than 0")
+            starts = np.arange(0, header.point_count + zone_size, zone_size)
+            starts[-1] = header.point_count
+            if len(starts) > 1 and starts[-2] == starts[-1]:
+                starts = starts[:-1]
+
+        dimension_names = list(header.point_format.dimension_names)
+        mins = {}
+        maxs = {}
+
+        position = reader.points_read
+        try:
+            for zone, (start, stop) in enumerate(zip(starts[:-1], starts[1:])):
+                if stop == start:
+                    continue
+                reader.seek(int(start))
+                points = reader.read_points(int(stop - start))
+                for name in dimension_names:
+                    values = np.asarray(points[name])
+                    if values.ndim > 1:
+                        values = values.reshape(-1)
+                    if name not in mins:
+                        mins[name] = np.zeros(len(starts) - 1, values.dtype)
+                        maxs[name] = np.zeros(len(starts) - 1, values.dtype)
+                    mins[name][zone] = values.min()
+                    maxs[name][zone] = values.max()
+        finally:
+            reader.seek(position)
+
+        return cls(starts, mins, maxs)
+
+    def zones_matching(self, where: Where, header: LasHeader) -> np.ndarray:
+        """Returns the boolean mask of the zones that may contain points matching
+        the `where` filter.
+        """
+        mask = np.diff(self.starts) > 0
+        for name, condition in where.items():
+            raw_name, axis = SCALED_COORDINATES.get(name, (name, None))
+            try:
+                mins, maxs = self.mins[raw_name], self.maxs[raw_name]
+            except KeyError:
+                # Not in the zone map, cannot skip anything
+                continue
+            if axis is not None:
+                scale, offset = header.scales[axis], header.offsets[axis]
+                mins, maxs = mins * scale + offset, maxs * scale + offset
+                if scale < 0:
+                    mins, maxs = maxs, mins
+            mask &= _zones_may_match(mins, maxs, condition)
+        return mask
+
+    def ranges_to_read(self, where: Where, header: LasHeader) -> List[Tuple[int, int]]:
+        """Returns the [start, stop) ranges of points that may contain points
+        matching the `where` filter, adjacent matching zones are merged.
+        """
+        mask = self.zones_matching(where, header)
+        # A range starts where the mask goes from False to True
+        # and stops where it goes from True to False
+        edges = np.diff(np.concatenate(([False], mask, [False])).astype(np.int8))
+        range_starts = np.flatnonzero(edges == 1)
+        range_stops = np.flatnonzero(edges == -1)
+        return [
+            (int(self.starts[start]), int(self.starts[stop]))
+            for start, stop in zip(range_starts, range_stops)
+        ]
+
+    def check_compatible_with(self, header: LasHeader) -> None:
+        if self.point_count != header.point_count:
+            raise errors.PylasError(
+                f"The zone map describes {self.point_count} points, "
+                f"but the file has {header.point_count} points"
+            )
+
+    @classmethod
+    def read_from(cls, source: Union[str, Path, BinaryIO]) -> "ZoneMap":
+        with np.load(source, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != ZONE_MAP_VERSION:
+                raise errors.PylasError(f"Unsupported zone map version {version}")
+            mins, maxs = {}, {}
+            for key in data.files:
+                if key.startswith("min."):
+                    mins[key[4:]] = data[key]
+                elif key.startswith("max."):
+                    maxs[key[4:]] = data[key]
+            return cls(data["starts"], mins, maxs)
+
+    def write_to(self, destination: Union[str, Path, BinaryIO]) -> None:
+        arrays = {"version": np.array(ZONE_MAP_VERSION), "starts": self.starts}
+        for name in self.mins:
+            arrays[f"min.{name}"] = self.mins[name]
+            arrays[f"max.{name}"] = self.maxs[name]
+
+        if isinstance(destination, (str, Path)):
+            # np.savez would append '.npz' to the file name
+            with open(destination, mode="wb") as out:
+                np.savez(out, **arrays)
+        else:
+            np.savez(destination, **arrays)
+
+    def __repr__(self) -> str:
+        return f"<ZoneMap({self.number_of_zones} zones, {self.point_count} points)>"
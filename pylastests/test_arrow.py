@@ -0,0 +1,101 @@
+"""
+Tests related to the conversion of points from and to Apache Arrow
+"""
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas.arrow import default_column_names
+
+pa = pytest.importorskip("pyarrow")
+
+EXTRA_BYTES_LAS_PATH = Path(__file__).parent / "extrabytes.las"
+
+
+def test_to_arrow_columns(las_file_path):
+    las = pylas.read(las_file_path)
+    batch = las.to_arrow()
+
+    assert batch.num_rows == len(las.points)
+    assert batch.schema.names == default_column_names(las.point_format)
+    assert np.allclose(batch.column("x").to_numpy(), np.asarray(las.x))
+    assert np.allclose(batch.column("z").to_numpy(), np.asarray(las.z))
+    for name in las.point_format.dimension_names:
+        if name in ("X", "Y", "Z"):
+            continue
+        dim_info = las.point_format.dimension_by_name(name)
+        if dim_info.num_elements > 1 or dim_info.scales is not None:
+            continue
+        assert np.all(batch.column(name).to_numpy() == np.asarray(las[name])), name
+
+
+def test_to_arrow_raw_coordinates(simple_las_path):
+    las = pylas.read(simple_las_path)
+    batch = las.to_arrow(dimensions=["X", "classification"])
+
+    assert batch.schema.names == ["X", "classification"]
+    assert np.all(batch.column("X").to_numpy() == las.X)
+    assert np.all(batch.column("classification").to_numpy() == las.classification)
+
+
+def test_to_arrow_array_extra_bytes():
+    las = pylas.read(EXTRA_BYTES_LAS_PATH)
+    batch = las.to_arrow()
+
+    colors = batch.column("Colors")
+    assert isinstance(colors.type, pa.FixedSizeListType)
+    assert colors.type.list_size == 3
+    values = colors.flatten().to_numpy().reshape(-1, 3)
+    assert np.all(values == las.Colors)
+
+
+def test_arrow_round_trip(las_file_path):
+    las = pylas.read(las_file_path)
+    restored = pylas.LasData.from_arrow(las.to_arrow(), las.header)
+
+    assert np.all(restored.points.array == las.points.array)
+
+
+def test_write_arrow_batches(simple_las_path):
+    las = pylas.read(simple_las_path)
+
+    with pylas.open(simple_las_path) as reader:
+        batches = list(reader.iter_arrow_batches(100))
+    assert len(batches) == 11
+    assert sum(batch.num_rows for batch in batches) == len(las.points)
+
+    output = io.BytesIO()
+    with pylas.open(output, mode="w", header=las.header, closefd=False) as writer:
+        for batch in batches:
+            writer.write_arrow(batch)
+    output.seek(0)
+    written = pylas.read(output)
+
+    assert np.all(written.points.array == las.points.array)
+    assert np.allclose(written.header.mins, las.header.mins)
+
+
+def test_iter_arrow_batches_dimensions(simple_las_path):
+    las = pylas.read(simple_las_path)
+    with pylas.open(simple_las_path) as reader:
+        table = pa.Table.from_batches(
+            reader.iter_arrow_batches(
+                400, dimensions=["x", "intensity", "return_number"]
+            )
+        )
+
+    assert table.schema.names == ["x", "intensity", "return_number"]
+    assert np.allclose(table.column("x").to_numpy(), np.asarray(las.x))
+    assert np.all(table.column("return_number").to_numpy() == las.return_number)
+
+
+def test_from_arrow_unknown_column(simple_las_path):
+    las = pylas.read(simple_las_path)
+    batch = pa.RecordBatch.from_arrays([pa.array([1, 2])], names=["not_a_dimension"])
+
+    with pytest.raises(pylas.PylasError):
+        pylas.LasData.from_arrow(batch, las.header)
+
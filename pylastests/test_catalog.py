@@ -0,0 +1,88 @@
+"""
+Tests related to the header catalog
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+import pylas
+from pylas.catalog import Catalog, load_cache, read_entry
+
+
+def test_catalog_entry_matches_header(las_file_path):
+    entry = read_entry(las_file_path)
+    with open(las_file_path, mode="rb") as f:
+        header = pylas.LasHeader.read_from(f)
+
+    assert entry.version == str(header.version)
+    assert entry.point_format_id == header.point_format.id
+    assert entry.are_points_compressed == header.are_points_compressed
+    assert entry.point_count == header.point_count
+    assert list(entry.scales) == list(header.scales)
+    assert list(entry.offsets) == list(header.offsets)
+    assert list(entry.mins) == list(header.mins)
+    assert list(entry.maxs) == list(header.maxs)
+    assert entry.offset_to_point_data == header.offset_to_point_data
+    assert entry.number_of_vlrs == len(header.vlrs)
+    assert entry.size == os.path.getsize(las_file_path)
+
+
+def test_catalog_entry_of_laz_file():
+    laz_path = pylas.lib.Path(__file__).parent / "simple.laz"
+    entry = read_entry(laz_path)
+    assert entry.are_points_compressed
+    assert entry.point_format_id == 3
+    assert entry.point_count == 1065
+
+
+def test_catalog_invalid_file(tmp_path):
+    path = tmp_path / "not_las.las"
+    path.write_bytes(b"LASG" + bytes(400))
+    with pytest.raises(pylas.PylasError):
+        read_entry(path)
+
+    path.write_bytes(b"LASF" + bytes(10))
+    with pytest.raises(pylas.PylasError):
+        read_entry(path)
+
+
+def test_catalog_cache(tmp_path, simple_las_path):
+    paths = [shutil.copy(simple_las_path, tmp_path / f"{i}.las") for i in range(3)]
+    cache_path = tmp_path / "catalog.json"
+
+    catalog = Catalog.scan(paths, max_workers=2, cache_path=cache_path)
+    assert [entry.path for entry in catalog] == [os.path.abspath(p) for p in paths]
+    assert load_cache(cache_path) == {entry.path: entry for entry in catalog}
+
+    # Entries of unmodified files come from the cache
+    with open(cache_path) as f:
+        content = json.load(f)
+    for values in content["entries"]:
+        values["number_of_vlrs"] = 42
+    with open(cache_path, mode="w") as f:
+        json.dump(content, f)
+    assert all(
+        entry.number_of_vlrs == 42
+        for entry in Catalog.scan(paths, cache_path=cache_path)
+    )
+
+    # A modified file is read again
+    las = pylas.read(paths[1])
+    las.points = las.points[:10]
+    las.write(paths[1])
+    catalog = Catalog.scan(paths, cache_path=cache_path)
+    assert catalog[1].point_count == 10
+    assert catalog[1].number_of_vlrs == 0
+    assert catalog[0].number_of_vlrs == 42
+    assert load_cache(cache_path)[catalog[1].path].point_count == 10
+
+
+def test_catalog_invalid_cache_is_ignored(tmp_path, simple_las_path):
+    cache_path = tmp_path / "catalog.json"
+    cache_path.write_text("{not json")
+    catalog = Catalog.scan([simple_las_path], cache_path=cache_path)
+    assert catalog[0].point_count == 1065
+    assert load_cache(cache_path)[catalog[0].path] == catalog[0]
@@ -0,0 +1,79 @@
+"""
+Tests related to the cache of decompressed LAZ chunks
+"""
+import numpy as np
+import pytest
+
+import pylas
+from pylas.chunkcache import ChunkCache
+
+
+def test_chunk_cache_is_bounded():
+    cache = ChunkCache(max_bytes=100)
+    for i in range(10):
+        cache.put(i, np.full(30, i, np.uint8))
+    assert cache.nbytes == 90
+    assert len(cache) == 3
+    assert cache.evictions == 7
+    assert cache.get(0) is None
+    assert np.all(cache.get(9) == 9)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not cache.get(9).flags.writeable
+
+    # too big to be cached
+    cache.put("big", np.zeros(101, np.uint8))
+    assert "big" not in cache
+
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_chunk_cache_not_on_las(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        with pytest.raises(pylas.errors.LazError):
+            reader.chunk_cache = ChunkCache()
+
+
+def test_read_with_chunk_cache(laz_file_path):
+    las = pylas.read(laz_file_path)
+    rng = np.random.default_rng(0)
+    indices = rng.integers(0, len(las.points), 200)
+
+    with pylas.open(laz_file_path) as reader:
+        cache = ChunkCache()
+        reader.chunk_cache = cache
+        assert np.all(reader.read_points(10).array == las.points.array[:10])
+        assert np.all(reader.read_points_at(indices).array == las.points.array[indices])
+        misses = cache.misses
+        assert misses > 0
+
+        # Everything is in the cache now
+        assert np.all(reader.read_points_at(indices).array == las.points.array[indices])
+        assert cache.misses == misses
+        assert cache.hits > 0
+
+        reader.seek(len(las.points) // 2)
+        assert np.all(
+            reader.read().points.array == las.points.array[len(las.points) // 2 :]
+        )
+
+
+def test_remove_chunk_cache(laz_file_path):
+    las = pylas.read(laz_file_path)
+    with pylas.open(laz_file_path) as reader:
+        reader.chunk_cache = ChunkCache()
+        reader.seek(5)
+        reader.read_points(5)
+        reader.chunk_cache = None
+        assert np.all(reader.read_points(10).array == las.points.array[10:20])
+
+
+def test_chunk_cache_shared_by_readers(laz_file_path):
+    cache = ChunkCache()
+    las = pylas.read(laz_file_path)
+    with pylas.open(laz_file_path) as reader1, pylas.open(laz_file_path) as reader2:
+        reader1.chunk_cache = cache
+        reader2.chunk_cache = cache
+        reader1.read_points(10)
+        assert np.all(reader2.read_points(20).array == las.points.array[:20])
+        assert cache.hits == 0
@@ -1,6 +1,7 @@
 """
 Tests related to the 'chunked' reading and writing
 """
+import copy
 import io
 import math
 
@@ -72,3 +73,393 @@ def check_chunked_reading_is_gives_expected_points(groundtruth_las, reader, iter
         expected_points = groundtruth_las.points[i * iter_size: (i + 1) * iter_size]
         for dim_name in points.array.dtype.names:
             assert np.allclose(expected_points[dim_name], points[dim_name]), f"{dim_name} not equal"
+
+
+def test_chunked_reading_only_some_dimensions(las_file_path):
+    """
+    Test that reading with a subset of dimensions gives compact
+    records with the expected values
+    """
+    las = pylas.read(las_file_path)
+    dimensions = ["x", "y", "z", "classification", "intensity"]
+    iter_size = 50
+
+    with pylas.open(las_file_path) as reader:
+        for i, points in enumerate(reader.chunk_iterator(iter_size, dimensions=dimensions)):
+            expected_points = las.points[i * iter_size: (i + 1) * iter_size]
+            assert points.point_size < las.points.point_size
+            assert np.allclose(points.x, las.x[i * iter_size: (i + 1) * iter_size])
+            assert np.allclose(points.z, las.z[i * iter_size: (i + 1) * iter_size])
+            for name in ("X", "Y", "classification", "intensity"):
+                assert np.all(points[name] == expected_points[name])
+
+            with pytest.raises(AttributeError):
+                points.gps_time
+
+
+def test_reading_dimensions_by_blocks(las_file_path, monkeypatch):
+    """
+    Test that the points projected block by block are the same
+    as the ones read in one go
+    """
+    las = pylas.read(las_file_path)
+    monkeypatch.setattr(
+        pylas.lasreader, "PROJECTION_BUFFER_SIZE", 7 * las.points.point_size
+    )
+    with pylas.open(las_file_path) as reader:
+        reader.read_points(3)
+        points = reader.read_points(100, dimensions=["x", "classification"])
+        assert reader.read_points(1)["X"][0] == las.X[103]
+
+    assert len(points) == 100
+    assert points.array.dtype.itemsize < las.points.point_size
+    assert np.all(points["X"] == las.X[3:103])
+    assert np.all(points.classification == las.classification[3:103])
+
+
+def test_projected_points_cannot_be_written(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        header = reader.header
+        points = reader.read_points(10, dimensions=["x"])
+
+    with io.BytesIO() as output:
+        with pylas.open(output, mode="w", header=header, closefd=False) as writer:
+            with pytest.raises(pylas.PylasError):
+                writer.write_points(points)
+
+
+@pytest.mark.parametrize("prefetch", [1, 3])
+def test_prefetched_chunked_reading_gives_expected_points(las_file_path, prefetch):
+    """
+    Test that reading chunks in a background thread gives the same points
+    """
+    las = pylas.read(las_file_path)
+    iter_size = 50
+    with pylas.open(las_file_path) as reader:
+        num_chunks = 0
+        for i, points in enumerate(reader.chunk_iterator(iter_size, prefetch=prefetch)):
+            assert points == las.points[i * iter_size: (i + 1) * iter_size]
+            num_chunks += 1
+    assert num_chunks == math.ceil(len(las.points) / iter_size)
+
+
+def test_prefetched_chunked_reading_can_stop_early(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        with reader.chunk_iterator(10, prefetch=2) as iterator:
+            next(iterator)
+        with pytest.raises(StopIteration):
+            next(iterator)
+        assert reader.read_points(1) is not None
+
+
+def test_dropped_prefetching_iterator_stops_its_thread(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        iterator = reader.chunk_iterator(10, prefetch=2)
+        next(iterator)
+        thread = iterator._thread
+        del iterator
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert reader.read_points(1) is not None
+
+
+def test_closing_reader_stops_the_prefetching_thread(las_file_path):
+    reader = pylas.open(las_file_path)
+    iterator = reader.chunk_iterator(10, prefetch=2)
+    reader.close()
+    assert not iterator._thread.is_alive()
+
+
+def test_prefetched_chunked_reading_raises_errors(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        def failing_read(n):
+            raise pylas.PylasError("Read failed")
+
+        reader.point_source.read_n_points = failing_read
+        with pytest.raises(pylas.PylasError):
+            for _ in reader.chunk_iterator(10, prefetch=2):
+                pass
+
+
+def test_read_points_into(las_file_path):
+    las = pylas.read(las_file_path)
+    with pylas.open(las_file_path) as reader:
+        points = pylas.point.record.PackedPointRecord.zeros(reader.header.point_format, 100)
+        n = reader.read_points_into(points)
+        assert n == min(100, len(las.points))
+        assert points[:n] == las.points[:n]
+
+        array = np.zeros(20, reader.header.point_format.dtype())
+        n = reader.read_points_into(array)
+        assert np.all(array[:n] == las.points.array[100:100 + n])
+
+        with pytest.raises(pylas.errors.IncompatibleDataFormat):
+            reader.read_points_into(np.zeros(10, np.uint8))
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_chunked_reading_into_buffers(las_file_path, prefetch):
+    las = pylas.read(las_file_path)
+    iter_size = 50
+    with pylas.open(las_file_path) as reader:
+        buffers = [np.zeros(iter_size, reader.header.point_format.dtype()) for _ in range(4)]
+        for i, points in enumerate(reader.chunk_iterator(iter_size, prefetch=prefetch, buffers=buffers)):
+            assert points == las.points[i * iter_size: (i + 1) * iter_size]
+            assert np.shares_memory(points.array, buffers[i % len(buffers)])
+
+
+def test_chunked_reading_not_enough_buffers_to_prefetch(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        with pytest.raises(ValueError):
+            reader.chunk_iterator(10, prefetch=2, buffers=3)
+
+
+@pytest.mark.parametrize("backend", pylas.LazBackend.detect_available() + (None,))
+@pytest.mark.parametrize("copy_points", [True, False])
+def test_background_writing_gives_expected_points(file_path, backend, copy_points):
+    original_las = pylas.read(file_path)
+    iter_size = 51
+
+    with io.BytesIO() as tmp_output:
+        with pylas.LasWriter(
+            tmp_output,
+            original_las.header,
+            do_compress=backend is not None,
+            laz_backend=backend,
+            closefd=False,
+            queue_size=2,
+        ) as writer:
+            for i in range(0, len(original_las.points), iter_size):
+                points = original_las.points[i: i + iter_size]
+                if not copy_points:
+                    points = pylas.point.record.PackedPointRecord(points.array.copy(), points.point_format)
+                writer.write_points(points, copy=copy_points)
+            writer.flush()
+            assert writer.header.point_count == len(original_las.points)
+
+        tmp_output.seek(0)
+        las = pylas.read(tmp_output)
+        assert las.points == original_las.points
+        assert np.allclose(las.header.mins, original_las.header.mins)
+        assert np.allclose(las.header.maxs, original_las.header.maxs)
+
+
+def test_background_writing_copies_points(simple_las_path):
+    original_las = pylas.read(simple_las_path)
+    points = original_las.points[:100]
+    expected = points.array.copy()
+
+    with io.BytesIO() as tmp_output:
+        with pylas.LasWriter(tmp_output, original_las.header, closefd=False, queue_size=1) as writer:
+            writer.write_points(points)
+            points.array["intensity"] = 0
+        tmp_output.seek(0)
+        las = pylas.read(tmp_output)
+        assert np.all(las.points.array == expected)
+
+
+def test_background_writing_raises_errors(simple_las_path):
+    las = pylas.read(simple_las_path)
+
+    class FailingStream(io.BytesIO):
+        fail = False
+
+        def write(self, data):
+            if self.fail:
+                raise OSError("disk full")
+            return super().write(data)
+
+    stream = FailingStream()
+    writer = pylas.LasWriter(stream, las.header, queue_size=1)
+    stream.fail = True
+    with pytest.raises(OSError):
+        writer.write_points(las.points[:10])
+        writer.flush()
+    with pytest.raises(OSError):
+        writer.write_points(las.points[10:20])
+    with pytest.raises(OSError):
+        writer.close()
+    assert not writer._background_writer._thread.is_alive()
+
+
+@pytest.mark.parametrize("backend", pylas.LazBackend.detect_available() + (None,))
+@pytest.mark.parametrize("queue_size", [0, 2])
+def test_buffered_small_writes_give_same_file(file_path, backend, queue_size):
+    original_las = pylas.read(file_path)
+    point_size = original_las.header.point_format.size
+
+    def write(buffer_size):
+        with io.BytesIO() as output:
+            with pylas.LasWriter(
+                output,
+                copy.deepcopy(original_las.header),
+                do_compress=backend is not None,
+                laz_backend=backend,
+                closefd=False,
+                queue_size=queue_size,
+                buffer_size=buffer_size,
+            ) as writer:
+                for i in range(0, len(original_las.points), 7):
+                    writer.write_points(original_las.points[i: i + 7])
+            return output.getvalue()
+
+    unbuffered = write(buffer_size=0)
+    assert write(buffer_size=100 * point_size) == unbuffered
+    assert write(buffer_size=10_000 * point_size) == unbuffered
+
+
+def test_buffer_coalesces_small_writes(simple_las_path):
+    las = pylas.read(simple_las_path)
+    point_size = las.header.point_format.size
+
+    with io.BytesIO() as output:
+        with pylas.LasWriter(output, las.header, closefd=False, buffer_size=500 * point_size) as writer:
+            sizes = []
+            write_points = writer.point_writer.write_points
+            writer.point_writer.write_points = lambda points: (
+                sizes.append(len(points)), write_points(points)
+            )
+            for i in range(0, len(las.points), 10):
+                writer.write_points(las.points[i: i + 10])
+            writer.write_points(las.points[:600])
+        assert sizes == [500, 500, 500, 165]
+
+
+def test_buffer_is_allocated_by_small_writes(simple_las_path):
+    las = pylas.read(simple_las_path)
+    point_size = las.header.point_format.size
+
+    with io.BytesIO() as output:
+        with pylas.LasWriter(output, las.header, closefd=False) as writer:
+            writer.write_points(las.points[:10])
+            assert writer._buffer is None
+            assert writer.header.point_count == 10
+
+        with pylas.LasWriter(output, las.header, closefd=False, buffer_size=500 * point_size) as writer:
+            writer.write_points(las.points[:600])
+            assert writer._buffer is None
+            writer.write_points(las.points[:10])
+            assert len(writer._buffer) == 500
+            assert writer.header.point_count == 600
+            writer.flush()
+            assert writer.header.point_count == 610
+
+
+lazrs_backends = [
+    backend
+    for backend in (pylas.LazBackend.Lazrs, pylas.LazBackend.LazrsParallel)
+    if backend.is_available()
+]
+
+
+@pytest.mark.parametrize("backend", lazrs_backends)
+def test_writing_with_chunk_size(simple_las_path, backend):
+    las = pylas.read(simple_las_path)
+    with io.BytesIO() as output:
+        with pylas.LasWriter(
+            output, copy.deepcopy(las.header), laz_backend=backend, closefd=False, chunk_size=100
+        ) as writer:
+            writer.write_points(las.points)
+        output.seek(0)
+        with pylas.open(output, closefd=False) as reader:
+            assert reader._laszip_vlr.chunk_size == 100
+            assert len(reader.read_chunk_table()) == 11
+            assert reader.read().points == las.points
+
+
+@pytest.mark.parametrize("backend", lazrs_backends)
+@pytest.mark.parametrize("queue_size", [0, 2])
+def test_writing_variable_size_chunks(simple_las_path, backend, queue_size):
+    las = pylas.read(simple_las_path)
+    grid = pylas.tiling.TileGrid(1000.0, origin=(las.header.x_min, las.header.y_min))
+    cells = list(grid.split(las.points, las.header))
+
+    with io.BytesIO() as output:
+        with pylas.LasWriter(
+            output,
+            copy.deepcopy(las.header),
+            laz_backend=backend,
+            closefd=False,
+            queue_size=queue_size,
+            variable_chunk_size=True,
+            chunk_size=200,
+        ) as writer:
+            for _, points in cells:
+                for i in range(0, len(points), 50):
+                    writer.write_points(points[i: i + 50])
+                writer.end_chunk()
+        output.seek(0)
+
+        with pylas.open(output, closefd=False) as reader:
+            first_points = reader._first_point_of_chunks()
+            expected = np.cumsum([0] + [
+                size for _, points in cells for size in [200] * (len(points) // 200) + [len(points) % 200] if size
+            ])
+            assert np.all(first_points == expected)
+
+            # Chunks are aligned to cells, a query on one cell only reads its chunks
+            zone_map = pylas.ZoneMap.build(reader)
+            (tile, cell_points) = cells[0]
+            min_x, min_y, max_x, max_y = grid.tile_bounds(tile)
+            ranges = zone_map.ranges_to_read(
+                {"x": (min_x, max_x - 0.01), "y": (min_y, max_y - 0.01)}, reader.header
+            )
+            assert sum(stop - start for start, stop in ranges) == len(cell_points)
+
+            written = reader.read()
+            assert written.points == pylas.point.record.PackedPointRecord(
+                np.concatenate([points.array for _, points in cells]), las.point_format
+            )
+
+
+def test_end_chunk_needs_variable_size_chunks(simple_las_path):
+    las = pylas.read(simple_las_path)
+    with pylas.LasWriter(io.BytesIO(), las.header) as writer:
+        writer.end_chunk()  # Nothing to do for LAS
+    if lazrs_backends:
+        with pylas.LasWriter(io.BytesIO(), copy.deepcopy(las.header), laz_backend=lazrs_backends[0]) as writer:
+            with pytest.raises(pylas.errors.LazError):
+                writer.end_chunk()
+
+
+@pytest.mark.skipif(not lazrs_backends, reason="needs lazrs")
+def test_installed_lazrs_supports_variable_size_chunks():
+    assert pylas.compression.lazrs_version() >= pylas.compression.LAZRS_MIN_VERSION
+    assert all(backend.supports_variable_chunk_size() for backend in lazrs_backends)
+
+
+@pytest.mark.skipif(not lazrs_backends, reason="needs lazrs")
+def test_variable_size_chunks_need_a_capable_lazrs(simple_las_path, monkeypatch):
+    monkeypatch.setattr(pylas.compression, "lazrs_version", lambda: (0, 2, 5))
+    las = pylas.read(simple_las_path)
+    with pytest.raises(pylas.PylasError):
+        pylas.LasWriter(
+            io.BytesIO(),
+            copy.deepcopy(las.header),
+            laz_backend=lazrs_backends[0],
+            variable_chunk_size=True,
+        )
+
+
+def test_open_forwards_writer_options(simple_las_path):
+    las = pylas.read(simple_las_path)
+    with io.BytesIO() as output:
+        with pylas.open(
+            output,
+            mode="w",
+            header=las.header,
+            closefd=False,
+            queue_size=2,
+            buffer_size=100 * las.header.point_format.size,
+            trust_header=True,
+        ) as writer:
+            assert writer._background_writer is not None
+            assert writer._buffer_point_count == 100
+            assert writer._buffer is None
+            assert writer.trust_header
+            writer.write_points(las.points)
+        output.seek(0)
+        assert pylas.read(output).points == las.points
+
+    with pytest.raises(pylas.PylasError):
+        pylas.open(simple_las_path, queue_size=2)
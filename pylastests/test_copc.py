@@ -0,0 +1,248 @@
+"""
+Tests related to COPC (Cloud Optimized Point Cloud) files
+"""
+import concurrent.futures
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas import copc, lazchunktable
+from pylas.vlrs.known import CopcInfoVlr
+
+SIMPLE_LAZ_PATH = Path(__file__).parent / "simple.laz"
+
+lazrs_backends = [
+    backend
+    for backend in (pylas.LazBackend.LazrsParallel, pylas.LazBackend.Lazrs)
+    if backend.is_available()
+]
+
+pytestmark = pytest.mark.skipif(not lazrs_backends, reason="COPC files need lazrs")
+
+
+def read_hierarchy(data: bytes, info: CopcInfoVlr):
+    """Returns all the node entries, following the pages"""
+    pages = [(info.root_hierarchy_offset, info.root_hierarchy_size)]
+    nodes = []
+    while pages:
+        offset, size = pages.pop()
+        for entry in copc.decode_page(data[offset : offset + size]):
+            if entry.point_count == -1:
+                pages.append((entry.offset, entry.byte_size))
+            else:
+                nodes.append(entry)
+    return sorted(nodes)
+
+
+def sorted_points(points):
+    return np.sort(points.array, order=["X", "Y", "Z", "gps_time"])
+
+
+@pytest.mark.parametrize("backend", lazrs_backends)
+@pytest.mark.parametrize("hierarchy_page_levels", [None, 1])
+@pytest.mark.parametrize("memory_limit", [copc.DEFAULT_MEMORY_LIMIT, 1000])
+def test_write_copc(file_path, backend, hierarchy_page_levels, memory_limit):
+    output = io.BytesIO()
+    written_nodes = copc.write_copc(
+        file_path,
+        output,
+        max_depth=2,
+        grid_size=4,
+        points_per_iteration=100,
+        memory_limit=memory_limit,
+        hierarchy_page_levels=hierarchy_page_levels,
+        laz_backend=backend,
+    )
+    data = output.getvalue()
+    las = pylas.read(io.BytesIO(data))
+    original = pylas.read(file_path)
+
+    assert las.header.version == pylas.header.Version(1, 4)
+    assert las.header.point_format.id in copc.COPC_POINT_FORMATS
+    assert data[377:381] == b"copc"
+    info = las.header.vlrs[0]
+    assert isinstance(info, CopcInfoVlr)
+    assert info.spacing == pytest.approx(2 * info.halfsize / 4)
+
+    converted = pylas.convert(original, point_format_id=las.header.point_format.id)
+    assert np.all(sorted_points(las.points) == sorted_points(converted.points))
+
+    nodes = read_hierarchy(data, info)
+    assert nodes == written_nodes
+    assert nodes[0].key == copc.VoxelKey(0, 0, 0, 0)
+    assert max(node.key.level for node in nodes) <= 2
+
+    # Each node is a chunk of the file, written breadth first
+    with pylas.open(io.BytesIO(data)) as reader:
+        chunk_table = reader.read_chunk_table()
+        starts = lazchunktable.chunk_starts(
+            chunk_table, reader.header.offset_to_point_data
+        )
+    assert [e.point_count for e in chunk_table] == [n.point_count for n in nodes]
+    assert [e.byte_count for e in chunk_table] == [n.byte_size for n in nodes]
+    assert list(starts[:-1]) == [n.offset for n in nodes]
+
+    octree = copc.Octree(info.center, info.halfsize)
+    first_point = 0
+    for node in nodes:
+        points = las.points[first_point : first_point + node.point_count]
+        first_point += node.point_count
+        mins, maxs = octree.node_bounds(node.key)
+        xyz = np.stack([points[name] for name in "XYZ"], axis=1)
+        xyz = xyz * las.header.scales + las.header.offsets
+        assert np.all(xyz >= mins - 1e-6) and np.all(xyz <= maxs + 1e-6)
+        if node.key.level < 2:
+            # At most one point per sampling cell
+            cells = octree.cells(xyz, 4 << node.key.level)
+            assert len(np.unique(cells, axis=0)) == len(cells)
+
+
+def test_write_copc_to_path(simple_las_path, tmp_path):
+    path = tmp_path / "simple.copc.laz"
+    nodes = copc.write_copc(simple_las_path, path, grid_size=8)
+
+    las = pylas.read(path)
+    assert len(las.points) == sum(node.point_count for node in nodes)
+    assert las.header.vlrs[0].gps_time_minimum == pytest.approx(las.gps_time.min())
+
+
+def test_default_max_depth():
+    assert copc.default_max_depth(0, 128) == 0
+    assert copc.default_max_depth(128 ** 2 + 1, 128) == 1
+    assert copc.default_max_depth(10 ** 20, 128) == copc._deepest_level(128)
+
+
+def test_pages_point_to_their_subtrees():
+    keys = [copc.VoxelKey(0, 0, 0, 0)]
+    keys += copc.VoxelKey(0, 0, 0, 0).children()[:2]
+    keys += keys[1].children()[:3]
+    pages = copc._paginate(keys, 1)
+
+    root_nodes, root_sub_pages = pages[copc.VoxelKey(0, 0, 0, 0)]
+    assert root_nodes == [copc.VoxelKey(0, 0, 0, 0)]
+    assert root_sub_pages == keys[1:3]
+    assert pages[keys[1]] == ([keys[1]], keys[3:])
+    assert pages[keys[3]] == ([keys[3]], [])
+
+
+@pytest.fixture()
+def copc_path(tmp_path):
+    path = tmp_path / "simple.copc.laz"
+    copc.write_copc(
+        SIMPLE_LAZ_PATH,
+        path,
+        max_depth=3,
+        grid_size=4,
+        hierarchy_page_levels=1,
+    )
+    return path
+
+
+@pytest.mark.parametrize("backend", lazrs_backends)
+def test_query_levels_of_detail(copc_path, backend):
+    las = pylas.read(copc_path)
+    with copc.CopcReader.open(copc_path, laz_backend=backend) as reader:
+        nodes = reader.nodes()
+        all_points = reader.query()
+        assert np.all(sorted_points(all_points) == sorted_points(las.points))
+
+        for depth in range(4):
+            points = reader.query(max_depth=depth)
+            expected = sum(n.point_count for n in nodes if n.key.level <= depth)
+            assert len(points) == expected
+            # Points come level after level, in the order of the file
+            assert np.all(points.array == las.points.array[:expected])
+
+        spacing = reader.copc_info.spacing
+        assert reader.depth_of_resolution(spacing) == 0
+        assert reader.depth_of_resolution(spacing / 3) == 2
+        assert len(reader.query(resolution=spacing / 2)) == len(
+            reader.query(max_depth=1)
+        )
+
+
+@pytest.mark.parametrize("backend", lazrs_backends)
+def test_query_bounds(copc_path, backend):
+    las = pylas.read(copc_path)
+    x, y = np.asarray(las.x), np.asarray(las.y)
+    bounds = (x.min() + 300, y.min() + 200, x.min() + 900, y.min() + 1000)
+    expected = las.points.array[
+        (x >= bounds[0]) & (x <= bounds[2]) & (y >= bounds[1]) & (y <= bounds[3])
+    ]
+
+    with copc.CopcReader.open(copc_path, laz_backend=backend) as reader:
+        points = reader.query(bounds=bounds, dimensions=["x", "y", "classification"])
+        pages_read = reader.hierarchy.number_of_pages_read
+        assert pages_read < len(copc._paginate([n.key for n in reader.nodes()], 1))
+
+        assert len(points) == len(expected)
+        assert np.all(np.sort(points.array["X"]) == np.sort(expected["X"]))
+        assert points.array.dtype.names == ("X", "Y", "classification")
+
+        z = np.asarray(las.z)
+        bounds_3d = bounds[:2] + (z.min(),) + bounds[2:] + (np.median(z),)
+        assert len(reader.query(bounds=bounds_3d)) == np.count_nonzero(
+            (np.asarray(expected["Z"]) * las.header.scales[2] + las.header.offsets[2])
+            <= np.median(z)
+        )
+
+        empty = reader.query(bounds=(0.0, 0.0, 1.0, 1.0))
+        assert len(empty) == 0
+
+
+@pytest.mark.parametrize("backend", lazrs_backends)
+def test_query_bounds_the_nodes_in_flight(copc_path, backend, monkeypatch):
+    monkeypatch.setattr(copc, "MAX_NODES_PER_TASK", 1)
+
+    class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+        submitted = 0
+
+        def submit(self, *args, **kwargs):
+            self.submitted += 1
+            return super().submit(*args, **kwargs)
+
+    las = pylas.read(copc_path)
+    with copc.CopcReader.open(copc_path, laz_backend=backend) as reader:
+        nodes = reader.nodes()
+        assert len(nodes) > 2
+        with CountingExecutor(max_workers=1) as executor:
+            decompressed = reader._iter_decompressed_nodes(nodes, 1, executor)
+            first = next(decompressed)
+            assert executor.submitted == 2
+            rest = list(decompressed)
+            assert executor.submitted == len(nodes)
+
+    array = np.frombuffer(first, las.points.array.dtype)
+    for points_data in rest:
+        array = np.concatenate([array, np.frombuffer(points_data, array.dtype)])
+    assert np.all(array == las.points.array)
+
+
+def test_copc_reader_needs_copc_file(simple_las_path):
+    with pytest.raises(pylas.PylasError):
+        copc.CopcReader.open(simple_las_path)
+
+
+def test_occupied_cells_count_against_memory_limit(tmp_path):
+    las = pylas.read(SIMPLE_LAZ_PATH)
+    points = las.points
+    xyz = np.stack([np.asarray(las.x), np.asarray(las.y), np.asarray(las.z)], axis=1)
+    octree = copc.Octree.from_bounds(las.header.mins, las.header.maxs)
+
+    store = copc._NodeStore(tmp_path, memory_limit=copc.DEFAULT_MEMORY_LIMIT)
+    builder = copc._OctreeBuilder(octree, 2, 4, store)
+    builder.add(points[:500], xyz[:500])
+    builder.add(points[500:], xyz[500:])
+
+    # One cell id (uint32) per point of the non-leaf nodes
+    non_leaf_points = sum(n for key, n in store.point_counts.items() if key.level < 2)
+    assert store.reserved_bytes == 4 * non_leaf_points
+    assert sum(store.point_counts.values()) == len(points)
+
+    # Once the cells alone reach the limit, points are not kept in memory
+    store.memory_limit = store.reserved_bytes
+    builder.add(points[:10], xyz[:10])
+    assert store._buffered_bytes == 0
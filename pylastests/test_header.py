@@ -1,5 +1,7 @@
 import io
 
+import numpy as np
+
 import pylas
 from pylas import LasHeader
 from pylastests import test_common
@@ -132,3 +134,48 @@ def test_header_date():
     expected_date = date(year=2015, month=2, day=22)
     assert las.header.creation_date == expected_date
     assert las.header.creation_date == header_2.creation_date
+
+
+def test_update_computes_header_statistics(las_file_path):
+    las = pylas.read(las_file_path)
+    header = LasHeader(point_format=las.header.point_format, version=las.header.version)
+    header.scales, header.offsets = las.header.scales, las.header.offsets
+    header.partial_reset()
+    header.mins = np.full(3, np.finfo("f8").max)
+    header.maxs = np.full(3, np.finfo("f8").min)
+
+    half = len(las.points) // 2
+    header.update(las.points[:half])
+    header.update(las.points[half:])
+
+    assert header.point_count == len(las.points)
+    assert np.allclose(header.mins, [np.min(las.x), np.min(las.y), np.min(las.z)])
+    assert np.allclose(header.maxs, [np.max(las.x), np.max(las.y), np.max(las.z)])
+    expected = np.bincount(las.return_number, minlength=16)[1:16]
+    assert np.all(header.number_of_points_by_return == expected)
+
+
+def test_update_header_with_negative_scale():
+    las = pylas.read(test_common.simple_las)
+    las.header.x_scale = -0.01
+    las.update_header()
+    assert las.header.x_min == np.min(las.x)
+    assert las.header.x_max == np.max(las.x)
+
+
+def test_writer_trusts_header(simple_las_path):
+    las = pylas.read(simple_las_path)
+    las.header.mins = np.array([1.0, 2.0, 3.0])
+    las.header.maxs = np.array([4.0, 5.0, 6.0])
+    las.header.number_of_points_by_return[:] = 7
+
+    with io.BytesIO() as output:
+        with pylas.LasWriter(output, las.header, closefd=False, trust_header=True) as writer:
+            writer.write_points(las.points)
+        output.seek(0)
+        header = pylas.read(output).header
+
+    assert header.point_count == len(las.points)
+    assert np.all(header.mins == [1.0, 2.0, 3.0])
+    assert np.all(header.maxs == [4.0, 5.0, 6.0])
+    assert np.all(header.number_of_points_by_return[:5] == 7)
@@ -0,0 +1,96 @@
+"""
+Tests related to LasDataset
+"""
+import numpy as np
+import pytest
+
+import pylas
+from pylas.lasdataset import GridIndex, LasDataset
+
+
+@pytest.fixture()
+def tiles_directory(tmp_path, simple_las_path):
+    """Splits simple.las in 4 tiles, written in a temporary directory"""
+    las = pylas.read(simple_las_path)
+    x, y = np.asarray(las.x), np.asarray(las.y)
+    mid_x, mid_y = np.median(x), np.median(y)
+    for i, x_mask in enumerate([x < mid_x, x >= mid_x]):
+        for j, y_mask in enumerate([y < mid_y, y >= mid_y]):
+            tile = pylas.create(
+                point_format=las.header.point_format.id, file_version="1.2"
+            )
+            tile.header.scales = las.header.scales
+            tile.header.offsets = las.header.offsets
+            tile.points = las.points[x_mask & y_mask]
+            tile.write(str(tmp_path / f"tile_{i}_{j}.las"))
+    return tmp_path
+
+
+def test_dataset_headers(tiles_directory, simple_las_path):
+    las = pylas.read(simple_las_path)
+    with LasDataset.from_directory(tiles_directory) as dataset:
+        assert len(dataset) == 4
+        assert dataset.point_count == len(las.points)
+        assert np.allclose(dataset.mins, las.header.mins)
+        assert np.allclose(dataset.maxs, las.header.maxs)
+        # Only the headers were read
+        assert len(dataset.readers) == 0
+
+
+def test_dataset_chunk_iterator(tiles_directory):
+    with LasDataset.from_directory(tiles_directory, max_open_readers=2) as dataset:
+        chunks = list(dataset.chunk_iterator(100))
+        assert len(dataset.readers) <= 2
+
+        expected = np.concatenate(
+            [pylas.read(f.path).points.array for f in dataset.files]
+        )
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert np.all(np.concatenate([chunk.array for chunk in chunks]) == expected)
+
+
+def test_dataset_query(tiles_directory, simple_las_path):
+    las = pylas.read(simple_las_path)
+    x, y = np.asarray(las.x), np.asarray(las.y)
+
+    with LasDataset.from_directory(tiles_directory, max_open_readers=1) as dataset:
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            min_x, max_x = np.sort(rng.uniform(x.min(), x.max(), 2))
+            min_y, max_y = np.sort(rng.uniform(y.min(), y.max(), 2))
+            rectangle = (min_x, min_y, max_x, max_y)
+
+            points = [p.array for p in dataset.query(rectangle, 50)]
+            points = np.concatenate(points) if points else las.points.array[:0]
+            mask = (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+            expected = las.points.array[mask]
+            assert np.all(np.sort(points, order="X") == np.sort(expected, order="X"))
+            assert len(dataset.readers) <= 1
+
+
+def test_dataset_query_only_opens_intersecting_files(tiles_directory):
+    with LasDataset.from_directory(tiles_directory) as dataset:
+        first = dataset.files[0]
+        rectangle = (first.mins[0], first.mins[1], first.mins[0], first.mins[1])
+        intersecting = dataset.files_intersecting(rectangle)
+        assert first in intersecting
+
+        list(dataset.query(rectangle))
+        assert len(dataset.readers) == len(intersecting)
+
+        assert dataset.files_intersecting((0.0, 0.0, 1.0, 1.0)) == []
+
+
+def test_grid_index_matches_brute_force(tiles_directory):
+    with LasDataset.from_directory(tiles_directory) as dataset:
+        grid = GridIndex(dataset.files)
+        mins, maxs = dataset.mins, dataset.maxs
+        rng = np.random.default_rng(1)
+        for _ in range(50):
+            min_x, max_x = np.sort(rng.uniform(mins[0] - 10, maxs[0] + 10, 2))
+            min_y, max_y = np.sort(rng.uniform(mins[1] - 10, maxs[1] + 10, 2))
+            rectangle = (min_x, min_y, max_x, max_y)
+            expected = [
+                i for i, f in enumerate(dataset.files) if f.intersects(rectangle)
+            ]
+            assert grid.query(rectangle) == expected
@@ -0,0 +1,160 @@
+"""
+Tests related to LAX spatial indexes
+"""
+import io
+import shutil
+import struct
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas.lax import LaxIndex, QuadTree, lax_path
+
+
+def random_rectangles(las, count=20):
+    x, y = np.asarray(las.x), np.asarray(las.y)
+    rng = np.random.default_rng(42)
+    for _ in range(count):
+        min_x, max_x = np.sort(rng.uniform(x.min(), x.max(), 2))
+        min_y, max_y = np.sort(rng.uniform(y.min(), y.max(), 2))
+        yield min_x, min_y, max_x, max_y
+
+
+def points_in(las, rectangle):
+    min_x, min_y, max_x, max_y = rectangle
+    x, y = np.asarray(las.x), np.asarray(las.y)
+    mask = (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+    return las.points.array[mask]
+
+
+def test_quadtree_cell_bounds_contain_points(las_file_path):
+    las = pylas.read(las_file_path)
+    header = las.header
+    quadtree = QuadTree.covering(
+        header.x_min, header.x_max, header.y_min, header.y_max, 10.0
+    )
+    x, y = np.asarray(las.x), np.asarray(las.y)
+    cells = quadtree.cell_indices(x, y)
+    assert np.all(quadtree.levels_of(cells) == quadtree.levels)
+    min_x, min_y, max_x, max_y = quadtree.cells_bounds(cells)
+    assert np.all((x >= min_x) & (x < max_x))
+    assert np.all((y >= min_y) & (y < max_y))
+
+    cell_index = int(cells[0])
+    assert quadtree.cell_bounds(cell_index) == (
+        min_x[0],
+        min_y[0],
+        max_x[0],
+        max_y[0],
+    )
+    parent_bounds = quadtree.cell_bounds(int(quadtree.parents(cells[:1])[0]))
+    assert parent_bounds[0] <= min_x[0] and max_x[0] <= parent_bounds[2]
+
+
+def test_lax_read_write(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        index = LaxIndex.build(reader, cell_size=10.0, minimum_points=0)
+        assert index.number_of_points == reader.header.point_count
+
+    out = io.BytesIO()
+    index.write_to(out)
+    out.seek(0)
+    read_index = LaxIndex.read_from(out)
+
+    assert read_index.quadtree.levels == index.quadtree.levels
+    assert read_index.quadtree.min_x == index.quadtree.min_x
+    assert read_index.quadtree.max_y == index.quadtree.max_y
+    assert read_index.point_counts == index.point_counts
+    assert read_index.cells.keys() == index.cells.keys()
+    for cell_index, intervals in index.cells.items():
+        assert np.all(read_index.cells[cell_index] == intervals)
+
+
+def test_read_lax_without_spatial_signature():
+    data = b"LASX" + struct.pack("<I", 0)
+    data += b"LASQ" + struct.pack("<4I", 0, 1, 0, 0)
+    data += struct.pack("<4f", 0.0, 10.0, 0.0, 10.0)
+    data += b"LASV" + struct.pack("<Ii", 0, 2)
+    data += struct.pack("<iII", 1, 1, 5) + struct.pack("<2I", 0, 4)
+    data += struct.pack("<iII", 4, 2, 3) + struct.pack("<4I", 5, 5, 8, 9)
+
+    index = LaxIndex.read_from(io.BytesIO(data))
+    assert index.quadtree.levels == 1
+    assert index.point_counts == {1: 5, 4: 3}
+    assert index.quadtree.cell_bounds(1) == (0.0, 0.0, 5.0, 5.0)
+    assert index.quadtree.cell_bounds(4) == (5.0, 5.0, 10.0, 10.0)
+    assert index.intervals_intersecting((1.0, 1.0, 2.0, 2.0)) == [(0, 5)]
+    assert index.intervals_intersecting((6.0, 6.0, 7.0, 7.0)) == [(5, 6), (8, 10)]
+    assert index.intervals_intersecting((1.0, 1.0, 7.0, 7.0)) == [(0, 6), (8, 10)]
+    assert index.intervals_intersecting((11.0, 11.0, 12.0, 12.0)) == []
+
+
+def test_read_invalid_lax():
+    with pytest.raises(pylas.PylasError):
+        LaxIndex.read_from(io.BytesIO(b"LASF" + bytes(100)))
+
+    with pytest.raises(pylas.PylasError):
+        LaxIndex.read_from(io.BytesIO(b"LASX" + bytes(2)))
+
+
+@pytest.mark.parametrize("minimum_points", [0, 100, 100_000])
+def test_query_rectangle_with_index(las_file_path, minimum_points):
+    las = pylas.read(las_file_path)
+    with pylas.open(las_file_path) as reader:
+        reader.spatial_index = LaxIndex.build(
+            reader, cell_size=5.0, threshold=10, minimum_points=minimum_points
+        )
+        reader.read_points(10)
+        for rectangle in random_rectangles(las):
+            points = reader.query_rectangle(*rectangle)
+            assert np.all(points.array == points_in(las, rectangle))
+        assert reader.points_read == 10
+
+
+def test_query_rectangle_without_index(las_file_path):
+    las = pylas.read(las_file_path)
+    with pylas.open(las_file_path) as reader:
+        assert reader.spatial_index is None
+        for rectangle in random_rectangles(las, count=3):
+            points = reader.query_rectangle(*rectangle, dimensions=["x", "y"])
+            expected = points_in(las, rectangle)
+            assert np.all(points.array["X"] == expected["X"])
+            assert points.array.dtype.names == ("X", "Y")
+
+
+def test_query_rectangle_laz(laz_file_path):
+    las = pylas.read(laz_file_path)
+    with pylas.open(laz_file_path) as reader:
+        reader.spatial_index = LaxIndex.build(reader, minimum_points=0)
+        for rectangle in random_rectangles(las, count=5):
+            points = reader.query_rectangle(*rectangle)
+            assert np.all(points.array == points_in(las, rectangle))
+
+
+def test_open_loads_lax_file(tmp_path):
+    las_path = shutil.copy(pylas.lib.Path(__file__).parent / "simple.las", tmp_path)
+    with pylas.open(las_path) as reader:
+        assert reader.spatial_index is None
+        LaxIndex.build(reader, cell_size=10.0).write_to(lax_path(las_path))
+
+    las = pylas.read(las_path)
+    with pylas.open(las_path) as reader:
+        assert reader.spatial_index is not None
+        rectangle = next(random_rectangles(las))
+        points = reader.query_rectangle(*rectangle)
+        assert np.all(points.array == points_in(las, rectangle))
+
+
+def test_maximum_intervals_with_one_interval_per_cell(simple_las_path):
+    with pylas.open(simple_las_path) as reader:
+        index = LaxIndex.build(
+            reader,
+            cell_size=100.0,
+            threshold=10 ** 9,
+            minimum_points=0,
+            maximum_intervals=1,
+        )
+    # A cell keeps at least one interval
+    assert len(index.cells) > 1
+    assert all(len(intervals) == 1 for intervals in index.cells.values())
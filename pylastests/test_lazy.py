@@ -0,0 +1,65 @@
+"""
+Tests related to lazy_open & lazy arrays
+"""
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas.lazy import partition_starts
+
+
+def test_lazy_dimensions_match_read(las_file_path):
+    las = pylas.read(las_file_path)
+    with pylas.lazy_open(las_file_path, partition_size=300) as lazy:
+        assert lazy.npartitions == -(-len(las.points) // 300)
+        assert np.allclose(lazy.x.compute(), np.asarray(las.x))
+        assert np.all(lazy.return_number.compute() == las.return_number)
+        assert lazy.z.max() == pytest.approx(np.asarray(las.z).max())
+        assert lazy.intensity.min() == las.intensity.min()
+        assert lazy.intensity.sum() == las.intensity.sum()
+        assert lazy.intensity.mean() == pytest.approx(las.intensity.mean())
+
+
+def test_lazy_array_operations(simple_las_path):
+    las = pylas.read(simple_las_path)
+    with pylas.lazy_open(simple_las_path, partition_size=100, max_workers=4) as lazy:
+        assert (lazy.classification == 2).sum() == np.sum(las.classification == 2)
+        height = lazy.z - lazy.z.min()
+        assert np.allclose(np.asarray(height), np.asarray(las.z) - np.min(las.z))
+        ratio = lazy.intensity / (1 + lazy.return_number)
+        assert np.allclose(
+            ratio.compute(), las.intensity / (1 + np.asarray(las.return_number))
+        )
+
+        counts, edges = lazy.z.histogram(bins=8)
+        expected_counts, expected_edges = np.histogram(np.asarray(las.z), bins=8)
+        assert np.all(counts == expected_counts)
+        assert np.allclose(edges, expected_edges)
+
+
+def test_lazy_array_extra_bytes(las_file_path_with_extra_bytes):
+    las = pylas.read(las_file_path_with_extra_bytes)
+    with pylas.lazy_open(las_file_path_with_extra_bytes, partition_size=10) as lazy:
+        colors = lazy.Colors
+        assert colors.shape == (len(las.points), 3)
+        assert np.all(colors.compute() == las.Colors)
+
+
+def test_lazy_unknown_dimension(simple_las_path):
+    with pylas.lazy_open(simple_las_path) as lazy:
+        with pytest.raises(AttributeError):
+            lazy.not_a_dimension
+        with pytest.raises(pylas.PylasError):
+            lazy["not_a_dimension"]
+
+
+def test_laz_partitions_are_aligned_to_chunks(laz_file_path):
+    with pylas.open(laz_file_path) as reader:
+        chunk_starts = reader._first_point_of_chunks()
+        starts = partition_starts(reader, partition_size=1)
+    assert np.all(starts == chunk_starts)
+
+    las = pylas.read(laz_file_path)
+    with pylas.lazy_open(laz_file_path, partition_size=1) as lazy:
+        assert np.all(lazy.X.compute() == las.X)
@@ -1,4 +1,9 @@
+import mmap
+import os
+import stat
+
 import numpy as np
+import pytest
 
 import pylas
 
@@ -12,3 +17,31 @@ def test_mmap(mmapped_file_path):
     assert np.all(las.classification == 25)
 
 
+def test_mmap_read_only(mmapped_file_path):
+    os.chmod(mmapped_file_path, stat.S_IRUSR)
+    expected = pylas.read(mmapped_file_path)
+    with pylas.mmap(mmapped_file_path, mode="r", advice="sequential") as las:
+        assert np.all(las.points.array == expected.points.array)
+        with pytest.raises(ValueError):
+            las.classification[:] = 25
+
+
+def test_mmap_copy_on_write(mmapped_file_path):
+    expected = pylas.read(mmapped_file_path)
+    with pylas.mmap(mmapped_file_path, mode="c") as las:
+        las.classification[:] = 25
+        assert np.all(las.classification == 25)
+
+    las = pylas.read(mmapped_file_path)
+    assert np.all(las.classification == expected.classification)
+
+
+def test_mmap_advise(mmapped_file_path):
+    with pylas.mmap(mmapped_file_path, mode="r") as las:
+        for advice in ("random", "willneed", "normal"):
+            assert las.advise(advice) == hasattr(mmap, "MADV_NORMAL")
+        with pytest.raises(ValueError):
+            las.advise("not_an_advice")
+
+    with pytest.raises(ValueError):
+        pylas.mmap(mmapped_file_path, mode="w")
@@ -0,0 +1,139 @@
+"""
+Tests related to reading from non-seekable streams
+"""
+
+import io
+import os
+import struct
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas.streams import ForwardOnlyStream
+
+EVLR_LAS_PATH = Path(__file__).parent / "1_4_w_evlr.las"
+EVLR_LAZ_PATH = Path(__file__).parent / "1_4_w_evlr.laz"
+
+
+class NonSeekableStream(io.RawIOBase):
+    """Like a pipe: cannot seek nor tell, and reads return at most 1000 bytes"""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        view = memoryview(buffer)[:1000]
+        return self.data.readinto(view)
+
+
+def read_non_seekable(path, **kwargs):
+    with open(path, mode="rb") as f:
+        return pylas.read(NonSeekableStream(f.read()), **kwargs)
+
+
+def assert_same_las(las, expected):
+    assert np.all(las.points.array == expected.points.array)
+    assert las.header.point_count == expected.header.point_count
+    assert las.header.extra_vlr_bytes == expected.header.extra_vlr_bytes
+    assert len(las.vlrs) == len(expected.vlrs)
+    if expected.evlrs is None:
+        assert las.evlrs is None
+    else:
+        assert [e.record_id for e in las.evlrs] == [e.record_id for e in expected.evlrs]
+
+
+@pytest.mark.parametrize("path", [EVLR_LAS_PATH])
+def test_read_non_seekable_las_with_evlrs(path):
+    las = read_non_seekable(path)
+    assert len(las.evlrs) > 0
+    assert_same_las(las, pylas.read(path))
+
+
+def test_read_non_seekable_las(las_file_path):
+    assert_same_las(read_non_seekable(las_file_path), pylas.read(las_file_path))
+
+
+@pytest.mark.skipif(
+    not pylas.LazBackend.Lazrs.is_available(), reason="Lazrs is not installed"
+)
+@pytest.mark.parametrize(
+    "laz_backend", [pylas.LazBackend.Lazrs, pylas.LazBackend.LazrsParallel]
+)
+@pytest.mark.parametrize(
+    "path", [EVLR_LAZ_PATH, Path(__file__).parent / "simple.laz"], ids=repr
+)
+def test_read_non_seekable_laz(path, laz_backend):
+    las = read_non_seekable(path, laz_backend=laz_backend)
+    assert_same_las(las, pylas.read(path))
+
+
+@pytest.mark.skipif(
+    not pylas.LazBackend.Laszip.is_available(), reason="Laszip is not installed"
+)
+def test_laszip_non_seekable_error():
+    with pytest.raises(pylas.PylasError, match="non-seekable"):
+        read_non_seekable(EVLR_LAZ_PATH, laz_backend=pylas.LazBackend.Laszip)
+
+
+def test_non_seekable_extra_vlr_bytes(simple_las_path):
+    data = bytearray(simple_las_path.read_bytes())
+    offset_to_point_data = struct.unpack_from("<I", data, 96)[0]
+    data[offset_to_point_data:offset_to_point_data] = b"\x01" * 13
+    struct.pack_into("<I", data, 96, offset_to_point_data + 13)
+
+    header = pylas.LasHeader.read_from(NonSeekableStream(bytes(data)), seekable=False)
+    assert header.extra_vlr_bytes == b"\x01" * 13
+
+    las = pylas.read(NonSeekableStream(bytes(data)))
+    assert_same_las(las, pylas.read(io.BytesIO(data)))
+    assert np.all(las.points.array == pylas.read(simple_las_path).points.array)
+
+
+def test_non_seekable_forward_seek_and_chunks(simple_las_path):
+    las = pylas.read(simple_las_path)
+    with open(simple_las_path, mode="rb") as f:
+        data = f.read()
+
+    with pylas.open(NonSeekableStream(data)) as reader:
+        reader.seek(100)
+        assert np.all(reader.read_points(10).array == las.points.array[100:110])
+        chunks = [c.array for c in reader.chunk_iterator(300)]
+        assert np.all(np.concatenate(chunks) == las.points.array[110:])
+
+
+def test_read_from_pipe(las_file_path):
+    read_fd, write_fd = os.pipe()
+    data = las_file_path.read_bytes()
+
+    def write():
+        with os.fdopen(write_fd, mode="wb") as f:
+            f.write(data)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    with os.fdopen(read_fd, mode="rb") as pipe:
+        las = pylas.read(pipe)
+    writer.join()
+    assert_same_las(las, pylas.read(las_file_path))
+
+
+def test_forward_only_stream_lookback():
+    stream = ForwardOnlyStream(NonSeekableStream(bytes(range(100))), lookback=10)
+    assert not stream.seekable()
+    with pytest.raises(io.UnsupportedOperation):
+        stream.seek(0)
+    assert stream.read(50) == bytes(range(50))
+    with pytest.raises(pylas.PylasError):
+        stream.skip_to(39)
+    stream.skip_to(45)
+    assert stream.read(10) == bytes(range(45, 55))
+    stream.skip_to(90)
+    assert stream.read() == bytes(range(90, 100))
+    with pytest.raises(pylas.PylasError):
+        stream.skip_to(101)
@@ -0,0 +1,122 @@
+"""
+Tests related to the LAZ chunk table and the parallel decompression of chunks
+"""
+import concurrent.futures
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas import lazchunktable
+from pylas.header import LasHeader
+from pylas.vlrs.known import VARIABLE_CHUNK_SIZE
+
+ALL_LAZ_FILES = sorted(Path(__file__).parent.glob("*.laz"))
+
+
+@pytest.mark.parametrize("laz_path", ALL_LAZ_FILES, ids=repr)
+def test_read_chunk_table(laz_path):
+    with open(laz_path, mode="rb") as f:
+        header = LasHeader.read_from(f)
+        laszip_vlr = header.vlrs.get("LasZipVlr")[0]
+        position = f.tell()
+        entries = lazchunktable.read_chunk_table(
+            f, header.offset_to_point_data, laszip_vlr.chunk_size, header.point_count
+        )
+        assert f.tell() == position
+
+        assert sum(e.point_count for e in entries) == header.point_count
+        offset = lazchunktable.read_offset_to_chunk_table(
+            f, header.offset_to_point_data
+        )
+        starts = lazchunktable.chunk_starts(entries, header.offset_to_point_data)
+        assert starts[-1] == offset
+
+        # Encoding the table again must give the same bytes
+        encoded = lazchunktable.encode_chunk_table(
+            entries, laszip_vlr.chunk_size == VARIABLE_CHUNK_SIZE
+        )
+        f.seek(offset)
+        assert f.read(len(encoded)) == encoded
+
+
+@pytest.mark.parametrize("variable_size", [True, False])
+def test_chunk_table_round_trip(variable_size):
+    rng = np.random.default_rng(0)
+    chunk_size = 50_000
+    byte_counts = rng.integers(1, 2_000_000, 500)
+    if variable_size:
+        point_counts = rng.integers(0, 100_000, 500)
+    else:
+        point_counts = np.full(500, chunk_size)
+        point_counts[-1] = 1234
+    entries = [
+        lazchunktable.ChunkTableEntry(int(p), int(b))
+        for p, b in zip(point_counts, byte_counts)
+    ]
+
+    out = io.BytesIO()
+    out.write((16).to_bytes(8, "little", signed=True))
+    out.write(bytes(8))
+    lazchunktable.write_chunk_table(out, entries, variable_size)
+    out.seek(0)
+
+    read_entries = lazchunktable.read_chunk_table(
+        out,
+        0,
+        VARIABLE_CHUNK_SIZE if variable_size else chunk_size,
+        int(point_counts.sum()),
+    )
+    if variable_size:
+        assert read_entries == entries
+    else:
+        assert [e.byte_count for e in read_entries] == byte_counts.tolist()
+        assert [e.point_count for e in read_entries] == point_counts.tolist()
+
+
+def test_parallel_read(laz_file_path, laz_backend):
+    las = pylas.read(laz_file_path, laz_backend=laz_backend)
+    parallel_las = pylas.read(laz_file_path, laz_backend=laz_backend, num_workers=2)
+
+    assert parallel_las.points == las.points
+    assert parallel_las.header.point_count == las.header.point_count
+
+
+def test_parallel_chunk_iterator(laz_file_path, laz_backend):
+    las = pylas.read(laz_file_path, laz_backend=laz_backend)
+    with pylas.open(laz_file_path, laz_backend=laz_backend) as reader:
+        chunks = list(reader.parallel_chunk_iterator(num_workers=2, ordered=False))
+        # The position of the reader is not changed
+        assert reader.read_points(10) == las.points[:10]
+
+    chunks.sort(key=lambda chunk: chunk[0])
+    assert [chunk_index for chunk_index, _ in chunks] == list(range(len(chunks)))
+    points = np.concatenate([chunk.array for _, chunk in chunks])
+    assert np.all(points == las.points.array)
+
+
+@pytest.mark.skipif(
+    len(pylas.LazBackend.detect_available()) == 0, reason="No Laz Backend"
+)
+def test_parallel_read_with_process_pool(laz_backend):
+    path = Path(__file__).parent / "simple.laz"
+    las = pylas.read(path, laz_backend=laz_backend)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        with pylas.open(path, laz_backend=laz_backend) as reader:
+            parallel_las = reader.read(executor=executor)
+
+    assert parallel_las.points == las.points
+
+
+def test_parallel_chunk_iterator_on_las_raises(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        with pytest.raises(pylas.errors.LazError):
+            next(reader.parallel_chunk_iterator())
+
+
+def test_parallel_read_of_las_file(las_file_path):
+    las = pylas.read(las_file_path)
+    parallel_las = pylas.read(las_file_path, num_workers=2)
+    assert parallel_las.points == las.points
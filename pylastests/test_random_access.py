@@ -0,0 +1,86 @@
+"""
+Tests related to reading points at random positions
+"""
+import io
+
+import numpy as np
+import pytest
+
+import pylas
+
+
+def check_seek_then_read_points(reader, las):
+    assert reader.seek(10) == 10
+    points = reader.read_points(5)
+    assert points == las.points[10:15]
+
+    assert reader.seek(-5, io.SEEK_CUR) == 10
+    assert reader.seek(-3, io.SEEK_END) == len(las.points) - 3
+    points = reader.read_points(10)
+    assert points == las.points[-3:]
+
+
+def check_read_points_at(reader, las):
+    rng = np.random.default_rng(42)
+    indices = rng.integers(0, len(las.points), 200)
+
+    first_points = reader.read_points(50)
+    points = reader.read_points_at(indices)
+    next_points = reader.read_points(50)
+
+    assert points == las.points[indices]
+    assert first_points == las.points[:50]
+    assert next_points == las.points[50:100]
+
+
+def test_las_seek(las_file_path):
+    las = pylas.read(las_file_path)
+    with pylas.open(las_file_path) as reader:
+        check_seek_then_read_points(reader, las)
+
+
+def test_laz_seek(laz_file_path, laz_backend):
+    las = pylas.read(laz_file_path)
+    with pylas.open(laz_file_path, laz_backend=laz_backend) as reader:
+        check_seek_then_read_points(reader, las)
+
+
+def test_seek_out_of_bounds(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        with pytest.raises(IndexError):
+            reader.seek(reader.header.point_count + 1)
+        with pytest.raises(IndexError):
+            reader.seek(-1)
+
+
+def test_las_read_points_at(las_file_path):
+    las = pylas.read(las_file_path)
+    with pylas.open(las_file_path) as reader:
+        check_read_points_at(reader, las)
+
+
+def test_laz_read_points_at(laz_file_path, laz_backend):
+    las = pylas.read(laz_file_path)
+    with pylas.open(laz_file_path, laz_backend=laz_backend) as reader:
+        check_read_points_at(reader, las)
+
+
+def test_read_points_at_empty_and_invalid_indices(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        points = reader.read_points_at([])
+        assert len(points) == 0
+        assert points.point_format == reader.header.point_format
+
+        with pytest.raises(IndexError):
+            reader.read_points_at([0, reader.header.point_count])
+
+
+def test_read_points_at_only_some_dimensions(las_file_path):
+    las = pylas.read(las_file_path)
+    indices = [5, 1, 100]
+    with pylas.open(las_file_path) as reader:
+        points = reader.read_points_at(indices, dimensions=["x", "classification"])
+
+    assert points.point_size < las.points.point_size
+    assert np.allclose(points.x, np.asarray(las.x)[indices])
+    assert np.all(points.classification == np.asarray(las.classification)[indices])
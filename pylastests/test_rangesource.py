@@ -0,0 +1,153 @@
+"""
+Tests related to RangeSource
+"""
+import http.server
+import io
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas.rangesource import RangeSource
+
+SIMPLE_LAZ_PATH = Path(__file__).parent / "simple.laz"
+
+
+class MemoryFetcher:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.calls = []
+
+    def __call__(self, offset, length):
+        self.calls.append((offset, length))
+        return self.data[offset : offset + length]
+
+
+def test_range_source_reads(simple_las_path):
+    data = simple_las_path.read_bytes()
+    fetcher = MemoryFetcher(data)
+    source = RangeSource(fetcher, size=len(data), block_size=100, read_ahead=2)
+
+    assert source.read(10) == data[:10]
+    # the block and the 2 next blocks were fetched in one call
+    assert fetcher.calls == [(0, 300)]
+    assert source.read(250) == data[10:260]
+    assert len(fetcher.calls) == 1
+
+    source.seek(-50, io.SEEK_END)
+    assert source.read() == data[-50:]
+    assert source.read(10) == b""
+    source.seek(1000)
+    assert source.read(400) == data[1000:1400]
+    assert all(length <= 600 for _, length in fetcher.calls)
+    assert source.bytes_fetched == sum(length for _, length in fetcher.calls)
+
+    source.seek(0)
+    assert source.read() == data
+
+
+def test_range_source_does_not_read_ahead_cached_blocks(simple_las_path):
+    data = simple_las_path.read_bytes()
+    fetcher = MemoryFetcher(data)
+    source = RangeSource(fetcher, size=len(data), block_size=100, read_ahead=2)
+
+    source.seek(400)
+    assert source.read(10) == data[400:410]
+    source.seek(0)
+    assert source.read(300) == data[:300]
+    assert fetcher.calls == [(400, 100), (0, 300)]
+
+    # Block 4 is already cached, it is not read ahead again
+    assert source.read(10) == data[300:310]
+    assert fetcher.calls[-1] == (300, 100)
+    assert source.read(200) == data[310:510]
+    assert fetcher.calls[-1] == (500, 300)
+
+
+def test_range_source_unknown_size():
+    data = bytes(range(256)) * 4
+    source = RangeSource(MemoryFetcher(data), block_size=100)
+    with pytest.raises(io.UnsupportedOperation):
+        source.seek(0, io.SEEK_END)
+    source.seek(1000)
+    assert source.read(100) == data[1000:]
+    assert source.read(100) == b""
+
+
+def test_range_source_block_cache_is_bounded(simple_las_path):
+    data = simple_las_path.read_bytes()
+    source = RangeSource(
+        MemoryFetcher(data), size=len(data), block_size=100, cache_size=1000
+    )
+    assert source.read() == data
+    assert source.cache.nbytes <= 1000
+
+
+def test_read_las_from_range_source(las_file_path):
+    data = las_file_path.read_bytes()
+    source = RangeSource(MemoryFetcher(data), size=len(data), block_size=1024)
+    las = pylas.read(source)
+    expected = pylas.read(las_file_path)
+    assert np.all(las.points.array == expected.points.array)
+
+
+def test_read_points_at_fetches_only_needed_parts(simple_las_path):
+    data = simple_las_path.read_bytes()
+    source = RangeSource(MemoryFetcher(data), size=len(data), block_size=1024)
+    expected = pylas.read(simple_las_path)
+    with pylas.open(source) as reader:
+        points = reader.read_points_at([1000])
+    assert np.all(points.array == expected.points.array[[1000]])
+    assert source.bytes_fetched < len(data) // 2
+
+
+@pytest.mark.skipif(
+    not pylas.LazBackend.Lazrs.is_available(), reason="Lazrs is not installed"
+)
+def test_read_points_at_laz_from_range_source():
+    data = SIMPLE_LAZ_PATH.read_bytes()
+    source = RangeSource(MemoryFetcher(data), size=len(data), block_size=512)
+    expected = pylas.read(SIMPLE_LAZ_PATH)
+    with pylas.open(source, laz_backend=pylas.LazBackend.Lazrs) as reader:
+        points = reader.read_points_at([1064])
+    assert np.all(points.array == expected.points.array[[1064]])
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    data = b""
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.data)))
+        self.end_headers()
+
+    def do_GET(self):
+        first, last = self.headers["Range"].split("=")[1].split("-")
+        body = self.data[int(first) : int(last) + 1]
+        self.send_response(206)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def http_server(simple_las_path):
+    RangeRequestHandler.data = simple_las_path.read_bytes()
+    server = http.server.HTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/simple.las"
+    server.shutdown()
+    server.server_close()
+
+
+def test_range_source_from_url(http_server, simple_las_path):
+    source = RangeSource.from_url(http_server, block_size=4096)
+    assert source.size == simple_las_path.stat().st_size
+    las = pylas.read(source)
+    assert np.all(las.points.array == pylas.read(simple_las_path).points.array)
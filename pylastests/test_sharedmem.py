@@ -0,0 +1,78 @@
+"""
+Tests related to points in shared memory
+"""
+import multiprocessing
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas.sharedmem import SharedPoints
+
+# multiprocessing.shared_memory is new in python 3.8
+pytest.importorskip("multiprocessing.shared_memory")
+
+
+def set_classification(handle, value):
+    with handle.open() as shared:
+        las = shared.las_data()
+        las.classification[:] = value
+        total = int(np.sum(las.X))
+        del las
+    return total
+
+
+def test_shared_points_from_file(las_file_path):
+    expected = pylas.read(las_file_path)
+    with SharedPoints.from_file(las_file_path) as shared:
+        assert shared.owner
+        assert np.all(shared.array == expected.points.array)
+        handle = shared.handle
+        assert handle.count == len(expected.points)
+
+        with handle.open() as attached:
+            assert not attached.owner
+            points = attached.points()
+            assert np.all(points.array == expected.points.array)
+            assert np.allclose(points.x, expected.x)
+            del points
+    with pytest.raises(pylas.PylasError):
+        shared.array
+
+
+def test_shared_points_are_shared_with_processes(simple_las_path):
+    expected = pylas.read(simple_las_path)
+    with SharedPoints.from_file(simple_las_path) as shared:
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            totals = pool.starmap(set_classification, [(shared.handle, 17)] * 2)
+        assert totals == [int(np.sum(expected.X))] * 2
+        assert np.all(shared.las_data().classification == 17)
+
+
+def test_shared_points_from_reader_chunks(simple_las_path):
+    expected = pylas.read(simple_las_path)
+    with pylas.open(simple_las_path) as reader:
+        with SharedPoints.from_reader(reader, 100) as first:
+            with SharedPoints.from_reader(reader) as rest:
+                assert first.count == 100 and first.header.point_count == 100
+                assert np.all(rest.array == expected.points.array[100:])
+            assert np.all(first.array == expected.points.array[:100])
+
+
+def test_shared_points_from_record(simple_las_path):
+    las = pylas.read(simple_las_path)
+    with SharedPoints.from_record(las.points, las.header) as shared:
+        las_data = shared.las_data()
+        assert np.all(las_data.points.array == las.points.array)
+        las_data.intensity[:] = 1
+        assert np.all(shared.array["intensity"] == 1)
+        assert np.any(las.intensity != 1)
+        del las_data
+
+
+def test_shared_points_unlinked_by_owner(simple_las_path):
+    shared = SharedPoints.from_file(simple_las_path)
+    handle = shared.handle
+    shared.close()
+    with pytest.raises(FileNotFoundError):
+        handle.open()
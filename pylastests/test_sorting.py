@@ -0,0 +1,150 @@
+"""
+Tests related to sorting points along space filling curves or by dimensions
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas.point import sorting
+
+
+def grid(side):
+    y, x = np.divmod(np.arange(side * side), side)
+    return x, y
+
+
+@pytest.mark.parametrize("side", [2, 8, 64])
+def test_hilbert_keys_visit_neighbour_cells(side):
+    x, y = grid(side)
+    order = np.argsort(sorting.hilbert_keys(x, y))
+    steps = np.abs(np.diff(x[order])) + np.abs(np.diff(y[order]))
+    assert np.all(steps == 1)
+
+
+def test_hilbert_keys_3d_visit_neighbour_cells():
+    z, yx = np.divmod(np.arange(8**3), 8 * 8)
+    y, x = np.divmod(yx, 8)
+    order = np.argsort(sorting.hilbert_keys(x, y, z))
+    steps = sum(np.abs(np.diff(c[order])) for c in (x, y, z))
+    assert np.all(steps == 1)
+
+
+def test_morton_keys():
+    x, y = grid(4)
+    keys = sorting.morton_keys(x, y)
+    assert len(np.unique(keys)) == 16
+    # The four cells of each quadrant come one after the other
+    quadrants = (x[np.argsort(keys)] // 2) + 2 * (y[np.argsort(keys)] // 2)
+    assert list(quadrants) == [0] * 4 + [1] * 4 + [2] * 4 + [3] * 4
+
+    x, y, z = np.array([0, 1, 0, 0]), np.array([0, 0, 1, 0]), np.array([0, 0, 0, 1])
+    assert list(sorting.morton_keys(x, y, z)) == [0, 1, 2, 4]
+
+
+def test_keys_of_large_coordinates():
+    x = np.array([-(2**31), 2**31 - 1, 0], np.int32)
+    keys = sorting.hilbert_keys(x, x)
+    assert len(np.unique(keys)) == 3
+
+    with pytest.raises(ValueError):
+        sorting.morton_keys(x)
+
+
+@pytest.mark.parametrize("order", ["hilbert", "morton"])
+@pytest.mark.parametrize("use_z", [False, True])
+def test_sort_along_curve(file_path, order, use_z):
+    las = pylas.read(file_path)
+    original = las.points.array.copy()
+    las.sort(order, use_z=use_z)
+
+    fields = ["X", "Y", "Z", "gps_time"]
+    assert np.all(
+        np.sort(las.points.array, order=fields) == np.sort(original, order=fields)
+    )
+    names = ("X", "Y", "Z") if use_z else ("X", "Y")
+    keys_fn = sorting.hilbert_keys if order == "hilbert" else sorting.morton_keys
+    keys = keys_fn(*[las.points.array[name] for name in names])
+    assert np.all(np.diff(keys.astype(np.float64)) >= 0)
+
+
+def test_sort_by_dimensions(simple_las_path):
+    las = pylas.read(simple_las_path)
+    las.sort(["classification", "gps_time"])
+
+    classification = np.asarray(las.classification)
+    assert np.all(np.diff(classification) >= 0)
+    for value in np.unique(classification):
+        assert np.all(np.diff(las.gps_time[classification == value]) >= 0)
+
+    with pytest.raises(ValueError):
+        las.sort([])
+
+
+def test_sort_chunks(simple_las_path):
+    output = io.BytesIO()
+    pylas.sorting.sort_chunks(
+        simple_las_path, output, order="gps_time", points_per_iteration=100
+    )
+    output.seek(0)
+    las = pylas.read(output)
+    original = pylas.read(simple_las_path)
+
+    assert las.header.point_count == original.header.point_count
+    for start in range(0, len(las.points), 100):
+        window = slice(start, start + 100)
+        assert np.all(np.diff(las.gps_time[window]) >= 0)
+        assert np.all(
+            np.sort(las.points.array[window], order="gps_time")
+            == np.sort(original.points.array[window], order="gps_time")
+        )
+
+
+@pytest.fixture()
+def small_runs(monkeypatch):
+    """Small runs, to merge many of them"""
+    monkeypatch.setattr(pylas.sorting, "MIN_POINTS_PER_READ", 200)
+
+
+@pytest.mark.parametrize(
+    "order",
+    ["hilbert", "gps_time", "classification", "return_number", ["classification", "Z"]],
+)
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_sort_file(file_path, small_runs, order, num_workers):
+    output = io.BytesIO()
+    pylas.sort_file(file_path, output, order, memory_limit=1, num_workers=num_workers)
+    output.seek(0)
+    las = pylas.read(output)
+    original = pylas.read(file_path)
+
+    # Same result as the (stable) sort of all the points in memory
+    mins, maxs = pylas.sorting._raw_bounds(original.header, use_z=False)
+    keys = sorting.sort_keys(original.points, order, False, mins, maxs)
+    expected = original.points.array[np.argsort(keys, kind="stable")]
+    assert las.header.are_points_compressed == original.header.are_points_compressed
+    assert np.all(las.points.array == expected)
+
+
+def test_sort_file_in_memory(simple_las_path, tmp_path):
+    path = tmp_path / "sorted.las"
+    pylas.sort_file(simple_las_path, path, "gps_time", temporary_directory=tmp_path)
+
+    las = pylas.read(path)
+    assert np.all(np.diff(las.gps_time) >= 0)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("points_per_read", [50, 1024])
+def test_sort_file_is_stable(simple_las_path, monkeypatch, points_per_read):
+    # Few distinct keys: blocks of the runs end and start with the same key
+    monkeypatch.setattr(pylas.sorting, "MIN_POINTS_PER_READ", points_per_read)
+    output = io.BytesIO()
+    pylas.sort_file(simple_las_path, output, "classification", memory_limit=20_000)
+    output.seek(0)
+
+    original = pylas.read(simple_las_path).points
+    permutation = np.argsort(np.asarray(original["classification"]), kind="stable")
+    assert np.all(pylas.read(output).points.array == original.array[permutation])
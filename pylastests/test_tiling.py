@@ -0,0 +1,71 @@
+"""
+Tests related to the tiling module
+"""
+import numpy as np
+import pytest
+
+import pylas
+from pylas.tiling import TileGrid, WriterPool, retile
+
+
+def test_split_groups_points_by_tile(simple_las_path):
+    las = pylas.read(simple_las_path)
+    grid = TileGrid((500.0, 700.0), origin=(las.header.x_min, las.header.y_min))
+
+    x, y = np.asarray(las.x), np.asarray(las.y)
+    total = 0
+    for tile, points in grid.split(las.points, las.header):
+        min_x, min_y, max_x, max_y = grid.tile_bounds(tile)
+        mask = (x >= min_x) & (x < max_x) & (y >= min_y) & (y < max_y)
+        # Same points, in the same order
+        assert points == las.points[mask]
+        total += len(points)
+    assert total == len(las.points)
+
+
+def test_retile_with_reopenings(simple_las_path, tmp_path):
+    las = pylas.read(simple_las_path)
+    tiles = retile(
+        simple_las_path,
+        tmp_path,
+        tile_size=1000.0,
+        points_per_iteration=100,
+        max_open_writers=2,
+    )
+    assert len(tiles) > 2
+
+    grid = TileGrid(1000.0, origin=(las.header.x_min, las.header.y_min))
+    all_points = []
+    for tile, path in tiles.items():
+        assert path.suffix == ".las"
+        tile_las = pylas.read(path)
+        assert tile_las.header.point_count == len(tile_las.points)
+        min_x, min_y, max_x, max_y = grid.tile_bounds(tile)
+        assert np.all((tile_las.x >= min_x) & (tile_las.x < max_x))
+        assert np.all((tile_las.y >= min_y) & (tile_las.y < max_y))
+        assert tile_las.header.x_min >= min_x and tile_las.header.x_max < max_x
+        all_points.append(tile_las.points.array)
+
+    all_points = np.concatenate(all_points)
+    assert np.all(np.sort(all_points) == np.sort(las.points.array))
+
+
+def test_writer_pool_limits_open_files(simple_las_path, tmp_path):
+    las = pylas.read(simple_las_path)
+    paths = [tmp_path / f"{i}.las" for i in range(3)]
+    with WriterPool(las.header, max_open_writers=2) as pool:
+        for start in range(0, 300, 50):
+            pool.write_points(paths[(start // 50) % 3], las.points[start: start + 50])
+            assert len(pool) <= 2
+        assert pool.reopenings == 3
+
+    for i, path in enumerate(paths):
+        written = pylas.read(path)
+        expected = [las.points.array[s: s + 50] for s in range(i * 50, 300, 150)]
+        assert np.all(written.points.array == np.concatenate(expected))
+
+
+def test_retile_laz(laz_file_path, tmp_path):
+    las = pylas.read(laz_file_path)
+    tiles = retile(laz_file_path, tmp_path, tile_size=250.0, extension=".las")
+    assert sum(pylas.read(path).header.point_count for path in tiles.values()) == len(las.points)
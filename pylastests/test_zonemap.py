@@ -0,0 +1,162 @@
+"""
+Tests related to zone maps and filtering points with chunk_iterator's `where`
+"""
+import io
+
+import numpy as np
+import pytest
+
+import pylas
+from pylas.zonemap import ZoneMap
+
+
+def expected_mask(las, where):
+    mask = np.ones(len(las.points), np.bool_)
+    for name, condition in where.items():
+        values = np.asarray(getattr(las, name))
+        if isinstance(condition, tuple):
+            low, high = condition
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        else:
+            mask &= np.isin(values, condition)
+    return mask
+
+
+@pytest.fixture()
+def sorted_las_data():
+    """simple.las with its points sorted along x, so that zones
+    cover distinct parts of the x axis
+    """
+    las = pylas.read(pylas.lib.Path(__file__).parent / "simple.las")
+    las.points = las.points[np.argsort(las.X)]
+    out = io.BytesIO()
+    las.write(out)
+    return out.getvalue()
+
+
+def test_build_zone_map(las_file_path):
+    las = pylas.read(las_file_path)
+    with pylas.open(las_file_path) as reader:
+        reader.read_points(10)
+        zone_map = ZoneMap.build(reader, zone_size=100)
+        assert reader.points_read == 10
+
+    assert zone_map.point_count == len(las.points)
+    for i, (start, stop) in enumerate(zip(zone_map.starts[:-1], zone_map.starts[1:])):
+        for name in ("X", "intensity", "classification"):
+            values = np.asarray(las[name])[start:stop]
+            assert zone_map.mins[name][i] == values.min()
+            assert zone_map.maxs[name][i] == values.max()
+
+
+def test_build_zone_map_of_laz_uses_chunks(laz_file_path):
+    with pylas.open(laz_file_path) as reader:
+        zone_map = ZoneMap.build(reader)
+        chunk_table = reader.read_chunk_table()
+
+    assert zone_map.number_of_zones == len(chunk_table)
+    assert zone_map.point_count == sum(e.point_count for e in chunk_table)
+
+
+def test_zone_map_read_write(tmp_path):
+    with pylas.open(pylas.lib.Path(__file__).parent / "simple.las") as reader:
+        zone_map = ZoneMap.build(reader, zone_size=100)
+
+    path = tmp_path / "simple.las.zmap"
+    zone_map.write_to(path)
+    read_zone_map = ZoneMap.read_from(path)
+    assert path.exists()
+
+    assert np.all(read_zone_map.starts == zone_map.starts)
+    assert read_zone_map.mins.keys() == zone_map.mins.keys()
+    for name in zone_map.mins:
+        assert np.all(read_zone_map.mins[name] == zone_map.mins[name])
+        assert np.all(read_zone_map.maxs[name] == zone_map.maxs[name])
+
+
+@pytest.mark.parametrize("use_zone_map", [True, False])
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_chunk_iterator_where(sorted_las_data, use_zone_map, prefetch):
+    las = pylas.read(io.BytesIO(sorted_las_data))
+    xmin, xmax = np.percentile(np.asarray(las.x), [20, 30])
+    where = {"x": (xmin, xmax), "classification": [2]}
+
+    with pylas.open(io.BytesIO(sorted_las_data)) as reader:
+        zone_map = ZoneMap.build(reader, zone_size=50) if use_zone_map else None
+        with reader.chunk_iterator(
+            40, where=where, zone_map=zone_map, prefetch=prefetch
+        ) as chunks:
+            points = [chunk.array for chunk in chunks]
+
+    assert all(len(p) > 0 for p in points)
+    assert np.all(np.concatenate(points) == las.points.array[expected_mask(las, where)])
+
+
+def test_chunk_iterator_where_skips_zones(sorted_las_data):
+    las = pylas.read(io.BytesIO(sorted_las_data))
+    xmin, xmax = np.percentile(np.asarray(las.x), [50, 55])
+
+    with pylas.open(io.BytesIO(sorted_las_data)) as reader:
+        zone_map = ZoneMap.build(reader, zone_size=50)
+        read_n_points = reader.point_source.read_n_points
+        points_read = []
+
+        def counting_read_n_points(n):
+            points_read.append(n)
+            return read_n_points(n)
+
+        reader.point_source.read_n_points = counting_read_n_points
+        points = np.concatenate(
+            [
+                chunk.array
+                for chunk in reader.chunk_iterator(
+                    1000, where={"x": (xmin, xmax)}, zone_map=zone_map
+                )
+            ]
+        )
+
+    x = np.asarray(las.x)
+    assert np.all(points == las.points.array[(x >= xmin) & (x <= xmax)])
+    assert sum(points_read) <= 200
+
+
+def test_chunk_iterator_where_with_dimensions(las_file_path):
+    las = pylas.read(las_file_path)
+    where = {"intensity": (None, np.median(np.asarray(las.intensity)))}
+    with pylas.open(las_file_path) as reader:
+        chunks = list(
+            reader.chunk_iterator(100, dimensions=["x", "y"], where=where)
+        )
+
+    mask = expected_mask(las, where)
+    assert all(chunk.array.dtype.names == ("X", "Y") for chunk in chunks)
+    x = np.concatenate([np.asarray(chunk.x) for chunk in chunks])
+    assert np.all(x == np.asarray(las.x)[mask])
+
+
+def test_chunk_iterator_where_laz(laz_file_path):
+    las = pylas.read(laz_file_path)
+    where = {"z": (np.median(np.asarray(las.z)), None)}
+    with pylas.open(laz_file_path) as reader:
+        zone_map = ZoneMap.build(reader)
+        chunks = list(reader.chunk_iterator(100, where=where, zone_map=zone_map))
+
+    points = np.concatenate([chunk.array for chunk in chunks])
+    assert np.all(points == las.points.array[expected_mask(las, where)])
+
+
+def test_chunk_iterator_where_errors(las_file_path):
+    with pylas.open(las_file_path) as reader:
+        with pytest.raises(ValueError):
+            reader.chunk_iterator(100, where={"not_a_dimension": (0, 1)})
+
+        zone_map = ZoneMap.build(reader, zone_size=100)
+        with pytest.raises(ValueError):
+            reader.chunk_iterator(100, zone_map=zone_map)
+
+        zone_map.starts = zone_map.starts[:-1]
+        with pytest.raises(pylas.PylasError):
+            reader.chunk_iterator(100, where={"x": (0, 1)}, zone_map=zone_map)
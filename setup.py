@@ -26,10 +26,13 @@ setup(
             "black"
         ],
         "lazrs": [
-            "lazrs>=0.2.3, < 0.3.0"
+            "lazrs>=0.4.4, < 0.9.0"
         ],
         "laszip": [
             "laszip >= 0.0.1, < 0.1.0"
+        ],
+        "arrow": [
+            "pyarrow"
         ]
     }
 )